@@ -3,7 +3,6 @@ from __future__ import annotations
 from typing import Optional, Tuple, TYPE_CHECKING
 from random import randint
 
-import os
 import lzma
 import pickle
 
@@ -51,44 +50,42 @@ class PickupAction(Action):
 		actor_location_y = self.entity.y
 		inventory = self.entity.inventory
 		
-		for item in self.engine.game_map.items:
-			if actor_location_x == item.x and actor_location_y == item.y:
-				
-				""" Add money to the entities coins, not the inventory, if banking component is attached """
-				if item.name == settings.str_money:
-					if self.entity.banking:
-						self.entity.banking.capital += item.value
-						self.engine.game_map.entities.remove(item)
+		for item in self.engine.game_map.get_items_at_location(actor_location_x, actor_location_y):
+			""" Add money to the entities coins, not the inventory, if banking component is attached """
+			if item.name == settings.str_money:
+				if self.entity.banking:
+					self.entity.banking.capital += item.value
+					self.engine.game_map.remove_entity(item)
+					self.engine.message_log.add_message(settings.str_pickup + f" {item.value} {item.name}!")
+					return
+				else:
+					pass
+			
+			elif item.name == settings.str_arrow:
+				""" Check wether arrows are already picked up, if so, increase number, otherwise take new """ 
+
+				for i in range(len(inventory.items)):
+					if item.name in inventory.items[i].name:
+						inventory.items[i].value += item.value
 						self.engine.message_log.add_message(settings.str_pickup + f" {item.value} {item.name}!")
+						self.engine.game_map.remove_entity(item)
 						return
 					else:
+						""" If arrows are picked up the first time, take them as normal """
 						pass
-				
-				elif item.name == settings.str_arrow:
-					""" Check wether arrows are already picked up, if so, increase number, otherwise take new """ 
-
-					for i in range(len(inventory.items)):
-						if item.name in inventory.items[i].name:
-							inventory.items[i].value += item.value
-							self.engine.message_log.add_message(settings.str_pickup + f" {item.value} {item.name}!")
-							self.engine.game_map.entities.remove(item)
-							return
-						else:
-							""" If arrows are picked up the first time, take them as normal """
-							pass
-						
-				""" Check if there is space in the inventory """
-				if len(inventory.items) >= inventory.capacity:
-					raise exceptions.Impossible(settings.str_inventory_full)
-				
-				""" Pick up item and add to the inventory """	
-				self.engine.game_map.entities.remove(item)
-				item.parent = self.entity.inventory
-				inventory.items.append(item)
-				self.engine.message_log.add_message(settings.str_pickup + f" {item.name}!")
+					
+			""" Check if there is space in the inventory """
+			if len(inventory.items) >= inventory.capacity:
+				raise exceptions.Impossible(settings.str_inventory_full)
+			
+			""" Pick up item and add to the inventory """	
+			self.engine.game_map.remove_entity(item)
+			item.parent = self.entity.inventory
+			inventory.items.append(item)
+			self.engine.message_log.add_message(settings.str_pickup + f" {item.name}!")
 
-				return
-				
+			return
+			
 		raise exceptions.Impossible(settings.str_nothing_to_pickup)
 		
 
@@ -149,7 +146,7 @@ class TakeStairsAction(Action):
 		""" Check if player on downstairs location """
 		if (self.entity.x, self.entity.y) == self.engine.game_map.downstairs_location:
 			""" Try to load floor, otherwise create new one """
-			if os.path.exists(str(self.engine.game_world.current_floor + 1) + ".lev"):
+			if self.engine.game_world.floor_exists(self.engine.game_world.current_floor + 1):
 				self.engine.game_world.load_next_floor()
 			else:
 				self.engine.game_world.generate_floor()
@@ -162,11 +159,8 @@ class TakeStairsAction(Action):
 				""" Check if player is removed from current map """
 				assert self.engine.player not in self.engine.game_map.entities
 
-				""" Save actual dungeon level """
-				filename = str(self.engine.game_world.current_floor -1) + ".lev"
-				save_level = lzma.compress(pickle.dumps(self.engine.game_map))
-				with open(filename, "wb") as f:
-					f.write(save_level)
+				""" Store actual dungeon level """
+				self.engine.game_world.store_floor(self.engine.game_world.current_floor - 1, self.engine.game_map)
 
 				""" Set up generated map as the active one """
 				self.engine.game_map = self.engine.new_map
@@ -230,8 +224,10 @@ class SwapPlaceAction(Action):
 		self.target = target
 
 	def perform(self) -> None:
-		self.actor.x, self.target.x = self.target.x, self.actor.x
-		self.actor.y, self.target.y = self.target.y, self.actor.y
+		game_map = self.actor.gamemap
+		actor_x, actor_y = self.actor.x, self.actor.y
+		game_map.move_entity(self.actor, self.target.x, self.target.y)
+		game_map.move_entity(self.target, actor_x, actor_y)
 
 		
 class MeleeAction(ActionWithDirection):
@@ -281,6 +277,9 @@ class MeleeAction(ActionWithDirection):
 			self.engine.message_log.add_message(
 				attack_desc + settings.str_no_damage, attack_color)
 		
+		""" Fights wake up dormant actors nearby """
+		self.entity.gamemap.make_noise(self.entity.x, self.entity.y, settings.noise_radius)
+		
 class MovementAction(ActionWithDirection):
 	""" Move the entity somewhere, bevore MovementAction, BumpAction is called """
 	def perform(self) -> None:
@@ -301,7 +300,7 @@ class MovementAction(ActionWithDirection):
 		
 		""" Check if entity is allowed to pass doors (to prevent running everywhere, e.g. keep shopkeeper inside shop) """
 		if (self.entity.pass_door == False and
-				self.engine.game_map.tiles["kind"][dest_x, dest_y] == b"Door"):
+				self.engine.game_map.tiles["kind"][dest_x, dest_y] == tile_types.TileKind.DOOR):
 			raise exceptions.Impossible(settings.str_no_door_passage)
 		
 		""" If something is standing on destination, check if it can be activated """
@@ -316,9 +315,7 @@ class MovementAction(ActionWithDirection):
 		
 		""" Finally walk, thereby darken the floor slightly """
 		if walkable == True:
-			self.engine.game_map.tiles[dest_x, dest_y][3][2][0] *= .97
-			self.engine.game_map.tiles[dest_x, dest_y][3][2][1] *= .97
-			self.engine.game_map.tiles[dest_x, dest_y][3][2][2] *= .97		
+			self.engine.game_map.wear_tile(dest_x, dest_y)
 		
 			self.entity.move(self.dx, self.dy)
 		
@@ -403,31 +400,9 @@ class RangedAttackAction(Action):
 			self.entity.equipment.quiver.value -= 1
 			attack_desc = settings.str_attack.format(self.entity.name, target.name)
 			attack_dice = randint(1,20)
-
-			""" Calculate distance penalty based of distance to shoot """
-			""" (different calculation than in D&D3.5)"""
-
-			act_range = int(distance / self.entity.equipment.weapon.equippable.maximum_range *100)
-			range_penalty = 0 
-			
-			if act_range > 66:
-				range_penalty = -2
-			elif act_range > 33:
-				range_penalty = -1
-			else:
-				range_penalty = 0
-		
-			""" Calculate size modifier, larger is easier to shoot at """
-			if self.entity.dimensions:
-				size_modifier = self.entity.dimensions.size_factor
-			else:
-				size_modifier = 0
-			
-			""" Calculate dexterity modifier """
-			dex_modifier = (self.entity.fighter.dexterity-10) // 2
 		
 			""" Calculate attack value and normalize into values between 1 and 20 """
-			attack_value = attack_dice + self.entity.fighter.bab + size_modifier + dex_modifier + range_penalty
+			attack_value = attack_dice + self.entity.fighter.ranged_attack_bonus(distance)
 			
 			if attack_value < 1:
 				attack_value = 1
@@ -435,17 +410,14 @@ class RangedAttackAction(Action):
 				attack_value = 20
 
 			# for debugging:
-			# print(f"Size Mod: {size_modifier}, BAB: {self.entity.fighter.bab}, Dex Mod: {dex_modifier},Range Penalty: {range_penalty}")
+			# print(f"Attack bonus: {self.entity.fighter.ranged_attack_bonus(distance)}, BAB: {self.entity.fighter.bab}")
 			# print (f"{self.entity.name} - Dice: {attack_dice}, Total: {attack_value}, AC Ziel: {target.fighter.armor_class}, HP Ziel: {target.fighter.hp}, Schaden: {self.entity.fighter.damage}")
 
 			""" Calculate hit and damage """
 			if attack_dice > 1 and attack_value >= target.fighter.armor_class:
 			
 				""" Successful hit, calculate damage """
-				hit_points_dice = self.entity.fighter.damage.split("d")
-				hit_points = 0
-				for i in range(int(hit_points_dice[0])):
-					hit_points += randint(1, int(hit_points_dice[1]))
+				hit_points = self.entity.fighter.damage.roll()
 				
 				""" Check if critical hit was performed """			
 				if attack_dice in self.entity.fighter.criticals:
@@ -537,9 +509,9 @@ class UnlockFurniture(Action):
 			""" Unlock will be set to 1 for successful unlock """
 			unlocked = target.lock.pick_lock(actor)
 			if unlocked:
-				target.dimensions.locked = False
-				engine.game_map.entities.remove(target)
-				engine.game_map.tiles[(target.x, target.y)] = tile_types.floor				
+				target.lock.locked = False
+				engine.game_map.remove_entity(target)
+				engine.game_map.set_tile(target.x, target.y, tile_types.floor)				
 		else:
 			raise exceptions.Impossible(settings.str_no_lock.format(target.name))
 
@@ -664,8 +636,8 @@ class DestroyFurniture(Action):
 				self.engine.message_log.add_message(f"{attack_desc}" + settings.str_obj_destroyed)
 				""" If furniture should be removed in case it is broken: """
 				if self.remove == True:
-					self.engine.game_map.entities.remove(self.target)
-					self.engine.game_map.tiles[(self.target.x, self.target.y)] = tile_types.floor
+					self.engine.game_map.remove_entity(self.target)
+					self.engine.game_map.set_tile(self.target.x, self.target.y, tile_types.floor)
 
 		else:
 			self.engine.message_log.add_message(
@@ -0,0 +1,187 @@
+""" Monte Carlo simulation of duels between the player and the monsters of entity_factories, used to balance the
+monsters without playing. The attacks are resolved like MeleeAction and RangedAttackAction, for all duels at once
+with numpy arrays. use python3.11 balance.py to simulate the monsters of the first 10 floors, see --help """
+
+from __future__ import annotations
+
+import argparse
+import random
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np	# type: ignore
+
+import settings
+import entity_factories
+import procgen
+import setup_game
+
+from dice import Dice
+from entity import Actor, Item
+from scheduler import action_time
+
+
+class Combatant(NamedTuple):
+	""" Everything the attacks of an actor and the attacks against it depend on """
+	name: str
+	hp_range: Tuple[int, int]		# Hit points are rolled between both values when spawned
+	armor_class: int
+	attack_bonus: int				# Added to the attack dice
+	damage: Dice
+	criticals: Tuple[int, ...]		# Attack dice values dealing critical hits
+	criticals_multi: int
+	time: int						# Time one attack takes, see scheduler.action_time
+
+
+class Duels(NamedTuple):
+	""" Results of all duels of the player against one monster """
+	monster: str
+	player_turns: np.ndarray		# Attacks the player needs to kill the monster, max_turns + 1 if it never did
+	monster_turns: np.ndarray		# Attacks the monster needs to kill the player
+	wins: float						# Share of the duels won by the player
+	losses: float
+
+
+def combatant(actor: Actor, distance: Optional[float] = None) -> Combatant:
+	""" Stats of an actor attacking in melee, or shooting from the given distance """
+	fighter = actor.fighter
+	if distance is None:
+		attack_bonus = fighter.attack_bonus
+	else:
+		attack_bonus = fighter.ranged_attack_bonus(distance)
+
+	""" Spawned monsters roll their hit points, the player starts with the ones of the prototype """
+	hp_range = fighter.hp_range if fighter.hp_range != (0, 0) else (fighter.hp, fighter.hp)
+
+	return Combatant(
+		name=actor.name,
+		hp_range=hp_range,
+		armor_class=fighter.armor_class,
+		attack_bonus=attack_bonus,
+		damage=fighter.damage,
+		criticals=tuple(fighter.criticals),
+		criticals_multi=int(fighter.criticals_multi),
+		time=action_time(actor),
+	)
+
+def turns_to_kill(
+	attacker: Combatant, defender: Combatant, duels: int, max_turns: int, rng: np.random.Generator,
+) -> np.ndarray:
+	""" Number of attacks the attacker needs to kill the defender in each duel, max_turns + 1 if it didn't. Each
+	turn rolls the attacks of all duels still going on at once """
+	low, high = defender.hp_range
+	hp = rng.integers(low, high, size=duels, endpoint=True)
+	turns = np.full(duels, max_turns + 1)
+	going_on = np.arange(duels)
+
+	for turn in range(1, max_turns + 1):
+		if not going_on.size:
+			break
+
+		""" A valid attack needs attack_dice above 1 and attack value higher then targets armor class """
+		attack_dice = rng.integers(1, 20, size=going_on.size, endpoint=True)
+		attack_value = np.clip(attack_dice + attacker.attack_bonus, 1, 20)
+		hit = (attack_dice > 1) & (attack_value >= defender.armor_class)
+
+		hit_points = attacker.damage.roll_many(going_on.size, rng)
+		critical = np.isin(attack_dice, attacker.criticals)
+		hit_points = np.where(critical, hit_points * attacker.criticals_multi, hit_points)
+
+		hp[going_on] -= np.where(hit, hit_points, 0)
+		killed = hp[going_on] <= 0
+		turns[going_on[killed]] = turn
+		going_on = going_on[~killed]
+
+	return turns
+
+def simulate(
+	player: Combatant, monster: Combatant, duels: int, max_turns: int, rng: np.random.Generator,
+) -> Duels:
+	""" Both fight until one of them is dead, the player wins in case both would need the same time """
+	player_turns = turns_to_kill(player, monster, duels, max_turns, rng)
+	monster_turns = turns_to_kill(monster, player, duels, max_turns, rng)
+
+	player_time = np.where(player_turns <= max_turns, player_turns * player.time, np.inf)
+	monster_time = np.where(monster_turns <= max_turns, monster_turns * monster.time, np.inf)
+	wins = (player_time <= monster_time) & np.isfinite(player_time)
+	losses = monster_time < player_time
+
+	return Duels(monster.name, player_turns, monster_turns, float(wins.mean()), float(losses.mean()))
+
+
+def new_player(equip: List[str]) -> Actor:
+	""" The player of a new game, with the given items of entity_factories equipped in addition """
+	player = setup_game.new_game().player
+	for name in equip:
+		item = getattr(entity_factories, name).clone()
+		item.parent = player.inventory
+		player.inventory.items.append(item)
+		player.equipment.toggle_equip(item, add_message=False)
+	return player
+
+def percentiles(turns: np.ndarray, max_turns: int) -> str:
+	""" 10th, 50th and 90th percentile, ">" in case the duels took longer than max_turns """
+	values = np.percentile(turns, (10, 50, 90), method="lower")
+	return "/".join(f"{value:.0f}" if value <= max_turns else f">{max_turns}" for value in values)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Simulate duels between the player and the monsters of each floor")
+	parser.add_argument("--floors", type=int, default=10, help="number of floors to simulate")
+	parser.add_argument("--duels", type=int, default=100000, help="number of duels per monster")
+	parser.add_argument("--max-turns", type=int, default=100, help="duels are undecided after this many attacks")
+	parser.add_argument(
+		"--equip", nargs="*", default=[], help="items of entity_factories to equip, e.g. sword scale_armor"
+	)
+	parser.add_argument(
+		"--distance", type=float, default=None, help="shoot at the monsters from this distance, needs a ranged weapon"
+	)
+	parser.add_argument("--seed", type=int, default=1, help="seed of the simulation")
+	args = parser.parse_args()
+
+	for name in args.equip:
+		item = getattr(entity_factories, name, None)
+		if not isinstance(item, Item) or not item.equippable:
+			parser.error(f"{name} is no equippable item of entity_factories")
+
+	""" No floors are generated in the background for the player """
+	settings.pregenerate_floors = False
+	random.seed(args.seed)
+	rng = np.random.default_rng(args.seed)
+
+	player_actor = new_player(args.equip)
+	if args.distance is not None:
+		weapon = player_actor.equipment.weapon
+		if weapon is None or weapon.equippable.combat != "Ranged":
+			parser.error("--distance needs a ranged weapon, e.g. --equip wooden_bow")
+	player = combatant(player_actor, args.distance)
+
+	print(
+		f"{player.name}: {player.hp_range[0]} HP, AC {player.armor_class}, attack bonus {player.attack_bonus:+d}, "
+		f"damage {player.damage}"
+	)
+	print(f"{'monster':<24}{'chance':>8}{'wins':>8}{'losses':>8}  player turns  monster turns (p10/p50/p90)")
+
+	""" Monsters appear on several floors, their duels are simulated once """
+	results: Dict[Actor, Duels] = {}
+	for floor in range(1, args.floors + 1):
+		chances = procgen.get_weighted_chances(procgen.enemy_chances, floor)
+		total = sum(chances.values())
+		print(f"Floor {floor}")
+
+		for monster, chance in chances.items():
+			if monster not in results:
+				results[monster] = simulate(player, combatant(monster), args.duels, args.max_turns, rng)
+			duels = results[monster]
+			print(
+				f"  {duels.monster:<22}{chance / total:>8.0%}{duels.wins:>8.1%}{duels.losses:>8.1%}"
+				f"  {percentiles(duels.player_turns, args.max_turns):>12}"
+				f"  {percentiles(duels.monster_turns, args.max_turns):>13}"
+			)
+
+		wins = sum(results[monster].wins * chance for monster, chance in chances.items()) / total
+		print(f"  {'weighted':<22}{'':>8}{wins:>8.1%}")
+
+
+if __name__ == "__main__":
+	main()
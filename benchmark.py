@@ -0,0 +1,318 @@
+""" Benchmarks of the hot paths (procgen, AI, FOV, rendering, saving and loading) with fixed seeds.
+use python3.11 benchmark.py to run all benchmarks and compare them against benchmark_baseline.json,
+python3.11 benchmark.py --save stores the results as new baseline. Timings depend on the machine, so the baseline
+records the machine and the commit it was measured on. Baselines of other machines are shown but never count as
+regression. A median counts as regression when it is more than --tolerance slower and more than --min-delta
+milliseconds slower than the baseline, the fastest benchmarks take a few hundredths of a millisecond and vary more
+than that from run to run. Regenerate the baseline with --save on the machine the benchmarks are compared on, using a clean checkout
+of the commit to compare against """
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np	# type: ignore
+import tcod
+from tcod.console import Console
+
+import settings
+import entity_factories
+import procgen
+import setup_game
+import tile_types
+
+from engine import Engine
+
+
+directory = os.path.dirname(os.path.abspath(__file__))
+baseline_file = os.path.join(directory, "benchmark_baseline.json")
+save_game_file = os.path.join(directory, "munchsav.sav")
+
+SEED = 1
+
+""" Holds the game of the actual run """
+state: Dict[str, Engine] = {}
+
+
+def measure(
+	function: Callable[[], None], repeat: int, setup: Optional[Callable[[int], None]] = None,
+) -> List[float]:
+	""" Call function repeat times and return the duration of each call in seconds. setup is called with the
+	number of the run before each call and is not measured, the random generator is seeded for each run """
+	durations = []
+	for run in range(repeat):
+		random.seed(SEED + run)
+		if setup:
+			setup(run)
+
+		start = time.perf_counter()
+		function()
+		durations.append(time.perf_counter() - start)
+	return durations
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+	""" Mean and percentile latencies in milliseconds, plus calls per second """
+	milliseconds = np.array(durations) * 1000
+	return {
+		"mean": float(milliseconds.mean()),
+		"p50": float(np.percentile(milliseconds, 50)),
+		"p90": float(np.percentile(milliseconds, 90)),
+		"p99": float(np.percentile(milliseconds, 99)),
+		"per_second": float(1000 / milliseconds.mean()),
+	}
+
+
+def new_engine(seed: int = SEED) -> Engine:
+	""" Always the same game for the same seed """
+	random.seed(seed)
+	return setup_game.new_game()
+
+def fresh_engines() -> Callable[[int], None]:
+	""" Returns a setup function, which puts a new copy of the same game into state["engine"] before each run """
+	snapshot = pickle.dumps(new_engine())
+
+	def setup(run: int) -> None:
+		state["engine"] = pickle.loads(snapshot)
+
+	return setup
+
+def bench_generate_dungeon(repeat: int, monsters: int) -> List[float]:
+	""" Each run starts from a new game, prototypes copied while spawning would otherwise grow with the game """
+	return measure(
+		lambda: procgen.generate_dungeon(
+			max_rooms=settings.max_rooms,
+			room_min_size=settings.room_min_size,
+			room_max_size=settings.room_max_size,
+			map_width=settings.map_width,
+			map_height=settings.map_height,
+			engine=state["engine"],
+			current_floor=1,
+		),
+		repeat,
+		fresh_engines(),
+	)
+
+def bench_generate_drunkjard(repeat: int, monsters: int) -> List[float]:
+	""" Same parameters as GameWorld.generate_floor_drunkjard """
+	return measure(
+		lambda: procgen.generate_drunkjard(
+			map_width=settings.map_width,
+			map_height=settings.map_height,
+			steps_min=2,
+			steps_max=4,
+			walks_min=15,
+			walks_max=25,
+			drunks_min=10,
+			drunks_max=30,
+			engine=state["engine"],
+			current_floor=1,
+		),
+		repeat,
+		fresh_engines(),
+	)
+
+def bench_enemy_turns(repeat: int, monsters: int) -> List[float]:
+	""" Monsters are spread over the floor with all doors open and given a path to the player, so all of them hunt
+	the player. Each run starts from the same copy of the game """
+	engine = new_engine()
+	game_map = engine.game_map
+
+	""" Closed doors would keep most monsters from reaching the player """
+	game_map.tiles[game_map.tiles["kind"] == tile_types.TileKind.DOOR] = tile_types.open_door_base
+	floors = np.argwhere(game_map.tiles["kind"] == tile_types.TileKind.FLOOR).tolist()
+	random.shuffle(floors)
+
+	spawned = 0
+	for x, y in floors:
+		if spawned == monsters:
+			break
+		if game_map.get_blocking_entity_at_location(x, y) is None:
+			entity_factories.orc.spawn(game_map, x, y)
+			spawned += 1
+	game_map.visible[:] = True
+	game_map.changed()
+
+	""" Most monsters are out of the activity radius of the player, idle they would fall asleep. With a path to the
+	player they keep hunting """
+	player = engine.player
+	for actor in game_map.actors:
+		if actor is not player and hasattr(actor.ai, "path"):
+			actor.ai.path = actor.ai.get_path_to(player.x, player.y)
+
+	snapshot = pickle.dumps(engine)
+
+	def setup(run: int) -> None:
+		state["engine"] = pickle.loads(snapshot)
+
+	return measure(lambda: state["engine"].handle_enemy_turns(), repeat, setup)
+
+def bench_update_fov(repeat: int, monsters: int) -> List[float]:
+	""" The player is placed on a random floor tile each run, so the FOV is really calculated """
+	engine = new_engine()
+	floors = np.argwhere(engine.game_map.tiles["kind"] == tile_types.TileKind.FLOOR).tolist()
+
+	def setup(run: int) -> None:
+		engine.player.place(*random.choice(floors))
+
+	return measure(engine.update_fov, repeat, setup)
+
+def measure_render(repeat: int, changed: bool) -> List[float]:
+	""" Render the map into an offscreen console, the whole map is explored. Unless the map changed before each run,
+	all runs after the first reuse the tile graphics of the last render """
+	engine = new_engine()
+	engine.game_map.explored[:] = True
+	engine.game_map.changed()
+	console = Console(settings.screen_width, settings.screen_height, order="F")
+
+	def setup(run: int) -> None:
+		console.clear()
+		if changed:
+			engine.game_map.changed()
+
+	return measure(lambda: engine.game_map.render(console), repeat, setup)
+
+def bench_render(repeat: int, monsters: int) -> List[float]:
+	""" Most frames, nothing changed since the last one """
+	return measure_render(repeat, changed=False)
+
+def bench_render_changed(repeat: int, monsters: int) -> List[float]:
+	""" Frames after each turn, the tile graphics are selected again """
+	return measure_render(repeat, changed=True)
+
+def bench_save(repeat: int, monsters: int) -> List[float]:
+	engine = setup_game.load_game(save_game_file)
+	with tempfile.TemporaryDirectory() as temp:
+		filename = os.path.join(temp, "benchmark.sav")
+		return measure(lambda: engine.save_as(filename), repeat)
+
+def bench_load(repeat: int, monsters: int) -> List[float]:
+	with tempfile.TemporaryDirectory() as temp:
+		filename = os.path.join(temp, "benchmark.sav")
+		setup_game.load_game(save_game_file).save_as(filename)
+		return measure(lambda: setup_game.load_game(filename), repeat)
+
+
+benchmarks: Dict[str, Callable[[int, int], List[float]]] = {
+	"generate_dungeon": bench_generate_dungeon,
+	"generate_drunkjard": bench_generate_drunkjard,
+	"enemy_turns": bench_enemy_turns,
+	"update_fov": bench_update_fov,
+	"render": bench_render,
+	"render_changed": bench_render_changed,
+	"save_as": bench_save,
+	"load_game": bench_load,
+}
+
+
+def machine() -> Dict[str, Any]:
+	""" The host and the versions the timings depend on """
+	return {
+		"node": platform.node(),
+		"system": platform.system(),
+		"processor": platform.processor() or platform.machine(),
+		"cpus": os.cpu_count(),
+		"python": platform.python_version(),
+		"numpy": np.__version__,
+		"tcod": tcod.__version__,
+	}
+
+def commit() -> Optional[str]:
+	""" The git commit the benchmarks ran on, marked dirty in case of local changes. None outside of a checkout """
+	try:
+		result = subprocess.run(
+			["git", "describe", "--always", "--dirty"], cwd=directory, capture_output=True, text=True, check=True
+		)
+	except (OSError, subprocess.CalledProcessError):
+		return None
+	return result.stdout.strip()
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Benchmark the hot paths of ThunderpigsRL")
+	parser.add_argument("names", nargs="*", help=f"benchmarks to run, default all: {', '.join(benchmarks)}")
+	parser.add_argument("--repeat", type=int, default=50, help="number of measured calls per benchmark")
+	parser.add_argument("--monsters", type=int, default=50, help="number of monsters for enemy_turns")
+	parser.add_argument("--baseline", default=baseline_file, help="file with the baseline results")
+	parser.add_argument("--save", action="store_true", help="store the results as new baseline")
+	parser.add_argument(
+		"--tolerance", type=float, default=0.25, help="allowed slowdown of the median against the baseline"
+	)
+	parser.add_argument(
+		"--min-delta", type=float, default=0.05, help="allowed slowdown of the median in milliseconds, in any case"
+	)
+	args = parser.parse_args()
+
+	""" Floors generated in the background would compete with the measurements """
+	settings.pregenerate_floors = False
+
+	names = args.names or list(benchmarks)
+	for name in names:
+		if name not in benchmarks:
+			parser.error(f"unknown benchmark {name}")
+
+	""" Older baselines only hold the results, their machine is unknown """
+	baseline: Dict[str, Any] = {"machine": None, "commit": None, "results": {}}
+	if os.path.exists(args.baseline):
+		with open(args.baseline) as f:
+			baseline = json.load(f)
+		if "results" not in baseline:
+			baseline = {"machine": None, "commit": None, "results": baseline}
+	
+	same_machine = baseline["machine"] == machine()
+	if baseline["results"] and not same_machine:
+		measured_on = f"another machine ({baseline['machine']})" if baseline["machine"] else "an unknown machine"
+		print(
+			f"Baseline was measured on {measured_on}, slower results are no regressions. "
+			"Use --save to measure a baseline on this machine"
+		)
+
+	results = {}
+	regressions = []
+	print(f"{'benchmark':<20}{'mean ms':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'per s':>10}  baseline p50")
+	for name in names:
+		results[name] = summarize(benchmarks[name](args.repeat, args.monsters))
+		result = results[name]
+
+		comparison = ""
+		if name in baseline["results"]:
+			ratio = result["p50"] / baseline["results"][name]["p50"]
+			delta = result["p50"] - baseline["results"][name]["p50"]
+			comparison = f"{ratio:.2f}x"
+			if ratio > 1 + args.tolerance and delta > args.min_delta and same_machine:
+				comparison += " REGRESSION"
+				regressions.append(name)
+
+		print(
+			f"{name:<20}{result['mean']:>10.2f}{result['p50']:>10.2f}{result['p90']:>10.2f}"
+			f"{result['p99']:>10.2f}{result['per_second']:>10.1f}  {comparison}"
+		)
+
+	if args.save:
+		""" Results of other machines are dropped, a baseline only holds results of one machine """
+		if not same_machine:
+			baseline["results"] = {}
+		baseline["machine"] = machine()
+		baseline["commit"] = commit()
+		baseline["results"].update(results)
+		with open(args.baseline, "w") as f:
+			json.dump(baseline, f, indent=4, sort_keys=True)
+			f.write("\n")
+		print(f"Baseline saved to {args.baseline}")
+	elif regressions:
+		print(f"Slower than baseline: {', '.join(regressions)}")
+		sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import random
 
 from typing import List, Optional, Tuple, TYPE_CHECKING
@@ -21,6 +22,36 @@ class BaseAI(Action):
 
 	def perform(self) -> None:
 		raise NotImplementedError()
+	
+	def clone(self, entity: Actor) -> BaseAI:
+		""" Copy of this AI for an actor cloned from a prototype, with its own path """
+		clone = copy.copy(self)
+		clone.entity = entity
+		for name, value in clone.__dict__.items():
+			if isinstance(value, list):
+				clone.__dict__[name] = value.copy()
+		return clone
+	
+	@property
+	def is_idle(self) -> bool:
+		""" True in case the AI has nothing to do while the player can't see the actor """
+		return True
+	
+	def can_sleep(self) -> bool:
+		""" Actors with nothing to do, outside the activity radius or out of sight, can be skipped until they are
+		woken up by visibility, noise or damage. Actors which aren't idle never sleep, e.g. a confusion keeps wearing
+		off and a path is followed to its end """
+		if not self.is_idle:
+			return False
+		player = self.engine.player
+		distance = max(abs(player.x - self.entity.x), abs(player.y - self.entity.y))
+		if distance > settings.ai_activity_radius:
+			return True
+		return not self.engine.game_map.visible[self.entity.x, self.entity.y]
+	
+	def alert(self, x: int, y: int) -> None:
+		""" Called when the actor is woken up by something happening at x, y """
+		pass
 		
 	def get_path_to(self, dest_x: int, dest_y: int) -> List[Tuple[int, int]]:
 		""" Compute and return a path the the target position.
@@ -52,6 +83,24 @@ class BaseAI(Action):
 		
 		""" Convert from List[List[int]] to List[Tuple[int, int]] """
 		return [(index[0], index[1]) for index in path]
+		
+	def get_path_to_player(self) -> List[Tuple[int, int]]:
+		""" Return the path to the player by stepping downhill on the engines distance field, which is
+		computed once per turn.
+		
+		If there is no valid path then returns an empty list.
+		"""
+		distance = self.engine.player_distance
+		if distance[self.entity.x, self.entity.y] == np.iinfo(distance.dtype).max:
+			return []
+		
+		""" Compute the path to the player and remove the starting point """
+		path: List[List[int]] = tcod.path.hillclimb2d(
+			distance, (self.entity.x, self.entity.y), True, True
+		)[1:].tolist()
+		
+		""" Convert from List[List[int]] to List[Tuple[int, int]] """
+		return [(index[0], index[1]) for index in path]
 
 
 class ConfusedEnemy(BaseAI):
@@ -67,6 +116,17 @@ class ConfusedEnemy(BaseAI):
 		
 		self.previous_ai = previous_ai
 		self.turns_remaining = turns_remaining
+	
+	def clone(self, entity: Actor) -> ConfusedEnemy:
+		clone = super().clone(entity)
+		if self.previous_ai:
+			clone.previous_ai = self.previous_ai.clone(entity)
+		return clone
+	
+	@property
+	def is_idle(self) -> bool:
+		""" The confusion wears off, even out of sight """
+		return False
 		
 	def perform(self) -> None:
 		""" Revert the AI back to original if the effect has run its course """
@@ -126,6 +186,15 @@ class HostileEnemy(BaseAI):
 	def __init__(self, entity: Actor):
 		super().__init__(entity)
 		self.path: List[Tuple[int, int]] = []
+	
+	@property
+	def is_idle(self) -> bool:
+		return not self.path
+	
+	def alert(self, x: int, y: int) -> None:
+		""" Go and look what happened, in sight the path to the player is taken anyway """
+		if not self.engine.game_map.visible[self.entity.x, self.entity.y]:
+			self.path = self.get_path_to(x, y)
 		
 	def perform(self) -> None:
 		""" Get player as target and calculate distance """
@@ -139,7 +208,7 @@ class HostileEnemy(BaseAI):
 			if distance <= 1:
 				return MeleeAction(self.entity, dx, dy).perform()
 				
-			self.path = self.get_path_to(target.x, target.y)
+			self.path = self.get_path_to_player()
 			
 		if self.path:
 			""" Move closer to player """
@@ -154,6 +223,10 @@ class ShopAI(BaseAI):
 	def __init__(self, entity: Actor):
 		super().__init__(entity)
 		self.path: List[Tuple[int, int]] = []
+	
+	@property
+	def is_idle(self) -> bool:
+		return not self.path
 		
 	def perform(self) -> None:
 		""" Get player as target and calculate distance """
@@ -167,15 +240,13 @@ class ShopAI(BaseAI):
 			if distance <= 1:
 				return WaitAction(self.entity).perform()
 				
-			self.path = self.get_path_to(target.x, target.y)
+			""" The path is taken from the distance field each turn, so changes in the path will be processed """
+			self.path = self.get_path_to_player()
 			
 		if self.path:
 			""" Move closer to the player """
 			dest_x, dest_y = self.path.pop(0)
 
-			""" Update the path after it is generated the first time to ensure that changes in the path will be processed """
-			self.path = self.get_path_to(target.x, target.y)
-
 			return MovementAction(self.entity, dest_x - self.entity.x, dest_y - self.entity.y,).perform()			
 			
 		return WaitAction(self.entity).perform()
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 class Banking(BaseComponent):
 	""" stores the money of the entity """
 	parent: Actor
+	__slots__ = ("capital",)
 	
 	def __init__(self,capital: int = 0):
 		
@@ -1,14 +1,19 @@
 from __future__ import annotations			# Annotations: -> arron in functions to specify return value
-from typing import TYPE_CHECKING			# specify kwargs (name: str,)
+from typing import Dict, TYPE_CHECKING		# specify kwargs (name: str,)
+
+import copy
+
+from slotted import Slotted
 
 if TYPE_CHECKING:
 	from engine import Engine
 	from entity import Entity
 	from game_map import GameMap
 	
-class BaseComponent:
+class BaseComponent(Slotted):
 	""" Base component for everything """
 	parent: Entity					
+	__slots__ = ("parent",)
 	
 	@property
 	def gamemap(self) -> GameMap:
@@ -17,4 +22,13 @@ class BaseComponent:
 	@property
 	def engine(self) -> Engine:
 		return self.gamemap.engine
-		
+	
+	def clone(self, parent: Entity, memo: Dict[int, Entity]) -> BaseComponent:
+		""" Copy of this component for an entity cloned from a prototype. Values are shared with the prototype, only
+		lists and dicts are copied as they are changed in place. memo is passed on to Entity.clone """
+		clone = copy.copy(self)
+		clone.parent = parent
+		for name, value in clone.__getstate__().items():
+			if isinstance(value, (list, dict)):
+				setattr(clone, name, value.copy())
+		return clone
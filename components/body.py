@@ -26,6 +26,7 @@ self._parts: List of Body Parts
 class Body(BaseComponent):
 	""" The Basic body, specifies the kind of body of the entity """
 	parent: Entity
+	__slots__ = ("_previous_kind", "_kind", "_parts", "_permit_skills", "_forbit_skills")
 	
 	def __init__(
 		self,
@@ -221,6 +222,11 @@ class Body(BaseComponent):
 			self._permit_skills.append("Ranged")
 			self._permit_skills.append("2Hand")
 		
+		""" The skills component caches the skills including the ones of the body """
+		skills = getattr(getattr(self, "parent", None), "skills", None)
+		if skills:
+			skills.invalidate()
+		
 	
 	def amputate(self, name: str) -> None:
 		""" Amputate a specific body part from the entity, remove the first hit of the given name """
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
 
 class Clas(BaseComponent):
 	parent: Entity
+	__slots__ = ("_clas", "_previous_clas")
 	
 	def __init__(
 		self,
@@ -27,6 +27,7 @@ if TYPE_CHECKING:
 class Consumable(BaseComponent):
 	""" Consumable can be used """
 	parent: Item
+	__slots__ = ()
 	
 	def get_action(self, consumer: Actor) -> Optional[ActionOrHandler]:
 		""" Try to return the action for this item. """
@@ -43,33 +44,39 @@ class Consumable(BaseComponent):
 		if isinstance(inventory, components.inventory.Inventory):
 			inventory.items.remove(entity)
 
-	def encrypt_name(self, encrypted_name):
-		""" Checks if encrypted name exists, if not generates one and returns it """
-		if encrypted_name == "":
-			encrypted_name = self.parent.encrypted_name()
-		self.parent.name = encrypted_name
-		return encrypted_name
+	def encrypt_name(self) -> None:
+		""" Items of this kind have to be identified, they show the encrypted name of the kind until then. Items
+		copied from an item of the kind (e.g. into chests) share its identity already """
+		if self.parent.identity is None:
+			self.parent.identity = self.engine.identification.identity(self.parent)
+	
+	def identify(self) -> None:
+		""" Reveal the real name of every item of this kind """
+		self.engine.identification.identify(self.parent)
 
 
 class MoneyConsumable(Consumable):
+	__slots__ = ()
 	def initialize(self):
 		""" Initialize the Money to a random value between 1 and 10 """
 		self.parent.value = randint(1, 10)
 
 class GemConsumable(Consumable):
 	""" This is the base for everthing like rock, gems, etc. """
+	__slots__ = ()
 	def get_action(self, consumer: Actor):
 		return None
 
 class ConfusionConsumalbe(Consumable):
 	""" Used by the confusion scroll """
+	__slots__ = ("number_of_turns",)
 	def __init__(self, number_of_turns: int):
 		""" Sets the number of turns the effect will take place """
 		self.number_of_turns = number_of_turns
 	
 	def initialize(self):
 		""" get the encrypted name at initialization """
-		settings.str_confusion_scroll_name_enc = self.encrypt_name(settings.str_confusion_scroll_name_enc)
+		self.encrypt_name()
 
 	def get_action(self, consumer: Actor) -> SingleRangedAttackHandler:
 		""" The input handler to select the target """
@@ -91,10 +98,8 @@ class ConfusionConsumalbe(Consumable):
 		if not target:
 			raise Impossible(settings.str_must_select_target)
 		if target is consumer:
-			""" Reveal the real name of the scroll, even if it can't be cast on yourself """
-			for item in self.engine.spawned_items:
-				if item.name == settings.str_confusion_scroll_name_enc:
-					item.name = settings.str_confusion_scroll_name
+			""" Reveal the real name of the scroll, even if it can\'t be cast on yourself """
+			self.identify()
 			raise Impossible(settings.str_cant_confuse_yourself)
 
 		""" If skills component is used, check wether the skill is availible """
@@ -114,23 +119,22 @@ class ConfusionConsumalbe(Consumable):
 			entity=target, previous_ai=target.ai, turns_remaining=self.number_of_turns,
 		)
 
-		""" Change Name for every spawned item to decrypted name """
-		for item in self.engine.spawned_items:
-			if item.name == settings.str_confusion_scroll_name_enc:
-				item.name = settings.str_confusion_scroll_name
+		""" Reveal the real name of every item of this kind """
+		self.identify()
 
 		""" Remove scroll from inventory and the game """
 		self.consume()
 
 class DumbConsumable(Consumable):
 	""" used by dumb scroll """
+	__slots__ = ("number_of_turns",)
 	def __init__(self, number_of_turns: int):
 		""" Sets the number of turns the effect will take place """
 		self.number_of_turns = number_of_turns
 
 	def initialize(self):
 		""" get the encrypted name at initialization """
-		settings.str_dumb_scroll_enc = self.encrypt_name(settings.str_dumb_scroll_enc)
+		self.encrypt_name()
 
 	def get_action(self, consumer: Actor) -> SingleRangedAttackHandler:
 		""" The input handler to select the target """
@@ -164,15 +168,14 @@ class DumbConsumable(Consumable):
 		else:
 			self.engine.message_log.add_message(f"{target.name} {settings.str_is_dumb}")
 		
-		""" Change Name for every spawned item to decrypted name """
-		for item in self.engine.spawned_items:
-			if item.name == settings.str_dumb_scroll_enc:
-				item.name = settings.str_dumb_scroll
+		""" Reveal the real name of every item of this kind """
+		self.identify()
 
 		""" Remove scroll from inventory and the game """
 		self.consume()
 			
 class FovConsumable(Consumable):
+	__slots__ = ("number_of_turns", "fov")
 	def __init__(self, number_of_turns: int, fov: int):
 		""" Sets the number of turns the effect will take place and the size of the FOV"""
 		self.number_of_turns = number_of_turns
@@ -180,7 +183,7 @@ class FovConsumable(Consumable):
 
 	def initialize(self):
 		""" get the encrypted name at initialization """
-		settings.str_vision_scroll_enc = self.encrypt_name(settings.str_vision_scroll_enc)
+		self.encrypt_name()
 
 	def get_action(self, consumer: Actor) -> SingleRangedAttackHandler:
 		""" The input handler to select the target """
@@ -210,7 +213,7 @@ class FovConsumable(Consumable):
 				raise Impossible(settings.str_dumb)
 		
 		""" Change the targets FOV, store previous FOV to convert back later """
-		target.previus_fov = target.fov
+		target.previous_fov = target.fov
 		target.fov = self.fov
 
 		""" If target is player """
@@ -233,22 +236,21 @@ class FovConsumable(Consumable):
 				""" Improved FOV of NPCs does nothing, just printing a message. NPC don't have a FOV """
 				self.engine.message_log.add_message(settings.str_npc_vision_improved.format(target.name))
 		
-		""" Change Name for every spawned item to decrypted name """
-		for item in self.engine.spawned_items:
-			if item.name == settings.str_vision_scroll_enc:
-				item.name = settings.str_vision_scroll
+		""" Reveal the real name of every item of this kind """
+		self.identify()
 		
 		""" Remove scroll from inventory of consumer and the game """
 		self.consume()
 
 class LockpickConsumable(Consumable):
 	""" Used by the lockpick scroll """
+	__slots__ = ()
 	def __init__(self):
 		pass
 
 	def initialize(self):
 		""" get the encrypted name at initialization """
-		settings.str_lockpick_scroll_enc = self.encrypt_name(settings.str_lockpick_scroll_enc)
+		self.encrypt_name()
 		
 	def get_action(self, consumer: Actor) -> SingleRangedAttackHandler:
 		""" The input handler to select the target """
@@ -271,10 +273,8 @@ class LockpickConsumable(Consumable):
 			if "Dumb" in consumer.skills.skills:
 				raise Impossible(settings.str_dumb)
 		
-		""" Change Name for every spawned item to decrypted name """
-		for item in self.engine.spawned_items:
-			if item.name == settings.str_lockpick_scroll_enc:
-				item.name = settings.str_lockpick_scroll
+		""" Reveal the real name of every item of this kind """
+		self.identify()
 
 		""" Check if target is locked, unlock it """
 		if hasattr(target, "lock"):
@@ -292,12 +292,13 @@ class LockpickConsumable(Consumable):
 
 class AmputationConsumable(Consumable):
 	""" Consumable which will amputate an organ """
+	__slots__ = ()
 	def __init__(self):
 		pass
 		
 	def initialize(self):
 		""" get the encrypted name at initialization """
-		settings.str_amputation_scroll_enc = self.encrypt_name(settings.str_amputation_scroll_enc)
+		self.encrypt_name()
 
 	def get_action(self, consumer: Actor) -> SingleRangedAttackHandler:
 		""" The input handler to select the target """
@@ -326,10 +327,8 @@ class AmputationConsumable(Consumable):
 			if "Dumb" in consumer.skills.skills:
 				raise Impossible(settings.str_dumb)
 
-		""" Change Name for every spawned item to decrypted name """
-		for item in self.engine.spawned_items:
-			if item.name == settings.str_amputation_scroll_enc:
-				item.name = settings.str_amputation_scroll
+		""" Reveal the real name of every item of this kind """
+		self.identify()
 
 		""" Amputate an organ by random if body component is availible """
 		if target.body:
@@ -347,6 +346,7 @@ class AmputationConsumable(Consumable):
 
 class HealingConsumable(Consumable):
 	""" Healing Potion uses this """
+	__slots__ = ("amount",)
 	def __init__(self, amount: int):
 		self.amount = amount
 		
@@ -378,6 +378,7 @@ class HealingConsumable(Consumable):
 			
 class FireballDamageConsumable(Consumable):
 	""" Fireball """
+	__slots__ = ("damage", "radius")
 	def __init__(self, damage: int, radius: int):
 		self.damage = damage
 		self.radius = radius
@@ -414,6 +415,7 @@ class FireballDamageConsumable(Consumable):
 		
 
 class LightningDamageConsumable(Consumable):
+	__slots__ = ("damage", "maximum_range")
 	def __init__(self, damage: int, maximum_range: int):
 		self.damage = damage
 		self.maximum_range = maximum_range
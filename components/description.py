@@ -13,6 +13,7 @@ if TYPE_CHECKING:
 
 class Description(BaseComponent):
 	parent: Entity
+	__slots__ = ("_description",)
 	
 	def __init__(
 		self,
@@ -25,6 +25,7 @@ HP: The Items hitpoints based on size and material, necessary to enable destruct
 class Dimensions(BaseComponent):
 	""" Dimension component holds all physical aspects of the entity """
 	parent: Entity
+	__slots__ = ("_size", "_weight", "_payload", "_material", "_hands", "_price", "_broken", "_hidden", "_hp")
 	
 	def __init__(
 		self,
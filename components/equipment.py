@@ -1,18 +1,39 @@
 from __future__ import annotations
 
-from typing import Optional, TYPE_CHECKING
+from typing import Dict, Optional, TYPE_CHECKING
 
 from components.base_component import BaseComponent
+from dice import Dice, NO_DICE
 from equipment_types import EquipmentType
 
 import settings
 
 if TYPE_CHECKING:
-	from entity import Actor, Item
+	from entity import Actor, Entity, Item
+
+
+""" Bonuses summed up over the equipped items """
+BONUSES = (
+	"strength_bonus",
+	"dexterity_bonus",
+	"constitution_bonus",
+	"intelligence_bonus",
+	"wisdom_bonus",
+	"charisma_bonus",
+	"armor_class_bonus",
+	"initiative_bonus",
+)
+
+""" Equipment slots holding an item """
+SLOTS = ("weapon", "armor", "hat", "shield", "boots", "quiver")
+
+""" All stats calculated by Equipment.update_stats """
+STATS = BONUSES + ("damage", "criticals", "criticals_multi")
 	
 	
 class Equipment(BaseComponent):
 	parent: Actor
+	__slots__ = SLOTS + STATS
 	
 	def __init__(
 		self,
@@ -30,218 +51,57 @@ class Equipment(BaseComponent):
 		self.shield = shield
 		self.boots = boots
 		self.quiver = quiver
+		self.update_stats()
 	
 		
-	@property
-	def strength_bonus(self) -> int:
-		bonus = 0
-		
-		if self.weapon is not None and self.weapon.equippable is not None:
-			bonus += self.weapon.equippable.strength_bonus
-			
-		if self.armor is not None and self.armor.equippable is not None:
-			bonus += self.armor.equippable.strength_bonus
-		
-		if self.hat is not None and self.hat.equippable is not None:
-			bonus += self.hat.equippable.strength_bonus
-		
-		if self.shield is not None and self.shield.equippable is not None:
-			bonus += self.shield.equippable.strength_bonus
-			
-		if self.boots is not None and self.boots.equippable is not None:
-			bonus += self.boots.equippable.strength_bonus
-			
-		return bonus
-		
-	@property
-	def dexterity_bonus(self) -> int:
-		bonus = 0
-		max_bonus = []
-		
-		if self.weapon is not None and self.weapon.equippable is not None:
-			bonus += self.weapon.equippable.dexterity_bonus
-			max_bonus.append(self.weapon.equippable.max_dex_bonus)
-			
-		if self.armor is not None and self.armor.equippable is not None:
-			bonus += self.armor.equippable.dexterity_bonus
-			max_bonus.append(self.armor.equippable.max_dex_bonus)
+	def __getattr__(self, name: str):
+		""" Saves of older versions have no stats, they are calculated on first use """
+		if name in STATS:
+			self.update_stats()
+			return getattr(self, name)
+		raise AttributeError(name)
 	
-		if self.hat is not None and self.hat.equippable is not None:
-			bonus += self.hat.equippable.dexterity_bonus
-			max_bonus.append(self.hat.equippable.max_dex_bonus)
-		
-		if self.shield is not None and self.shield.equippable is not None:
-			bonus += self.shield.equippable.dexterity_bonus
-			max_bonus.append(self.shield.equippable.max_dex_bonus)
-			
-		if self.boots is not None and self.boots.equippable is not None:
-			bonus += self.boots.equippable.dexterity_bonus
-			max_bonus.append(self.boots.equippable.max_dex_bonus)
-		
-		""" Kleinsten max_dex_bonus Wert zurückgeben """
-		result = list(set(max_bonus))
-		if 0 in result:
-			result.remove(0)
-		
-		if len(result) > 0:
-			# Wenn max_dex_bonus wert vorhanden, diesen ausgeben, falls kleiner als tat. bonus ist, sonst bonus ausgeben
-			if bonus < min(result):
-				return bonus
-			else:
-				return (min(result))
-		else:
-			# Wenn kein max_dex_bonus wert vorhanden, bonus ausgeben
-			return bonus
-		
-	@property
-	def constitution_bonus(self) -> int:
-		bonus = 0
-		
-		if self.weapon is not None and self.weapon.equippable is not None:
-			bonus += self.weapon.equippable.constitution_bonus
-			
-		if self.armor is not None and self.armor.equippable is not None:
-			bonus += self.armor.equippable.constitution_bonus
-		
-		if self.hat is not None and self.hat.equippable is not None:
-			bonus += self.hat.equippable.constitution_bonus
-		
-		if self.shield is not None and self.shield.equippable is not None:
-			bonus += self.shield.equippable.constitution_bonus
-			
-		if self.boots is not None and self.boots.equippable is not None:
-			bonus += self.boots.equippable.constitution_bonus
-			
-		return bonus
-
-	@property
-	def intelligence_bonus(self) -> int:
-		bonus = 0
-		
-		if self.weapon is not None and self.weapon.equippable is not None:
-			bonus += self.weapon.equippable.intelligence_bonus
-			
-		if self.armor is not None and self.armor.equippable is not None:
-			bonus += self.armor.equippable.intelligence_bonus
-		
-		if self.hat is not None and self.hat.equippable is not None:
-			bonus += self.hat.equippable.intelligence_bonus
-		
-		if self.shield is not None and self.shield.equippable is not None:
-			bonus += self.shield.equippable.intelligence_bonus
-			
-		if self.boots is not None and self.boots.equippable is not None:
-			bonus += self.boots.equippable.intelligence_bonus
-			
-		return bonus
-
-	@property
-	def wisdom_bonus(self) -> int:
-		bonus = 0
-		
-		if self.weapon is not None and self.weapon.equippable is not None:
-			bonus += self.weapon.equippable.wisdom_bonus
-			
-		if self.armor is not None and self.armor.equippable is not None:
-			bonus += self.armor.equippable.wisdom_bonus
-		
-		if self.hat is not None and self.hat.equippable is not None:
-			bonus += self.hat.equippable.wisdom_bonus
-		
-		if self.shield is not None and self.shield.equippable is not None:
-			bonus += self.shield.equippable.wisdom_bonus
-			
-		if self.boots is not None and self.boots.equippable is not None:
-			bonus += self.boots.equippable.wisdom_bonus
-			
-		return bonus
-
-	@property
-	def charisma_bonus(self) -> int:
-		bonus = 0
-		
-		if self.weapon is not None and self.weapon.equippable is not None:
-			bonus += self.weapon.equippable.charisma_bonus
-			
-		if self.armor is not None and self.armor.equippable is not None:
-			bonus += self.armor.equippable.charisma_bonus
-		
-		if self.hat is not None and self.hat.equippable is not None:
-			bonus += self.hat.equippable.charisma_bonus
-		
-		if self.shield is not None and self.shield.equippable is not None:
-			bonus += self.shield.equippable.charisma_bonus
-			
-		if self.boots is not None and self.boots.equippable is not None:
-			bonus += self.boots.equippable.charisma_bonus
-			
-		return bonus
-		
-	@property
-	def armor_class_bonus(self) -> int:
-		bonus = 0
-		
-		if self.weapon is not None and self.weapon.equippable is not None:
-			bonus += self.weapon.equippable.armor_class_bonus
-			
-		if self.armor is not None and self.armor.equippable is not None:
-			bonus += self.armor.equippable.armor_class_bonus
-		
-		if self.hat is not None and self.hat.equippable is not None:
-			bonus += self.hat.equippable.armor_class_bonus
-		
-		if self.shield is not None and self.shield.equippable is not None:
-			bonus += self.shield.equippable.armor_class_bonus
-			
-		if self.boots is not None and self.boots.equippable is not None:
-			bonus += self.boots.equippable.armor_class_bonus
-			
-		return bonus
-
-	@property
-	def initiative_bonus(self) -> int:
-		bonus = 0
-		
-		if self.weapon is not None and self.weapon.equippable is not None:
-			bonus += self.weapon.equippable.initiative_bonus
-			
-		if self.armor is not None and self.armor.equippable is not None:
-			bonus += self.armor.equippable.initiative_bonus
-		
-		if self.hat is not None and self.hat.equippable is not None:
-			bonus += self.hat.equippable.initiative_bonus
-		
-		if self.shield is not None and self.shield.equippable is not None:
-			bonus += self.shield.equippable.initiative_bonus
-			
-		if self.boots is not None and self.boots.equippable is not None:
-			bonus += self.boots.equippable.initiative_bonus
-			
-		return bonus
-
-	@property
-	def damage(self) -> str:
-		damage = "0d0"
-		
-		if self.weapon is not None and self.weapon.equippable is not None:
-			damage = self.weapon.equippable.damage
-		
-		return damage
-
-	@property
-	def criticals(self) -> int:
-		criticals = [20,]
-		if self.weapon is not None and self.weapon.equippable is not None:
-			criticals = self.weapon.equippable.criticals
-		return criticals
-
-	@property
-	def criticals_multi(self) -> int:
-		criticals_multi = 2
+	def __setstate__(self, state: dict) -> None:
+		""" Older saves kept the damage as string """
+		super().__setstate__(state)
+		if "damage" in state:
+			self.damage = Dice.parse(self.damage)
+	
+	def clone(self, parent: Entity, memo: Dict[int, Entity]) -> Equipment:
+		""" Equipped items are the clones of the inventory items, or cloned in case they aren't in the inventory """
+		clone = super().clone(parent, memo)
+		for slot in SLOTS:
+			item = getattr(self, slot)
+			if item is not None:
+				setattr(clone, slot, memo[id(item)] if id(item) in memo else item.clone(memo))
+		clone.update_stats()
+		return clone
+	
+	def update_stats(self) -> None:
+		""" Sum up the bonuses of the equipped items (the quiver doesn't count), called whenever a slot changes.
+		Fighter reads the stats as plain attributes """
+		equippables = [
+			item.equippable for item in (self.weapon, self.armor, self.hat, self.shield, self.boots)
+			if item is not None and item.equippable is not None
+		]
+		
+		for name in BONUSES:
+			setattr(self, name, sum(getattr(equippable, name) for equippable in equippables))
+		
+		""" The smallest max_dex_bonus limits the dexterity bonus, 0 means no limit """
+		max_dex_bonuses = [equippable.max_dex_bonus for equippable in equippables if equippable.max_dex_bonus != 0]
+		if max_dex_bonuses:
+			self.dexterity_bonus = min(self.dexterity_bonus, min(max_dex_bonuses))
+		
+		""" Damage and criticals are taken from the weapon """
 		if self.weapon is not None and self.weapon.equippable is not None:
-			criticals_multi = self.weapon.equippable.criticals_multi
-		return criticals_multi
-
+			self.damage = self.weapon.equippable.damage
+			self.criticals = self.weapon.equippable.criticals
+			self.criticals_multi = self.weapon.equippable.criticals_multi
+		else:
+			self.damage = NO_DICE
+			self.criticals = [20,]
+			self.criticals_multi = 2
 
 
 	def item_is_equipped(self, item: Item) -> bool:
@@ -263,6 +123,7 @@ class Equipment(BaseComponent):
 			self.unequip_from_slot(slot, add_message)
 			
 		setattr(self, slot, item)
+		self.update_stats()
 		
 		if add_message:
 			self.equip_message(item.name)
@@ -274,6 +135,7 @@ class Equipment(BaseComponent):
 			self.unequip_message(current_item.name)
 			
 		setattr(self, slot, None)
+		self.update_stats()
 		
 	def toggle_equip(self, equippable_item: Item, add_message: bool = True) -> None:
 		# print(f"Angelegt: {equippable_item.name}, Wert: {equippable_item.value}, Gewicht: {equippable_item.weight} angelegt.")
@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Union
 from exceptions import Impossible
 from random import randint
 
 from components.base_component import BaseComponent
+from dice import Dice
 from equipment_types import EquipmentType
 
 import color
@@ -16,6 +17,11 @@ if TYPE_CHECKING:
 class Equippable(BaseComponent):
 	""" Equippable are Items which can be taken and equipped, like weapons and armor """
 	parent: Item
+	__slots__ = (
+		"equipment_type", "combat", "strength_bonus", "dexterity_bonus", "constitution_bonus", "intelligence_bonus",
+		"wisdom_bonus", "charisma_bonus", "armor_class_bonus", "damage", "damage_type", "initiative_bonus",
+		"criticals", "criticals_multi", "max_dex_bonus", "maximum_range",
+	)
 	
 	def __init__(
 		self,
@@ -28,7 +34,7 @@ class Equippable(BaseComponent):
 		wisdom_bonus: int = 0,
 		charisma_bonus: int = 0,
 		armor_class_bonus: int = 0,
-		damage: str = "0d0",
+		damage: Union[Dice, str, None] = "0d0",
 		damage_type: list = ["<Unknown Damage>"],
 		initiative_bonus: int = 0,
 		criticals: int =[20,],
@@ -45,17 +51,23 @@ class Equippable(BaseComponent):
 		self.wisdom_bonus = wisdom_bonus
 		self.charisma_bonus = charisma_bonus
 		self.armor_class_bonus = armor_class_bonus
-		self.damage = damage
+		self.damage = Dice.parse(damage)
 		self.damage_type = damage_type
 		self.initiative_bonus = initiative_bonus
 		self.criticals = criticals
 		self.criticals_multi = criticals_multi
 		self.max_dex_bonus = max_dex_bonus
 		self.maximum_range = maximum_range
+	
+	def __setstate__(self, state: dict) -> None:
+		""" Older saves kept the damage as string """
+		super().__setstate__(state)
+		self.damage = Dice.parse(self.damage)
 
 
 """ Ranged Weapons (under Construction) """
 class Bow (Equippable):
+	__slots__ = ()
 	def __init__(
 		self,
 		combat: str = "Ranged",
@@ -93,6 +105,7 @@ class Bow (Equippable):
 			)
 
 class Arrow (Equippable):
+	__slots__ = ()
 	def __init__(
 		self,
 		criticals: list = [20,],
@@ -109,6 +122,7 @@ class Arrow (Equippable):
 
 """ Meelee Weapons """	
 class Club (Equippable):
+	__slots__ = ()
 	def __init__(
 		self,
 		combat: str = "Melee",
@@ -145,6 +159,7 @@ class Club (Equippable):
 
 			
 class Sword(Equippable):
+	__slots__ = ()
 	def __init__(
 		self,
 		combat: str = "Melee",	
@@ -179,6 +194,7 @@ class Sword(Equippable):
 			)
 
 class Spear(Equippable):
+	__slots__ = ()
 	def __init__(
 		self,
 		damage: str = "1d6",
@@ -211,6 +227,7 @@ class Spear(Equippable):
 		)
 
 class Axe(Equippable):
+	__slots__ = ()
 	def __init__(
 		self,
 		damage: str = "1d6",
@@ -246,6 +263,7 @@ class Axe(Equippable):
 
 """ Armor """
 class Armor(Equippable):
+	__slots__ = ()
 	def __init__(
 		self,
 		strength_bonus: int = 0,
@@ -254,7 +272,7 @@ class Armor(Equippable):
 		intelligence_bonus: int = 0,
 		wisdom_bonus: int = 0,
 		charisma_bonus: int = 0,
-		damage: str = None,
+		damage: Optional[str] = None,
 		armor_class_bonus: int = 0,
 		initiative_bonus: int = 0,
 		max_dex_bonus: int = 0,
@@ -274,6 +292,7 @@ class Armor(Equippable):
 			)
 
 class Shield(Equippable):
+	__slots__ = ()
 	def __init__(
 		self,
 		strength_bonus: int = 0,
@@ -282,7 +301,7 @@ class Shield(Equippable):
 		intelligence_bonus: int = 0,
 		wisdom_bonus: int = 0,
 		charisma_bonus: int = 0,
-		damage: str = None,
+		damage: Optional[str] = None,
 		armor_class_bonus: int = 0,
 		initiative_bonus: int = 0,
 		max_dex_bonus: int = 0,
@@ -302,6 +321,7 @@ class Shield(Equippable):
 			)
 
 class Hat(Equippable):
+	__slots__ = ()
 	def __init__(
 		self,
 		strength_bonus: int = 0,
@@ -310,7 +330,7 @@ class Hat(Equippable):
 		intelligence_bonus: int = 0,
 		wisdom_bonus: int = 0,
 		charisma_bonus: int = 0,
-		damage: str = None,
+		damage: Optional[str] = None,
 		armor_class_bonus: int = 0,
 		initiative_bonus: int = 0,
 		max_dex_bonus: int = 0,
@@ -330,6 +350,7 @@ class Hat(Equippable):
 			)
 
 class Boots(Equippable):
+	__slots__ = ()
 	def __init__(
 		self,
 		strength_bonus: int = 0,
@@ -338,7 +359,7 @@ class Boots(Equippable):
 		intelligence_bonus: int = 0,
 		wisdom_bonus: int = 0,
 		charisma_bonus: int = 0,
-		damage: str = None,
+		damage: Optional[str] = None,
 		armor_class_bonus: int = 0,
 		initiative_bonus: int = 0,
 		) -> None:
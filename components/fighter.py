@@ -1,11 +1,13 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Union
 from random import randint
 
 from input_handlers import AskSelectionHandler
 from actions import MeleeAction, SwapPlaceAction
 from components.base_component import BaseComponent
 from components.ai import HostileEnemy
+from dice import Dice, NO_DICE
+from game_map import GameMap
 from render_order import RenderOrder
 
 import color
@@ -17,6 +19,11 @@ if TYPE_CHECKING:
 class Fighter(BaseComponent):
 	""" The fighter component, enable battle of all kinds """
 	parent: Actor
+	__slots__ = (
+		"base_strength", "base_dexterity", "base_constitution", "base_intelligence", "base_wisdom", "base_charisma",
+		"base_armor_class", "base_initiative", "base_damage", "base_bab", "hp_range", "_max_hp", "_hp", "target",
+		"actor", "dx", "dy",
+	)
 	
 	def __init__(
 		self,
@@ -32,7 +39,7 @@ class Fighter(BaseComponent):
 		base_charisma: int = 10,
 		base_armor_class: int = 1,
 		base_initiative: int = 0,
-		base_damage: str = "1d2",
+		base_damage: Union[Dice, str] = "1d2",
 		base_bab: int = 0,
 		):
 		
@@ -45,13 +52,18 @@ class Fighter(BaseComponent):
 		
 		self.base_armor_class = base_armor_class
 		self.base_initiative = base_initiative
-		self.base_damage = base_damage
+		self.base_damage = Dice.parse(base_damage)
 		self.base_bab = base_bab
 		
 		self.hp_range = hp_range
 		self._max_hp = hp
 		self._hp = hp
 	
+	def __setstate__(self, state: dict) -> None:
+		""" Older saves kept the damage as string """
+		super().__setstate__(state)
+		self.base_damage = Dice.parse(self.base_damage)
+	
 	@property
 	def hp(self) -> int:
 		""" TODO: Check which formula is correct """
@@ -64,9 +76,18 @@ class Fighter(BaseComponent):
 		
 	@hp.setter
 	def hp(self, value: int) -> None:
+		hurt = value < self._hp
 		self._hp = max(0, min(value, self.max_hp))
 		if self.hp == 0 and self.parent.ai:
 			self.die()
+		elif hurt:
+			""" Getting hurt wakes up dormant actors, mostly the player is the one to blame. Actors which are on no
+			map of a game (e.g. prototypes or simulated ones) have no turns to wake up for """
+			gamemap = getattr(self.parent, "parent", None)
+			if not isinstance(gamemap, GameMap) or not hasattr(gamemap, "engine"):
+				return
+			player = gamemap.engine.player
+			gamemap.wake(self.parent, player.x, player.y)
 	
 	@property
 	def strength(self) -> int:
@@ -101,9 +122,9 @@ class Fighter(BaseComponent):
 		return self.base_initiative + self.initiative_bonus
 	
 	@property
-	def damage(self) -> str:
+	def damage(self) -> Dice:
 		""" Return either weapons damage or base (unarmed) damage """
-		if self.parent.equipment.damage != "0d0":
+		if self.parent.equipment.damage != NO_DICE:
 			return self.parent.equipment.damage
 		else:
 			return self.base_damage
@@ -124,17 +145,43 @@ class Fighter(BaseComponent):
 			""" Return Criticals Multis at fighter class error """
 			return 0
 	
-	def attack_value(self) -> int:
-		""" Calculate the attack values, value between 1 and 20 """
-		attack_dice = randint(1,20)
+	@property
+	def attack_bonus(self) -> int:
+		""" Added to the attack dice of melee attacks """
+		if self.parent.dimensions:
+			size_modifier = self.parent.dimensions.size_factor
+		else:
+			size_modifier = 0
+		
+		return self.bab + self.strength_modifier + size_modifier
+	
+	def ranged_attack_bonus(self, distance: float) -> int:
+		""" Added to the attack dice of ranged attacks, shooting gets harder with the distance to the target """
 		
-		""" Size Modifier """
+		""" Calculate distance penalty based of distance to shoot """
+		""" (different calculation than in D&D3.5)"""
+		act_range = int(distance / self.parent.equipment.weapon.equippable.maximum_range *100)
+		
+		if act_range > 66:
+			range_penalty = -2
+		elif act_range > 33:
+			range_penalty = -1
+		else:
+			range_penalty = 0
+		
+		""" Calculate size modifier, larger is easier to shoot at """
 		if self.parent.dimensions:
 			size_modifier = self.parent.dimensions.size_factor
 		else:
 			size_modifier = 0
 		
-		attack_value = attack_dice + self.bab + self.strength_modifier + size_modifier
+		return self.bab + size_modifier + self.dexterity_modifier + range_penalty
+	
+	def attack_value(self) -> int:
+		""" Calculate the attack values, value between 1 and 20 """
+		attack_dice = randint(1,20)
+		
+		attack_value = attack_dice + self.attack_bonus
 		
 		if attack_value < 1:
 			attack_value = 1
@@ -144,19 +191,8 @@ class Fighter(BaseComponent):
 		return attack_dice, attack_value
 	
 	def hp_dealed(self) -> int:
-		""" Calculate dealed HP based on form no_of_dice_x_faces_+_modifier(opt)
-		e.g. 2d8+3 """ 
-		no_of_dice, faces = self.damage.split("d")
-		if "+" in faces:
-			faces, modifier = faces.split("+")
-		else:
-			modifier = 0
-
-		hit_points = 0
-		for i in range(int(no_of_dice)):
-			hit_points += (randint(1, int(faces) + int(modifier)))
-				
-		return hit_points
+		""" Calculate dealed HP by rolling the damage dice, e.g. 2d8+3 """ 
+		return self.damage.roll()
 	
 	@property
 	def bab(self) -> int:
@@ -256,7 +292,7 @@ class Fighter(BaseComponent):
 		self.parent.blocks_movement = False
 		self.parent.ai = None
 		self.parent.name = settings.str_remains + f"{self.parent.name}"
-		self.parent.render_order = RenderOrder.CORPSE
+		self.parent.gamemap.change_render_order(self.parent, RenderOrder.CORPSE)
 		
 		self.engine.message_log.add_message(death_message, death_message_color)
 
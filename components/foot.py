@@ -22,6 +22,7 @@ Fin: Swimming, Forbids Walking
 class Foot(BaseComponent):
 	""" A basic foot """
 	parent: Entity
+	__slots__ = ("_name", "_long_name", "_weight", "_permit_skills", "_forbit_skills")
 	
 	def __init__(
 		self,
@@ -64,6 +65,7 @@ class Foot(BaseComponent):
 
 class Humanoid_Foot(Foot):
 	""" A Humanoid foot, having toes """
+	__slots__ = ()
 	def __init__(
 		self,
 		long_name = "Humanoid foot",
@@ -77,6 +79,7 @@ class Humanoid_Foot(Foot):
 		
 class Doglike_Foot(Foot):
 	""" A Doglike (animal) foot, having claws """
+	__slots__ = ()
 	def __init__(
 		self,
 		long_name = "Doglike foot (having claws)",
@@ -88,6 +91,7 @@ class Doglike_Foot(Foot):
 
 class Insect_Foot(Foot):
 	""" A Insect foot, having claws """
+	__slots__ = ()
 	def __init__(
 		self,
 		long_name = "Insect foot (having claws)",
@@ -100,6 +104,7 @@ class Insect_Foot(Foot):
 
 class Dragon_Foot(Foot):
 	""" A Foot from a dragon """
+	__slots__ = ()
 	def __init__(
 		self,
 		long_name = "Dragon foot",
@@ -111,6 +116,7 @@ class Dragon_Foot(Foot):
 		
 class Fin(Foot):
 	""" A fin of a fish, enables swimming"""
+	__slots__ = ()
 	def __init__(
 		self,
 		long_name = "Fin",
@@ -20,6 +20,7 @@ Dragon Wing: Enables Melee, Flying
 class Hand(BaseComponent):
 	""" Generic hand """
 	parent: Entity
+	__slots__ = ("_name", "_long_name", "_weight", "_permit_skills", "_forbit_skills")
 	
 	def __init__(
 		self,
@@ -61,6 +62,7 @@ class Hand(BaseComponent):
 
 class Humanoid_Hand(Hand):
 	""" A Humanoid-like hand, having fingers and a thumb """
+	__slots__ = ()
 	def __init__(
 		self,
 		long_name = "Humanoid hand",
@@ -73,6 +75,7 @@ class Humanoid_Hand(Hand):
 
 class Dragon_Wing(Hand):
 	""" A dragon wing, having claws and and enables flying """
+	__slots__ = ()
 	def __init__(
 		self,
 		long_name = "Dragon Wing (having claws)",
@@ -1,21 +1,30 @@
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import Dict, List, TYPE_CHECKING
 
 import settings
 
 from components.base_component import BaseComponent
 
 if TYPE_CHECKING:
-	from entity import Actor, Item
+	from entity import Actor, Entity, Item
 	
 
 class Inventory(BaseComponent):
 	""" The inventory """
 	parent: Actor
+	__slots__ = ("capacity", "items")
 	
 	def __init__(self, capacity: int):
 		self.capacity = capacity
 		self.items: List[Item] = []
+	
+	def clone(self, parent: Entity, memo: Dict[int, Entity]) -> Inventory:
+		""" The items are cloned as well """
+		clone = super().clone(parent, memo)
+		clone.items = [item.clone(memo) for item in self.items]
+		for item in clone.items:
+			item.parent = clone
+		return clone
 		
 	def drop(self, item: Item) -> None:
 		""" Remove item from inventory and place on gamemap """
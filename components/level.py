@@ -13,6 +13,10 @@ if TYPE_CHECKING:
 class Level(BaseComponent):
 	""" Level component """
 	parent: Actor
+	__slots__ = (
+		"current_level", "current_xp", "total_xp", "turns", "level_up_base", "level_up_factor", "xp_given",
+		"skill_points",
+	)
 	
 	def __init__(
 		self,
@@ -31,6 +31,7 @@ to destroy e.g. the chest, which might brake something inside.
 class Lock(BaseComponent):
 	""" A basic lock """
 	parent: Entity
+	__slots__ = ("_name", "_long_name", "_weight", "_difficulty", "_locked", "_breakable", "entity")
 	
 	def __init__(
 		self,
@@ -21,6 +21,7 @@ Ears: Listening
 class Organ(BaseComponent):
 	""" Base organ """
 	parent: Entity
+	__slots__ = ("_name", "_long_name", "_weight", "_permit_skills", "_forbit_skills")
 	
 	def __init__(
 		self,
@@ -64,6 +65,7 @@ class Organ(BaseComponent):
 
 class Ear(Organ):
 	""" A basic ear """
+	__slots__ = ()
 	
 	def __init__(
 		self,
@@ -77,6 +79,7 @@ class Ear(Organ):
 
 class Eye(Organ):
 	""" A Basic eye """
+	__slots__ = ()
 	
 	def __init__(
 		self,
@@ -90,6 +93,7 @@ class Eye(Organ):
 		
 class Mouth(Organ):
 	""" A basic mouth """
+	__slots__ = ()
 	
 	def __init__(
 		self,
@@ -103,6 +107,7 @@ class Mouth(Organ):
 
 class Nose(Organ):
 	""" A basic nose """
+	__slots__ = ()
 	
 	def __init__(
 		self,
@@ -117,6 +122,7 @@ class Nose(Organ):
 class Dragon_Nose(Organ):
 	""" A dragons nose, can cast fire. Cast_Fire not implemented yet """
 	parent: Entity
+	__slots__ = ()
 	
 	def __init__(
 		self,
@@ -37,6 +37,7 @@ if TYPE_CHECKING:
 class Race(BaseComponent):
 	""" The race of the entity """
 	parent: Entity
+	__slots__ = ("_race", "_previous_race")
 	
 	def __init__(
 		self,
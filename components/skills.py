@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import heapq
+
+from typing import FrozenSet, Optional, TYPE_CHECKING
 
 from random import randint
 
@@ -31,6 +33,7 @@ Searching							- finding Traps and open doors
 
 class Skills(BaseComponent):
 	parent: Entity
+	__slots__ = ("_skills", "_forbit_skills", "_temp_skills", "_skill_set")
 	
 	def __init__(
 		self,
@@ -41,22 +44,37 @@ class Skills(BaseComponent):
 		
 		self._skills = skills
 		self._forbit_skills = forbit_skills
-		self._temp_skills = temp_skills
+		self._temp_skills = temp_skills		# Heap of (tick the skill expires, skill)
+		self._skill_set = None				# Cached result of skills, cleared by invalidate
+	
+	def __getstate__(self) -> dict:
+		""" The cached skills are not saved """
+		state = super().__getstate__()
+		state["_skill_set"] = None
+		return state
+	
+	def __setstate__(self, state: dict) -> None:
+		""" Older saves kept the temporary skills as (skill, tick) in a list """
+		super().__setstate__(state)
+		self._skill_set = None
+		if self._temp_skills and isinstance(self._temp_skills[0][0], str):
+			self._temp_skills = [(tick, skill) for skill, tick in self._temp_skills]
+			heapq.heapify(self._temp_skills)
 	
 	@property
-	def skills(self) -> str:
+	def skills(self) -> FrozenSet[str]:
 		""" Return the permit skills stored in the skill component, if body is attached
-		including the skills from the body """
+		including the skills from the body. Calculated once until the skills change """
 		
 		# Todo should be renamed to permit_skills
 		
-		temp_skills = []
-		for skill in self._temp_skills:
-				temp_skills.append(skill[0])
-		if self.parent.body:
-			return self._skills + self.parent.body.permit_skills + temp_skills
-		else:
-			return self._skills + temp_skills
+		if self._skill_set is None:
+			skills = set(self._skills)
+			skills.update(skill for tick, skill in self._temp_skills)
+			if self.parent.body:
+				skills.update(self.parent.body.permit_skills)
+			self._skill_set = frozenset(skills)
+		return self._skill_set
 	
 	@property
 	def forbit_skills(self) -> str:
@@ -65,34 +83,41 @@ class Skills(BaseComponent):
 		if self.parent.body:
 			return self._forbit_skills
 	
+	def invalidate(self) -> None:
+		""" Forget the cached skills, called whenever the skills of the component or the body change """
+		self._skill_set = None
+	
 	def add_skill(self, skill: str, duration: Optional[int] = 0) -> None:
 		""" Add temporary skills (when duration is provided) to self._temp_skills, others to self.skills """
 		
 		if duration > 0:
-			self._temp_skills.append((skill, self.gamemap.engine.tick + duration),)
+			heapq.heappush(self._temp_skills, (self.gamemap.engine.tick + duration, skill))
 		else:
 			self._skills.append(skill)
+		self.invalidate()
 		return
 
 	def remove_skill(self, skill: str, tick: Optional[int] = 0) -> None:
-		""" Checks when temporary skill must be removed """
-
-		""" TODO: rewrite """
+		""" Remove a skill, with tick the temporary skills expiring up to tick """
 		if tick > 0:
-			for skill in self._temp_skills:
-				if skill[1] == tick:
-					self._temp_skills.remove(skill)
-					if skill[0] == settings.str_fov_change:
-						self.parent.fov = self.parent.previous_fov
-						self.parent.previous_fov = 0
+			self.expire_skills(tick)
 		else:
 			if skill in self._skills:
 				self._skills.remove(skill)
+				self.invalidate()
 		return
 	
+	def expire_skills(self, tick: int) -> None:
+		""" Remove the temporary skills expiring up to the given tick, only these are looked at """
+		while self._temp_skills and self._temp_skills[0][0] <= tick:
+			expires, skill = heapq.heappop(self._temp_skills)
+			if skill == settings.str_fov_change:
+				self.parent.fov = self.parent.previous_fov
+				self.parent.previous_fov = 0
+			self.invalidate()
+	
 	def requires_skill(self, skill: list) -> None:
 		""" check if skill is availible """
 		for i in skill:
 			if i not in self.skills:
 				raise exceptions.Impossible(f"{i} is not possible!")
-
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 from random import randint, choice
-from copy import deepcopy
 
 import entity_factories
 import tile_types
 
 from components.base_component import BaseComponent
+from dice import Dice, NO_DICE
 from equipment_types import EquipmentType
 from exceptions import Impossible
 from input_handlers import ActionOrHandler, ChestInventoryHandler, AskSelectionHandler, MainGameEventHandler, GameSuccess
@@ -23,6 +23,7 @@ if TYPE_CHECKING:
 class Usable(BaseComponent):
 	""" The basic component for usable furniture """
 	parent: Furniture
+	__slots__ = ("target", "actor")
 
 	def __init__(self):
 		pass
@@ -41,29 +42,15 @@ class Usable(BaseComponent):
 		pass
 
 	
-	def calculate_damage(self, dice_roll):
-		""" Calculate the dealed damage by an dice roll string like 3d6+5. Used e.g by traps """
-		
-		dealed_damage = 0
-		""" slice the dice string """
-		if "+" in dice_roll:
-			temp, modifier = dice_roll.split("+")
-			no_of_dice, faces = temp.split("d")
-		else:
-			no_of_dice, faces = dice_roll.split("d")
-			modifier = 0
-		
-		""" roll the dice """
-		for i in range(int(no_of_dice)):
-			dealed_damage += randint(1, int(faces))
-		
-		""" Add modifier and return """
-		return dealed_damage + int(modifier)
+	def calculate_damage(self, dice_roll: Dice) -> int:
+		""" Calculate the dealed damage by rolling dice like 3d6+5. Used e.g by traps """
+		return dice_roll.roll()
 	
 
 		
 class Ironbar(Usable):
 	""" Ironbars block movement of player but not FOV. At the moment, monsters can pass them """
+	__slots__ = ()
 	def get_action(self, target, actor):
 		self.target = target
 		self.actor = actor
@@ -85,11 +72,12 @@ class Ironbar(Usable):
 	def picked(self, locked) -> None:
 		""" When unlocked, remove from map """
 		if locked == False:
-			self.engine.game_map.entities.remove(self.target)
-			self.engine.game_map.tiles[(self.target.x, self.target.y)] = tile_types.floor
+			self.engine.game_map.remove_entity(self.target)
+			self.engine.game_map.set_tile(self.target.x, self.target.y, tile_types.floor)
 
 class Tree(Usable):
 	""" The tree can heal the player or cause damage """
+	__slots__ = ()
 	def get_action(self, target, actor) -> AskSelectionHandler:
 		""" Trees can be kicked """
 		""" TODO: Check for legs to kick """
@@ -106,7 +94,7 @@ class Tree(Usable):
 		elif result < 60:
 			""" Get Health Potion """
 			self.engine.message_log.add_message(settings.str_get_potion)
-			healing = deepcopy(entity_factories.health_potion)
+			healing = entity_factories.health_potion.clone()
 			healing.parent = actor.inventory
 			actor.inventory.items.append(healing)
 		elif result < 90:
@@ -116,16 +104,16 @@ class Tree(Usable):
 			""" Destroy Tree """
 			self.engine.message_log.add_message(settings.str_tree_collapse)
 			target.dimensions.broken = True
-			self.engine.game_map.entities.remove(target)
-			self.engine.game_map.tiles[(target.x, target.y)] = tile_types.floor
+			self.engine.game_map.remove_entity(target)
+			self.engine.game_map.set_tile(target.x, target.y, tile_types.floor)
 		elif result < 98:
 			""" Destroy Tree and deal damage """ 
 			damage = randint(10,30)
 			self.engine.message_log.add_message(settings.str_tree_damage.format(damage))
 			actor.fighter.hp -= damage
 			target.dimensions.broken = True
-			self.engine.game_map.entities.remove(target)
-			self.engine.game_map.tiles[(target.x, target.y)] = tile_types.floor
+			self.engine.game_map.remove_entity(target)
+			self.engine.game_map.set_tile(target.x, target.y, tile_types.floor)
 		else:
 			""" Amputate Foot """
 			damage = randint(5,10)
@@ -140,6 +128,7 @@ class Tree(Usable):
 
 class Fountain(Usable):
 	""" The fountain can heal the player or cause damage """
+	__slots__ = ()
 	def get_action(self, target, actor):
 		""" you can drink from a fountain """
 		""" TODO: Check for mouth """
@@ -177,6 +166,7 @@ class Fountain(Usable):
 
 class Cloud(Usable):
 	""" The cloud is doing noting except blocking the FOV of the entity """
+	__slots__ = ()
 	def get_action(self, target, actor):
 		pass
 		
@@ -185,16 +175,18 @@ class Cloud(Usable):
 	
 class Pillar(Usable):
 	""" The pillar is doing nothing except blocking the FOV of the entity and looks nice """
-	pass
+	__slots__ = ()
 
 class Button(Usable):
 	""" The Button finishes the game """
+	__slots__ = ()
 	def get_action(self, target, actor):
 		self.engine.message_log.add_message(settings.str_button_finish)
 		return GameSuccess(self.engine)
 
 class Chest(Usable):
 	""" A chest is a chest, is a chest """	
+	__slots__ = ()
 	def initialize(self, engine):
 		""" Populate the inventory with items """
 		
@@ -203,15 +195,13 @@ class Chest(Usable):
 		self.parent.inventory.items = []
 		no_of_items = randint(1,5)
 		
-		""" Select items from spawned items list and add to chest. Means chest will never hold novel items. """
+		""" Select items from the kinds spawned so far and add to chest. Means chest will never hold novel items. """
 		x = 1
 		while x <= no_of_items:
-			if dungeon.engine.spawned_items:
-				source = choice(dungeon.engine.spawned_items)
-				item = deepcopy(source)
-			else:
+			item = dungeon.engine.identification.random_item()
+			if item is None:
 				""" If no spawned items on map, add money """
-				item = deepcopy(entity_factories.money)
+				item = entity_factories.money.clone()
 			
 			if len(self.parent.inventory.items) == 0:
 				item.parent = self.parent.inventory
@@ -291,6 +281,7 @@ class Chest(Usable):
 
 class Door(Usable):
 	""" Door object, can be open, closed and hidden. The closed and hidden door can be locked """
+	__slots__ = ()
 	""" self.parent.value at initalization: 0 = open, 1 = closed, 2 = hidden """
 	""" self.parent.value stores the difficulty of the hidden door (15 - 20) """
 
@@ -307,7 +298,7 @@ class Door(Usable):
 			self.parent.name = settings.str_door
 			self.parent.char = "."
 			self.parent.walkable = True
-			dungeon.tiles[(x, y)] = tile_types.open_door_base
+			dungeon.set_tile(x, y, tile_types.open_door_base)
 
 		elif self.parent.value == 1:
 			""" Place closed door. Locked by chance """
@@ -319,7 +310,7 @@ class Door(Usable):
 			self.parent.name = settings.str_door	
 			self.parent.char = "+"
 			self.parent.walkable = False
-			dungeon.tiles[(x, y)] = tile_types.closed_door_base
+			dungeon.set_tile(x, y, tile_types.closed_door_base)
 			
 		elif self.parent.value == 2:
 			""" Place a hidden door """
@@ -341,7 +332,7 @@ class Door(Usable):
 			#self.parent.char = " "
 			
 			self.parent.walkable = False
-			dungeon.tiles[(x, y)] = tile_types.hidden_door_base
+			dungeon.set_tile(x, y, tile_types.hidden_door_base)
 			
 
 	def get_action(self, target, actor) -> AskSelectionHandler:
@@ -361,7 +352,7 @@ class Door(Usable):
 				self.parent.char = "+"
 				self.parent.value = 1
 				self.parent.walkable = False
-				self.engine.game_map.tiles[(self.parent.x, self.parent.y)] = tile_types.closed_door_base
+				self.engine.game_map.set_tile(self.parent.x, self.parent.y, tile_types.closed_door_base)
 			
 		elif self.parent.value == 1:
 			""" Open a closed door """
@@ -374,7 +365,7 @@ class Door(Usable):
 					self.parent.char = "."
 					self.parent.value = 0
 					self.parent.walkable = True
-					self.engine.game_map.tiles[(self.parent.x, self.parent.y)] = tile_types.open_door_base
+					self.engine.game_map.set_tile(self.parent.x, self.parent.y, tile_types.open_door_base)
 					self.engine.message_log.add_message(settings.str_open_door)
 		else:
 			pass
@@ -397,14 +388,22 @@ class Door(Usable):
 		self.parent.char = "+"
 		self.parent.value = 1
 		self.parent.walkable = False
-		self.gamemap.tiles[(self.parent.x, self.parent.y)] = tile_types.closed_door_base
+		self.gamemap.set_tile(self.parent.x, self.parent.y, tile_types.closed_door_base)
 
 class Trap(Usable):
 	""" The trap will cause damage when stepped onto it """
+	__slots__ = ("damage_type", "damage", "trap_types", "trap_type")
+	
+	def __setstate__(self, state: dict) -> None:
+		""" Older saves kept the damage as string, "Nothing" for traps without damage """
+		super().__setstate__(state)
+		if "damage" in state:
+			self.damage = NO_DICE if self.damage == "Nothing" else Dice.parse(self.damage)
+	
 	def initialize(self):
 		
 		self.damage_type = "<Unknown damage>"
-		self.damage = "Nothing"
+		self.damage = NO_DICE
 		
 		""" List of possible trap types """
 		self.trap_types = [
@@ -422,31 +421,31 @@ class Trap(Usable):
 		""" Initialize the traps accordingly """
 		if self.trap_type == settings.str_trap_water:
 			self.damage_type = settings.str_water_damage
-			self.damage = "1d6+2"
+			self.damage = Dice(1, 6, 2)
 		elif self.trap_type == settings.str_trap_fire:
 			self.damage_type = settings.str_fire_damage
-			self.damage = "2d6+3"
+			self.damage = Dice(2, 6, 3)
 		elif self.trap_type == settings.str_trap_land_mine:
 			self.damage_type = settings.str_explosion_damage
-			self.damage = "3d8+4"
+			self.damage = Dice(3, 8, 4)
 		elif self.trap_type == settings.str_trap_dart:
 			self.damage_type = settings.str_piercing
-			self.damage = "2d2"
+			self.damage = Dice(2, 2)
 		elif self.trap_type == settings.str_trap_arrow:
 			self.damage_type = settings.str_piercing
-			self.damage = "2d4"
+			self.damage = Dice(2, 4)
 		elif self.trap_type == settings.str_trap_bolt:
 			self.damage_type = settings.str_piercing
-			self.damage = "2d6"
+			self.damage = Dice(2, 6)
 		elif self.trap_type == settings.str_trap_spike:
 			self.damage_type = settings.str_piercing
-			self.damage = "3d6"
+			self.damage = Dice(3, 6)
 		elif self.trap_type == settings.str_trap_bear:
 			self.damage_type = settings.str_slashing
-			self.damage = "3d6"
+			self.damage = Dice(3, 6)
 		elif self.trap_type == settings.str_trap_falling_rock:
 			self.damage_type = settings.str_bludgeoning
-			self.damage = "2d8"
+			self.damage = Dice(2, 8)
 	
 	
 	def get_action(self, target, actor) -> AskSelectionHandler:
@@ -487,7 +486,7 @@ class Trap(Usable):
 			""" TODO: Insert that the trap isn't causing always damage, give a chance not to hit """
 
 			""" Check if trap type is causing damage """
-			if self.damage != "Nothing":
+			if self.damage != NO_DICE:
 				""" Calculate damage, deal damage to actor and show message """
 				hit_points = self.calculate_damage(self.damage)
 				actor.fighter.take_damage(hit_points, self.damage_type)
@@ -495,15 +494,13 @@ class Trap(Usable):
 
 			""" Remove Landmine once stepped onto it """
 			if self.trap_type == settings.str_trap_land_mine:
-				self.engine.game_map.entities.remove(self.parent)
+				self.engine.game_map.remove_entity(self.parent)
 
 			""" Remove stonefall trap and place a boulder instead """
 			if self.trap_type == settings.str_trap_falling_rock:
-				rock = deepcopy(entity_factories.stone)
-				rock.parent = self.engine.game_map
-				rock.spawn(self.engine.game_map, self.parent.x, self.parent.y)
+				rock = entity_factories.stone.spawn(self.engine.game_map, self.parent.x, self.parent.y)
 				self.engine.message_log.add_message(settings.str_rock_drop.format(rock.name))		
-				self.engine.game_map.entities.remove(self.parent)
+				self.engine.game_map.remove_entity(self.parent)
 
 			""" Hold actor several turns """
 			if self.trap_type == settings.str_trap_web:
@@ -524,10 +521,10 @@ class Trap(Usable):
 				while True:
 					x = randint(1, self.engine.game_map.width - 1)
 					y = randint(1, self.engine.game_map.height - 1)
-					if self.engine.game_map.tiles[x, y]["kind"] == b"Floor":
+					if self.engine.game_map.tiles[x, y]["kind"] == tile_types.TileKind.FLOOR:
 						self.engine.message_log.add_message(settings.str_teleported)
 						print(f"Teleportiere zu {x}, {y}.")
-						actor.x, actor.y = x, y
+						self.engine.game_map.move_entity(actor, x, y)
 						break
 					else:
 						pass
@@ -544,9 +541,7 @@ class Trap(Usable):
 			""" Generate an arrow by chance """
 			if self.trap_type == settings.str_trap_arrow:
 				if hit_points < 3:
-					arrow = deepcopy(entity_factories.arrow)
-					arrow.parent = self.engine.game_map
-					arrow.spawn(self.engine.game_map, actor.x, actor.y)
+					arrow = entity_factories.arrow.spawn(self.engine.game_map, actor.x, actor.y)
 					self.engine.message_log.add_message(settings.str_drops_next.format(arrow.name))
 
 		return MainGameEventHandler(self.engine)
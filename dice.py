@@ -0,0 +1,72 @@
+""" Dice expressions like 1d3, 2d8+3 or 1d4-2. They are parsed once when an entity or item is created, so rolling
+them in combat doesn't need any string work """
+
+from __future__ import annotations
+
+from functools import lru_cache
+from random import randint
+from typing import NamedTuple, Optional, Union
+
+import numpy as np	# type: ignore
+
+
+class Dice(NamedTuple):
+	""" count dice with the given number of faces plus modifier. A roll deals at least 1, except for NO_DICE """
+	count: int
+	faces: int
+	modifier: int = 0
+
+	@staticmethod
+	def parse(expression: Union[Dice, str, None]) -> Dice:
+		""" Dice of an expression like 2d8+3. Dice are returned as they are, None gives NO_DICE """
+		if isinstance(expression, Dice):
+			return expression
+		if expression is None:
+			return NO_DICE
+		return parse_expression(expression)
+
+	def __str__(self) -> str:
+		if self.modifier:
+			return f"{self.count}d{self.faces}{self.modifier:+d}"
+		return f"{self.count}d{self.faces}"
+
+	def with_modifier(self, amount: int) -> Dice:
+		""" The same dice with the modifier raised by amount, e.g. for dire and minor actors """
+		return self._replace(modifier=self.modifier + amount)
+
+	def roll(self) -> int:
+		count, faces, modifier = self
+		if count == 1:
+			return max(1, randint(1, faces) + modifier)
+		if count == 0:
+			return 0
+
+		total = modifier
+		for _ in range(count):
+			total += randint(1, faces)
+		return max(1, total)
+
+	def roll_many(self, n: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+		""" n rolls at once, e.g. for simulations. Uses its own generator, so the games random state isn't changed """
+		if rng is None:
+			rng = np.random.default_rng()
+		if self.count == 0:
+			return np.zeros(n, dtype=np.int64)
+
+		rolls = rng.integers(1, self.faces, size=(n, self.count), endpoint=True).sum(axis=1) + self.modifier
+		return np.maximum(rolls, 1)
+
+
+""" Damage of entities without weapon or attack, e.g. armor """
+NO_DICE = Dice(0, 0)
+
+
+@lru_cache(maxsize=None)
+def parse_expression(expression: str) -> Dice:
+	""" Older damage strings wrote negative modifiers as +-2, they are accepted as well """
+	dice, plus, modifier = expression.replace("+-", "-").replace("-", "+-").partition("+")
+	count, _, faces = dice.partition("d")
+	try:
+		return Dice(int(count), int(faces), int(modifier) if plus else 0)
+	except ValueError:
+		raise ValueError(f"Invalid dice expression: {expression!r}") from None
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
-import lzma
-import pickle
-
 from typing import TYPE_CHECKING
 
+import numpy as np	# type: ignore
+import tcod.path
 from tcod.context import Context
 from tcod.console import Console
 from tcod.map import compute_fov
 
+import color
 import exceptions
+import settings
 
+from identification import Identification
 from message_log import MessageLog
 
 import render_functions
+import savegame
+import scheduler
+
+""" First console row below the map, used by the HUD """
+HUD_TOP = 44
 
 if TYPE_CHECKING:
 	from entity import Entity
@@ -29,18 +36,104 @@ class Engine:
 		self.message_log = MessageLog()
 		self.mouse_location = (0,0)
 		self.player = player
-		self.spawned_items = []				# List of all items spawned up to now
+		self.identification = Identification()	# Item kinds spawned up to now and their encrypted names
 		self.tick = 0						# The game "counter"
+		self._player_distance = None		# Distance field to the player, used by the AI for pathing
+		self._fov_state = None				# Game map, player position and FOV distance of the last FOV calculation
+		self._fov_transparent = None		# Transparency of the map at the last FOV calculation
+		self._autosave = None				# Future of the autosave being written
+		self._hud = None					# Console holding the last rendered HUD
+		self._hud_state = None				# Values shown by the last rendered HUD
+	
+	def __getstate__(self) -> dict:
+		""" Cached fields are not saved, they will be recalculated after loading """
+		state = self.__dict__.copy()
+		state["_player_distance"] = None
+		state["_fov_state"] = None
+		state["_fov_transparent"] = None
+		state["_autosave"] = None
+		state["_hud"] = None
+		state["_hud_state"] = None
+		return state
+	
+	def __setstate__(self, state: dict) -> None:
+		""" Saves without cached fields are supported. Older saves kept a list of all spawned items instead of the
+		identification registry, their scrolls keep the names they were saved with """
+		self.__dict__.update(state)
+		self.__dict__.pop("spawned_items", None)
+		if "identification" not in state:
+			self.identification = Identification()
+		self._player_distance = None
+		self._fov_state = None
+		self._fov_transparent = None
+		self._autosave = None
+		self._hud = None
+		self._hud_state = None
 	
 	def save_as(self, filename: str) -> None:
-		""" Save a instance of the engine as a compressed file. """
-		save_data = lzma.compress(pickle.dumps(self))
-		with open(filename, "wb") as f:
-			f.write(save_data)
+		""" Save a instance of the engine as save game file, see savegame.py. The floors being written are waited
+		for, the save only refers to their files """
+		self.game_world.flush_floors()
+		savegame.save(self, filename)
+	
+	def autosave(self) -> None:
+		""" Save the game every settings.autosave_interval ticks. Only taking the snapshot is done at once, the file
+		is written in the background. No autosave is started while the last one or a floor is still being written """
+		if not settings.autosave_interval or self.tick % settings.autosave_interval or not self.player.is_alive:
+			return
+		if self.game_world.floors_pending:
+			return
+		
+		if self._autosave:
+			if not self._autosave.done():
+				return
+			if self._autosave.exception():
+				self.message_log.add_message(settings.str_autosave_failed, color.error)
+		
+		self._autosave = savegame.save_in_background(self, settings.save_file)
+	
+	@property
+	def player_distance(self) -> np.ndarray:
+		""" Returns the distance field to the player, computed at the first request of each turn """
+		if self._player_distance is None:
+			self.update_player_distance()
+		return self._player_distance
+	
+	def update_player_distance(self) -> None:
+		""" Compute the distance of every tile to the player, AI steps downhill on it instead of
+		calculating its own path """
+		
+		""" Copy the walkable array """
+		cost = np.array(self.game_map.tiles["walkable"], dtype=np.int8)
+		
+		for entity in self.game_map.entities:
+			# Check that an entity blocks movement and the cost isn't zero (blocking.)
+			if entity.blocks_movement and cost[entity.x, entity.y]:
+				# Add to the cost of a blocked position.
+				# A lower number means more enemies will crowd behind each other in
+				# hallways. A higher number means enemies will take longer paths in
+				# order to surround the player.
+				cost[entity.x, entity.y] += 10
+		
+		""" Walk from the player outwards, unreachable tiles keep the maximum value """
+		distance = tcod.path.maxarray((self.game_map.width, self.game_map.height), order="F")
+		distance[self.player.x, self.player.y] = 0
+		self._player_distance = tcod.path.dijkstra2d(distance, cost, 2, 3, out=distance)
 	
 	def handle_enemy_turns(self) -> None:
-		""" Handles the turns of the actors, excluding the player """
-		for entity in set(self.game_map.actors) - {self.player}:
+		""" Handles the turns of the actors, excluding the player. The time of the players action passes, actors
+		act in the order of the scheduler, fast actors eventually more than once. Dormant actors are skipped """
+		
+		""" One distance field per turn is shared by all actors, it is computed when needed """
+		self._player_distance = None
+		
+		turn_scheduler = self.game_map.scheduler
+		for entity in turn_scheduler.advance(scheduler.action_time(self.player)):
+			
+			""" Actors far away or out of sight with nothing to do sleep until they are woken up """
+			if entity.ai and entity.ai.can_sleep():
+				turn_scheduler.sleep(entity)
+				continue
 			
 			""" Let the AI of the actor do whatever it should do, otherwise do nothing """
 			if entity.ai:
@@ -56,26 +149,74 @@ class Engine:
 		""" Count the Game Ticks """
 		self.tick += 1
 		
-		""" Check if temporary Skills must be removed at the actual game tick """
-		for item in self.player.skills._temp_skills:
-			if item[1] == self.tick:
-				self.player.skills.remove_skill(item, self.tick)
+		""" Remove temporary Skills expiring at the actual game tick """
+		self.player.skills.expire_skills(self.tick)
+		
+		""" Only calculate the new FOV when the map, the players position, the FOV distance or the
+		transparency of any tile changed """
+		fov_state = (self.game_map, self.player.x, self.player.y, self.player.fov)
+		transparent = self.game_map.tiles["transparent"]
+		if fov_state == self._fov_state and np.array_equal(transparent, self._fov_transparent):
+			return
+		self._fov_state = fov_state
+		self._fov_transparent = transparent.copy()
 		
 		""" Calculate the new FOV """
 		self.game_map.visible[:] = compute_fov(
-			self.game_map.tiles["transparent"],
+			transparent,
 			(self.player.x, self.player.y),
 			radius=self.player.fov,
 		)
-		""" If a tile visible, add to explored tile list """
-		self.game_map.explored |= self.game_map.visible
+		
+		""" If a tile visible, add to explored tile list. Only the area within the FOV distance can be visible,
+		a FOV distance of 0 is unlimited """
+		if self.player.fov > 0:
+			area = (
+				slice(max(0, self.player.x - self.player.fov), self.player.x + self.player.fov + 1),
+				slice(max(0, self.player.y - self.player.fov), self.player.y + self.player.fov + 1),
+			)
+			self.game_map.explored[area] |= self.game_map.visible[area]
+		else:
+			self.game_map.explored |= self.game_map.visible
+		self.game_map.changed()
+		
+		""" Actors coming into sight wake up """
+		self.game_map.wake_visible()
 		
 				
 	def render(self, console: Console) -> None:
 		""" Renders the game screen """
 
-		""" Render map and message log """
+		""" Render map """
 		self.game_map.render(console)
+		
+		""" The HUD is only drawn again when anything it shows changed """
+		hud_state = self.hud_state()
+		if hud_state != self._hud_state:
+			if self._hud is None:
+				self._hud = Console(console.width, console.height, order="F")
+			self._hud.clear()
+			self.render_hud(self._hud)
+			self._hud_state = hud_state
+		self._hud.blit(console, 0, HUD_TOP, 0, HUD_TOP, console.width, console.height - HUD_TOP)
+	
+	def hud_state(self) -> tuple:
+		""" Everything shown by the HUD """
+		return (
+			self.player.fighter.hp,
+			self.player.fighter.max_hp,
+			self.game_world.current_floor,
+			self.player.level.current_xp,
+			render_functions.get_names_at_location(*self.mouse_location, self.game_map),
+			self.player.equipment.weapon and self.player.equipment.weapon.name,
+			self.player.equipment.quiver and (self.player.equipment.quiver.name, self.player.equipment.quiver.value),
+			self.message_log.added,
+		)
+	
+	def render_hud(self, console: Console) -> None:
+		""" Renders everything below the map """
+		
+		""" Render message log """
 		self.message_log.render(console=console, x=21, y=45, width=60, height=5)
 		
 		""" Render different infos """
@@ -3,10 +3,11 @@ from __future__ import annotations
 import copy
 import math
 
-from typing import Optional, Tuple, Type, TypeVar, TYPE_CHECKING, Union
+from typing import Dict, Optional, Tuple, Type, TypeVar, TYPE_CHECKING, Union
 from random import randint, choice
 
 from render_order import RenderOrder
+from slotted import Slotted
 
 import settings
 import color
@@ -28,12 +29,21 @@ if TYPE_CHECKING:
 	from components.lock import Lock
 	from components.description import Description
 	from game_map import GameMap
+	from identification import Identity
 	
 T = TypeVar("T", bound="Entity")
 
+""" Components an entity might have, in the order they are cloned. The inventory is cloned before the equipment,
+equipped items are taken from it """
+COMPONENTS = (
+	"consumable", "equippable", "usable", "fighter", "level", "banking", "dimensions", "race", "clas", "skills",
+	"body", "description", "lock", "inventory", "equipment",
+)
 
-class Entity:
+
+class Entity(Slotted):
 	""" Basic object where all other object refer to """
+	__slots__ = ("parent", "x", "y", "char", "color", "name", "speed_points", "blocks_movement", "render_order")
 	parent: Union[GameMap, Inventory]
 
 	def __init__(
@@ -60,7 +70,7 @@ class Entity:
 		if parent:
 			""" Set entities paren in case it is provided """
 			self.parent = parent
-			parent.entities.add(self)
+			parent.add_entity(self)
 	
 	@property
 	def gamemap(self) -> GameMap:
@@ -84,12 +94,37 @@ class Entity:
 		return _encrypted_name
 
 
+	def clone(self: T, memo: Optional[Dict[int, Entity]] = None) -> T:
+		""" Copy of this prototype. Names, descriptions, organs etc. are shared with the prototype, only the components
+		and their lists are copied. The clone has no parent yet. memo maps the entities cloned so far to their clones,
+		so an item in the inventory and the equipment is cloned once """
+		if memo is None:
+			memo = {}
+		
+		clone = copy.copy(self)
+		memo[id(self)] = clone
+		if hasattr(clone, "parent"):
+			del clone.parent
+		
+		for name in COMPONENTS:
+			component = getattr(self, name, None)
+			if component is not None:
+				setattr(clone, name, component.clone(clone, memo))
+		if getattr(self, "ai", None) is not None:
+			clone.ai = self.ai.clone(clone)
+		return clone
+
 	def spawn(self: T, gamemap: GameMap, x: int, y: int) -> T:
 		""" Spawn a copy of this instance at the given location.
 		
-		call initialize() to randomize/ initialize the clone after deepcopy """
+		call initialize() to randomize/ initialize the clone """
 		
-		clone = copy.deepcopy(self)
+		clone = self.clone()
+		
+		""" Set x,y coords first, the components might need the game map when initializing """
+		clone.x = x
+		clone.y = y
+		clone.parent = gamemap
 		
 		""" Check witch modules the entity has and initialize them if possible """
 		if hasattr(clone, "consumable"):
@@ -113,21 +148,18 @@ class Entity:
 			except:
 				pass
 		
-		""" Set x,y coords and add clone to gamemaps entity list """
-		clone.x = x
-		clone.y = y
-		clone.parent = gamemap	
-		gamemap.entities.add(clone)
+		""" Add clone to gamemaps entity list """
+		gamemap.add_entity(clone)
 
-		""" In case entity has inventory, add all inventory items to spawned_items list. list is used for decoding scrolls
-		as well as populating chests """
+		""" Register the spawned items and the items in the inventory of the entity, the registry is used for
+		populating chests """
+		identification = gamemap.engine.identification
 		if clone.inventory:
 			for item in clone.inventory.items:
-				gamemap.engine.spawned_items.append(item)
+				identification.spawned(item)
 		
-		""" Add clone to list of spawned items """			
 		if isinstance(clone, Item):
-			gamemap.engine.spawned_items.append(clone)
+			identification.spawned(clone)
 
 		return clone
 		
@@ -135,17 +167,22 @@ class Entity:
 	def place(self, x: int, y: int, gamemap: Optional[GameMap] = None) -> None:
 		""" Place the entity at a new location, used for moving entities between game_maps """
 		
-		self.x = x
-		self.y = y
-		
 		""" Remove entity from game_map list in case it is """
 		if gamemap:
 			if hasattr(self, "parent"): # Possibly uninitalized.
 				if self.parent is self.gamemap:
-					self.gamemap.entities.remove(self)
+					self.gamemap.remove_entity(self)
 
+			self.x = x
+			self.y = y
 			self.parent = gamemap
-			gamemap.entities.add(self)
+			gamemap.add_entity(self)
+		elif hasattr(self, "parent") and self.parent is self.gamemap:
+			""" Stays on the actual game_map, keep its location index in sync """
+			self.gamemap.move_entity(self, x, y)
+		else:
+			self.x = x
+			self.y = y
 
 
 	def distance(self, x: int, y: int) -> float:
@@ -154,8 +191,7 @@ class Entity:
 
 	def move(self, dx: int, dy: int) -> None:
 		""" Move entity by dx, dy offset """
-		self.x += dx
-		self.y += dy
+		self.gamemap.move_entity(self, self.x + dx, self.y + dy)
 
 	"""
 	def randomize(self, min: int, max: int) -> int:
@@ -178,6 +214,10 @@ class Entity:
 
 class Actor(Entity):
 	""" Actor is a moving entity """
+	__slots__ = (
+		"attitute", "pass_door", "fov", "previous_fov", "normal_fov", "ai", "equipment", "fighter", "inventory",
+		"level", "banking", "dimensions", "race", "clas", "skills", "body", "description",
+	)
 	def __init__(
 		self,
 		*,
@@ -284,7 +324,7 @@ class Actor(Entity):
 			self.name = f"{settings.str_dire} {self.name}"
 			self.color = color.bordeaux
 			self.level.increase_hp()
-			self.fighter.base_damage = str(self.fighter.base_damage + "+2")
+			self.fighter.base_damage = self.fighter.base_damage.with_modifier(2)
 			self.level.xp_given = int(self.level.xp_given * factor)
 			self.fighter.base_strength = int(self.fighter.base_strength * factor)
 			self.fighter.base_constitution = int(self.fighter.base_constitution * factor)
@@ -295,7 +335,7 @@ class Actor(Entity):
 			self.name = f"{settings.str_minor} {self.name}"
 			self.color = color.grey
 			self.level.increase_hp(amount = -1)
-			self.fighter.base_damage = str(self.fighter.base_damage + "+-2")
+			self.fighter.base_damage = self.fighter.base_damage.with_modifier(-2)
 			self.level.xp_given = int(self.level.xp_given / factor * -1)
 			self.fighter.base_strength = int(self.fighter.base_strength / factor)
 			self.fighter.base_constitution = int(self.fighter.base_constitution / factor)
@@ -305,6 +345,10 @@ class Actor(Entity):
 
 class Item(Entity):
 	""" Items can be picked up """
+	__slots__ = (
+		"kind", "value", "hands", "consumable", "equippable", "dimensions", "inventory", "lock", "description",
+		"identity",
+	)
 
 	def __init__(
 		self,
@@ -338,6 +382,7 @@ class Item(Entity):
 		self.kind = kind		# Kind of item (scroll, etc.,,,)
 		self.value = value		# Value is used for different things, like the number of arrows or the amount of coins
 		self.hands = hands		# No of hands necessary
+		self.identity: Optional[Identity] = None		# Shared by the items of a kind that has to be identified
 
 		""" Setup optional modules """
 		self.consumable = consumable
@@ -363,10 +408,35 @@ class Item(Entity):
 		self.description = description
 		if self.description:
 			self.description.parent = self
+	
+	def __setstate__(self, state: dict) -> None:
+		""" Items of older saves have no identity, they keep the name they were saved with """
+		super().__setstate__(state)
+		if not hasattr(self, "identity"):
+			self.identity = None
+	
+	@property
+	def name(self) -> str:
+		""" Items of a kind not identified yet show the encrypted name of the kind, see identification.py """
+		if self.identity is not None and not self.identity.known:
+			return self.identity.encrypted_name
+		return Entity.name.__get__(self)
+	
+	@name.setter
+	def name(self, name: str) -> None:
+		Entity.name.__set__(self, name)
+	
+	@property
+	def real_name(self) -> str:
+		""" The name shown once the kind is identified """
+		return Entity.name.__get__(self)
 			
 			
 class Furniture(Entity):
 	""" Furniture can be used but not picked up """
+	__slots__ = (
+		"value", "kind", "walkable", "transparent", "dimensions", "inventory", "description", "lock", "usable",
+	)
 
 	def __init__(
 		self,
@@ -1,5 +1,4 @@
 from random import randint
-import copy
 
 from components.ai import HostileEnemy, ShopAI, FriendlyAI
 from components import consumable, equippable
@@ -131,10 +130,10 @@ ant = Actor(
 
 )
 
-dire_ant = copy.deepcopy(ant)
+dire_ant = ant.clone()
 dire_ant.dire(1.5)
 
-minor_ant = copy.deepcopy(ant)
+minor_ant = ant.clone()
 minor_ant.dire(-1.5)
 
 
@@ -191,10 +190,10 @@ rat = Actor(
 	body = Body("Doglike")
 )
 
-dire_rat = copy.deepcopy(rat)
+dire_rat = rat.clone()
 dire_rat.dire(1.5)
 
-minor_rat = copy.deepcopy(rat)
+minor_rat = rat.clone()
 minor_rat.dire(-1.5)
 
 
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-from typing import Iterable, Iterator, Optional, TYPE_CHECKING
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
 from random import randint
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
+import glob
+import io
+import multiprocessing
+import random
 import os
 import lzma
 import pickle
@@ -11,12 +18,20 @@ import numpy as np	# type: ignore
 from tcod.console import Console
 
 from entity import Actor, Item
+from identification import FloorIdentification, Identity
+from render_order import RenderOrder
+from scheduler import TurnScheduler
+import settings
 import tile_types
 
 if TYPE_CHECKING:
 	from engine import Engine
 	from entity import Entity
 
+
+""" Each footstep darkens the light background of a tile by 3%, indexed by the number of footsteps """
+WEAR_FACTORS = 0.97 ** np.arange(256, dtype=np.float32)
+
 class GameMap:
 	""" GameMap is where all the great stuff will happen """
 
@@ -24,7 +39,19 @@ class GameMap:
 
 		self.engine = engine
 		self.width, self.height = width, height
-		self.entities = set(entities)
+		self.entities = set()
+		
+		""" Location index (x, y) -> entities on that tile, kept in sync by add/remove/move_entity """
+		self._entity_locations: Optional[Dict[Tuple[int, int], List[Entity]]] = {}
+		self._entity_keys: Dict[Entity, Tuple[int, int]] = {}
+		
+		""" Entities bucketed by render order, kept in sync by add/remove_entity and change_render_order """
+		self._render_buckets: Optional[Dict[RenderOrder, Dict[Entity, None]]] = None
+		
+		""" Turn order of the actors on this map, kept in sync by add/remove_entity """
+		self._scheduler: Optional[TurnScheduler] = None
+		for entity in entities:
+			self.add_entity(entity)
 
 		""" the map filled with tiles """
 		self.tiles = np.full((width, height), fill_value=tile_types.wall, order="F")
@@ -34,12 +61,157 @@ class GameMap:
 		""" explored are all tiles seen up to now """
 		self.explored = np.full((width, height), fill_value=False, order="F")
 		
+		""" Added to the light background colors of the tiles, gives walls and floors a more random look """
+		self.jitter = np.zeros((width, height, 3), dtype=np.int8, order="F")
+		""" Footsteps on each tile up to 255, each darkens the light background (see WEAR_FACTORS) """
+		self.wear = np.zeros((width, height), dtype=np.uint8, order="F")
+		
 		self.downstairs_location = (0,0)
 		
+		""" Counts the changes of tiles, visible, explored, jitter and wear, see changed() """
+		self.version = 0
+		
+		""" Tile graphics of the last render and the version they were made of """
+		self._composite = None
+		self._composite_version = None
+		
+	def __getstate__(self) -> dict:
+		""" The location index, the render buckets and the render cache are not pickled, they will be rebuilt after
+		loading """
+		state = self.__dict__.copy()
+		state["_entity_locations"] = None
+		state["_entity_keys"] = {}
+		state["_render_buckets"] = None
+		state["_composite"] = None
+		state["_composite_version"] = None
+		return state
+	
+	def __setstate__(self, state: dict) -> None:
+		""" Saves without location index are supported, index is rebuilt on first use. Tiles of older saves
+		are converted to the integer tile kinds, their turn scheduler is created on first use. Older saves changed
+		the tile colors directly, they get empty jitter and wear layers """
+		self.__dict__.update(state)
+		self.tiles = tile_types.upgrade_tiles(self.tiles)
+		if "jitter" not in state:
+			self.jitter = np.zeros(self.tiles.shape + (3,), dtype=np.int8, order="F")
+			self.wear = np.zeros(self.tiles.shape, dtype=np.uint8, order="F")
+		self.__dict__.pop("_composite_source", None)
+		self.version = state.get("version", 0)
+		self._entity_locations = None
+		self._entity_keys = {}
+		self._render_buckets = None
+		self._scheduler = state.get("_scheduler")
+		self._composite = None
+		self._composite_version = None
+
 	@property
 	def gamemap(self) -> GameMap:
 		return self
 	
+	@property
+	def entity_locations(self) -> Dict[Tuple[int, int], List[Entity]]:
+		""" Returns the location index, rebuild it in case it is missing (e.g. after loading) """
+		if self._entity_locations is None:
+			self._entity_locations = {}
+			self._entity_keys = {}
+			for entity in self.entities:
+				self._index_entity(entity)
+		return self._entity_locations
+	
+	def _index_entity(self, entity: Entity) -> None:
+		""" Files the entity under its actual location """
+		key = (entity.x, entity.y)
+		self._entity_locations.setdefault(key, []).append(entity)
+		self._entity_keys[entity] = key
+	
+	def _unindex_entity(self, entity: Entity) -> None:
+		""" Removes the entity from the location it was filed under, if any. Builds the index if necessary,
+		so every change of the index must start here """
+		locations = self.entity_locations
+		key = self._entity_keys.pop(entity, None)
+		if key is None:
+			return
+		
+		entities_at_key = locations[key]
+		entities_at_key.remove(entity)
+		if not entities_at_key:
+			del locations[key]
+	
+	@property
+	def render_buckets(self) -> Dict[RenderOrder, Dict[Entity, None]]:
+		""" Returns the entities of each render order, rebuild them in case they are missing (e.g. after loading) """
+		if self._render_buckets is None:
+			self._render_buckets = {render_order: {} for render_order in RenderOrder}
+			for entity in self.entities:
+				self._render_buckets[entity.render_order][entity] = None
+		return self._render_buckets
+	
+	@property
+	def scheduler(self) -> TurnScheduler:
+		""" Returns the turn scheduler, created for the actors on the map in case it is missing (e.g. saves of older
+		versions). Actors are added sorted by location, so the turn order doesn't depend on the order of the set """
+		if self._scheduler is None:
+			self._scheduler = TurnScheduler()
+			for actor in sorted(self.actors, key=lambda actor: (actor.x, actor.y)):
+				if actor is not self.engine.player:
+					self._scheduler.add(actor)
+		return self._scheduler
+	
+	def wake(self, actor: Actor, x: int, y: int) -> None:
+		""" Wake up a dormant actor, its AI is alerted to whatever happened at x, y """
+		if self.scheduler.wake(actor) and actor.ai:
+			actor.ai.alert(x, y)
+	
+	def wake_visible(self) -> None:
+		""" Wake up the dormant actors the player sees within the activity radius """
+		player = self.engine.player
+		for actor in list(self.scheduler.dormant):
+			distance = max(abs(actor.x - player.x), abs(actor.y - player.y))
+			if self.visible[actor.x, actor.y] and distance <= settings.ai_activity_radius:
+				self.wake(actor, player.x, player.y)
+	
+	def make_noise(self, x: int, y: int, radius: int) -> None:
+		""" Wake up the dormant actors within the radius around a noise """
+		for actor in list(self.scheduler.dormant):
+			if max(abs(actor.x - x), abs(actor.y - y)) <= radius:
+				self.wake(actor, x, y)
+	
+	def _unbucket_entity(self, entity: Entity) -> None:
+		for bucket in self.render_buckets.values():
+			bucket.pop(entity, None)
+	
+	def add_entity(self, entity: Entity) -> None:
+		""" Add an entity to this map, if already on the map the index will be updated """
+		self._unindex_entity(entity)
+		self._unbucket_entity(entity)
+		self.entities.add(entity)
+		self._index_entity(entity)
+		self.render_buckets[entity.render_order][entity] = None
+		if isinstance(entity, Actor) and entity.is_alive and entity is not self.engine.player:
+			self.scheduler.add(entity)
+	
+	def remove_entity(self, entity: Entity) -> None:
+		""" Remove an entity from this map """
+		self._unindex_entity(entity)
+		self._unbucket_entity(entity)
+		self.entities.remove(entity)
+		if isinstance(entity, Actor):
+			self.scheduler.remove(entity)
+	
+	def change_render_order(self, entity: Entity, render_order: RenderOrder) -> None:
+		""" Set the render order of an entity, keeps the render buckets in sync """
+		self._unbucket_entity(entity)
+		entity.render_order = render_order
+		if entity in self.entities:
+			self.render_buckets[render_order][entity] = None
+	
+	def move_entity(self, entity: Entity, x: int, y: int) -> None:
+		""" Set the location of an entity which is on this map, keeps the location index in sync """
+		self._unindex_entity(entity)
+		entity.x, entity.y = x, y
+		if entity in self.entities:
+			self._index_entity(entity)
+	
 	@property
 	def actors(self) -> Iterator[Actor]:
 		""" Iterate over this maps living actors."""
@@ -54,30 +226,33 @@ class GameMap:
 		yield from (entity for entity in self.entities if isinstance(entity, Item))
 		
 	
+	def get_entities_at_location(self, x: int, y: int) -> List[Entity]:
+		""" Returns all entities at the given location """
+		return self.entity_locations.get((x, y), [])
+	
+	def get_items_at_location(self, x: int, y: int) -> List[Item]:
+		""" Returns all items lying at the given location """
+		return [entity for entity in self.get_entities_at_location(x, y) if isinstance(entity, Item)]
+	
 	def get_blocking_entity_at_location(
 		self, location_x: int, location_y: int,
 	) -> Optional[Entity]:
-		for entity in self.entities:
-			if (
-				entity.blocks_movement
-				and entity.x == location_x
-				and entity.y == location_y
-			):	
+		for entity in self.get_entities_at_location(location_x, location_y):
+			if entity.blocks_movement:
 				return entity
 		
 		return None
 	
 	def get_actor_at_location(self, x: int, y: int) -> Optional[Actor]:
-		for actor in self.actors:
-			if actor.x == x and actor.y == y:
-				return actor
+		for entity in self.get_entities_at_location(x, y):
+			if isinstance(entity, Actor) and entity.is_alive:
+				return entity
 			
 		return None
 
 	def get_entity_at_location(self, x: int, y: int) -> Optional[Entity]:
-		for item in self.entities:
-			if item.x == x and item.y == y:
-				return item
+		for entity in self.get_entities_at_location(x, y):
+			return entity
 			
 		return None	
 	
@@ -86,33 +261,182 @@ class GameMap:
 		"""Return True if x and y are inside of the bounds of this map."""
 		return 0 <= x < self.width and 0 <= y < self.height
 
+	def changed(self) -> None:
+		""" Has to be called after changing tiles, visible, explored, jitter or wear, so the map is rendered again.
+		Floors being generated don't need to, they are rendered the first time anyway """
+		self.version += 1
+
+	@property
+	def save_version(self) -> int:
+		""" Save games reuse the blocks of tiles, visible, explored, jitter and wear while this is unchanged """
+		return self.version
+
+	def set_tile(self, x: int, y: int, tile: np.ndarray) -> None:
+		""" Replace a tile of the map, e.g. a door opened or a wall destroyed """
+		self.tiles[x, y] = tile
+		self.version += 1
+	
+	def wear_tile(self, x: int, y: int) -> None:
+		""" Someone walked over the tile, its floor gets slightly darker """
+		if self.wear[x, y] < 255:
+			self.wear[x, y] += 1
+			self.version += 1
+	
+	def light_graphics(self) -> np.ndarray:
+		""" Graphics of the tiles in FOV, with the jitter and the wear applied to the background colors. The jitter
+		is only applied to walls and floors, tiles replaced later on (doors, iron bars, ...) keep their colors """
+		light = self.tiles["light"].copy(order="F")
+		kind = self.tiles["kind"]
+		jittered = (kind == tile_types.TileKind.WALL) | (kind == tile_types.TileKind.FLOOR)
+		jitter = np.where(jittered[..., np.newaxis], self.jitter, 0).astype(np.int16)
+		background = np.clip(light["bg"] + jitter, 0, 255)
+		light["bg"] = background * WEAR_FACTORS[self.wear][..., np.newaxis]
+		return light
+	
 	def render(self, console: Console) -> None:
 		""" Renders the map.
 		
 		If a tile is in the visible array, then draw it with the light colors. If it
-		is explored, draw it dark, otherwise the default is shroud
+		is explored, draw it dark, otherwise the default is shroud. The tile graphics are only
+		selected again when the map changed since the last render (see changed)
 		
 		"""
-		console.tiles_rgb[0 : self.width, 0 : self.height] = np.select(
-			condlist = [self.visible, self.explored],
-			choicelist = [self.tiles["light"], self.tiles["dark"]],
-			default = tile_types.SHROUD,
-		)
+		if self.version != self._composite_version:
+			self._composite = np.select(
+				condlist = [self.visible, self.explored],
+				choicelist = [self.light_graphics(), self.tiles["dark"]],
+				default = tile_types.SHROUD,
+			)
+			self._composite_version = self.version
+		console.tiles_rgb[0 : self.width, 0 : self.height] = self._composite
 		
-		""" Decide what will be rendered on top of what """
-		entities_sorted_for_rendering = sorted(
-			self.entities, key=lambda x: x.render_order.value
+		""" Render entities inside the players FOV, bucket after bucket so that e.g. actors are drawn on top of
+		items. Each bucket is written into the console at once """
+		tiles = console.tiles_rgb
+		for render_order in RenderOrder:
+			bucket = self.render_buckets[render_order]
+			if not bucket:
+				continue
+			
+			glyphs = np.array([(entity.x, entity.y, ord(entity.char), *entity.color) for entity in bucket], dtype=np.intc)
+			glyphs = glyphs[self.visible[glyphs[:, 0], glyphs[:, 1]]]
+			tiles["ch"][glyphs[:, 0], glyphs[:, 1]] = glyphs[:, 2]
+			tiles["fg"][glyphs[:, 0], glyphs[:, 1]] = glyphs[:, 3:6]
+
+
+""" Writes floors to disk in the background, one after the other """
+floor_writer = ThreadPoolExecutor(max_workers=1)
+
+
+class FloorPickler(pickle.Pickler):
+	""" Pickles a floor without the engine and the player, they are linked again when the floor is loaded. Item
+	identities are linked to the ones of the engines identification registry """
+	def __init__(self, file: io.BytesIO, engine: Engine):
+		super().__init__(file)
+		self.engine = engine
+	
+	def persistent_id(self, obj: object) -> Optional[Union[str, Tuple[str, str, str]]]:
+		if obj is self.engine:
+			return "engine"
+		if obj is self.engine.player:
+			return "player"
+		if type(obj) is Identity:
+			""" The encrypted name is kept, so the kind can be registered again in case the registry lost it """
+			return ("identity", obj.key, obj.encrypted_name)
+		return None
+
+
+class FloorUnpickler(pickle.Unpickler):
+	""" Loads floors pickled by FloorPickler as well as older floors containing their own engine """
+	def __init__(self, file: io.BytesIO, engine: Engine):
+		super().__init__(file)
+		self.engine = engine
+	
+	def persistent_load(self, pid: str) -> object:
+		if pid == "engine":
+			return self.engine
+		if pid == "player":
+			return self.engine.player
+		if isinstance(pid, tuple) and pid[0] == "identity":
+			return self.load_identity(*pid[1:])
+		raise pickle.UnpicklingError(f"Unknown persistent id {pid}")
+	
+	def load_identity(self, key: str, encrypted_name: Optional[str] = None) -> Identity:
+		""" The identity of the engines registry, kinds it doesn't know yet are registered with the floors name """
+		identities = self.engine.identification.identities
+		if key not in identities:
+			if encrypted_name is None:
+				raise pickle.UnpicklingError(f"Floor refers to the unknown item kind {key!r}, it belongs to another game")
+			identities[key] = Identity(key, encrypted_name)
+		return identities[key]
+
+
+def write_floor(filename: str, data: bytes) -> None:
+	""" Compress and write a pickled floor, called by the floor_writer """
+	save_level = lzma.compress(data)
+	with open(filename, "wb") as f:
+		f.write(save_level)
+
+def delete_floor_files(keep: Optional[str]) -> None:
+	""" Delete the .lev files in the working directory, except the ones named with the floor prefix keep """
+	for filename in glob.glob("*.lev"):
+		name = filename[:-len(".lev")]
+		if keep is not None and name.startswith(keep) and name[len(keep):].isdigit():
+			continue
+		try:
+			os.remove(filename)
+		except OSError:
+			print(f"Error while deleting file : {filename}")
+
+def remove_floor_files(keep: Optional[str] = None) -> None:
+	""" Delete the floors of other games (all floors if keep is None), so they are never taken for floors of the
+	actual game. Runs after the floors still being written, so none of them comes back afterwards """
+	floor_writer.submit(delete_floor_files, keep).result()
+
+
+""" Generates the next floor in the background, created on first use """
+floor_generator: Optional[ProcessPoolExecutor] = None
+
+
+def init_floor_generator() -> None:
+	""" Import the game modules the way the game does, before the first task is unpickled. Otherwise the items of
+	the registry would import components.consumable first, which can't be imported before entity_factories. Workers
+	of a game started with a main script import them anyway, others (e.g. python -c) don't """
+	import entity_factories
+
+def get_floor_generator() -> ProcessPoolExecutor:
+	""" Worker processes are spawned, not forked, so they never share the games window """
+	global floor_generator
+	if floor_generator is None:
+		floor_generator = ProcessPoolExecutor(
+			max_workers=1, mp_context=multiprocessing.get_context("spawn"), initializer=init_floor_generator,
 		)
-		
-		""" Render entities """
-		for entity in entities_sorted_for_rendering:
-			""" only render entities inside the players FOV """
-			if self.visible[entity.x, entity.y]:
-				console.print(x=entity.x, y=entity.y, string=entity.char, fg=entity.color)
+	return floor_generator
+
+def build_floor(
+	world_settings: Dict[str, int], floor_number: int, seed: int, identification: FloorIdentification,
+) -> Tuple[bytes, FloorIdentification]:
+	""" Generate a floor with its own engine and a stand-in player, so that it can run in a worker process and
+	gives the same floor for the same seed wherever it runs. identification is a copy of the games registry, it is
+	returned together with the pickled floor, including the item kinds spawned on the floor """
+	from engine import Engine
+	import entity_factories
+	
+	random.seed(seed)
+	
+	engine = Engine(player=entity_factories.player.clone())
+	engine.identification = identification
+	engine.game_world = GameWorld(engine=engine, current_floor=floor_number - 1, **world_settings)
+	engine.game_world.generate_random_floor()
+	
+	data = io.BytesIO()
+	FloorPickler(data, engine).dump(engine.new_map)
+	return data.getvalue(), identification
 
 
 class GameWorld:
-	""" Holds the settings for the GameMap, and generates new maps when using stairs. """
+	""" Holds the settings for the GameMap, and generates new maps when using stairs. Recently visited floors
+	are kept in memory, others are written to .lev files in the background """
 	
 	def __init__(
 		self,
@@ -124,6 +448,7 @@ class GameWorld:
 		room_min_size: int,
 		room_max_size: int,
 		current_floor: int = 0,
+		seed: Optional[int] = None,
 	):
 		self.engine = engine
 	
@@ -136,6 +461,105 @@ class GameWorld:
 		self.room_max_size = room_max_size
 		
 		self.current_floor = current_floor
+		
+		""" Each floor is generated with its own seed derived from this one """
+		self.seed = seed if seed is not None else random.getrandbits(32)
+		
+		""" Floor files are named after the game, so floors of other games are never loaded """
+		self.floor_prefix = f"{self.seed:08x}_"
+		
+		""" The next floor generated in the background: floor number and result """
+		self._next_floor: Optional[Tuple[int, Future]] = None
+		
+		""" Floors not in use, the most recent last. Pending holds floors being written to disk """
+		self._floors: OrderedDict[int, GameMap] = OrderedDict()
+		self._pending: Dict[int, Tuple[bytes, Future]] = {}
+	
+	def __getstate__(self) -> dict:
+		""" Cached floors are saved together with the game, all others are referred to by their files. So the game is
+		only saved when no floor is being written (see floors_pending) """
+		state = self.__dict__.copy()
+		state["_pending"] = {}
+		state["_next_floor"] = None
+		return state
+	
+	def __setstate__(self, state: dict) -> None:
+		""" Saves without floor cache are supported, their floors are all on disk """
+		self.__dict__.update(state)
+		if "_floors" not in state:
+			self._floors = OrderedDict()
+		if "seed" not in state:
+			self.seed = random.getrandbits(32)
+		if "floor_prefix" not in state:
+			""" Older saves wrote their floors without prefix """
+			self.floor_prefix = ""
+		self._pending = {}
+		self._next_floor = None
+		
+		""" Older saves contain the floors that were still being written when the game was saved, write them again """
+		for floor_number, data in self.__dict__.pop("_unwritten", {}).items():
+			self.write_floor(floor_number, data)
+	
+	def floor_file(self, floor_number: int) -> str:
+		return f"{self.floor_prefix}{floor_number}.lev"
+	
+	def floor_exists(self, floor_number: int) -> bool:
+		""" Returns True if the floor was visited before """
+		return (
+			floor_number in self._floors
+			or floor_number in self._pending
+			or os.path.exists(self.floor_file(floor_number))
+		)
+	
+	def store_floor(self, floor_number: int, game_map: GameMap) -> None:
+		""" Keep a floor in memory, the least recently used floor is written to disk in case there are too many """
+		self._floors[floor_number] = game_map
+		self._floors.move_to_end(floor_number)
+		
+		while len(self._floors) > settings.floor_cache_size:
+			evicted_number, evicted_map = self._floors.popitem(last=False)
+			
+			""" Pickle now, while nothing can change the floor; compressing and writing is done in the background """
+			data = io.BytesIO()
+			FloorPickler(data, self.engine).dump(evicted_map)
+			self.write_floor(evicted_number, data.getvalue())
+	
+	def write_floor(self, floor_number: int, data: bytes) -> None:
+		""" Write a pickled floor in the background, it is kept as pending until it is on disk """
+		future = floor_writer.submit(write_floor, self.floor_file(floor_number), data)
+		self._pending[floor_number] = (data, future)
+		future.add_done_callback(lambda future: self._write_done(floor_number, future))
+	
+	def _write_done(self, floor_number: int, future: Future) -> None:
+		""" Forget floors written to disk, unless they were written again in the meantime """
+		pending = self._pending.get(floor_number)
+		if pending and pending[1] is future:
+			del self._pending[floor_number]
+	
+	def fetch_floor(self, floor_number: int) -> GameMap:
+		""" Returns a visited floor from memory, from a pending write or from disk """
+		if floor_number in self._floors:
+			return self._floors.pop(floor_number)
+		
+		""" A pending floor might be finished at any time, so get it only once """
+		pending = self._pending.get(floor_number)
+		if pending:
+			data = pending[0]
+		else:
+			with open(self.floor_file(floor_number), "rb") as f:
+				data = lzma.decompress(f.read())
+		
+		return FloorUnpickler(io.BytesIO(data), self.engine).load()
+	
+	@property
+	def floors_pending(self) -> bool:
+		""" Returns True while floors are being written to disk """
+		return bool(self._pending)
+	
+	def flush_floors(self) -> None:
+		""" Wait until all floors are written to disk """
+		for data, future in list(self._pending.values()):
+			future.result()
 
 
 	def generate_floor_drunkjard(self) -> None:
@@ -184,8 +608,82 @@ class GameWorld:
 		else:
 			pass
 
+	@property
+	def world_settings(self) -> Dict[str, int]:
+		""" Settings needed to generate floors like this world does """
+		return {
+			"map_width": self.map_width,
+			"map_height": self.map_height,
+			"max_rooms": self.max_rooms,
+			"room_min_size": self.room_min_size,
+			"room_max_size": self.room_max_size,
+		}
+	
+	def pregenerate_floor(self, floor_number: int) -> None:
+		""" Start generating a floor in a worker process, while the player explores the actual one """
+		if not settings.pregenerate_floors:
+			return
+		
+		global floor_generator
+		""" The registry is pickled for the worker later on, so it gets a copy which doesn't change meanwhile """
+		identification = FloorIdentification(self.engine.identification)
+		try:
+			future = get_floor_generator().submit(
+				build_floor, self.world_settings, floor_number, self.seed + floor_number, identification
+			)
+		except BrokenProcessPool:
+			""" The worker died, a new one is started next time. This floor will be generated when needed """
+			floor_generator = None
+			return
+		self._next_floor = (floor_number, future)
+	
+	def take_pregenerated_floor(self, floor_number: int) -> Optional[Tuple[bytes, FloorIdentification]]:
+		""" Returns the pregenerated floor if it is finished. It is not used in case item kinds it used changed since
+		it was started, the floor would differ from the one generated now. Floors not taken are never cancelled, the
+		worker finishes them and the result is dropped """
+		next_floor, self._next_floor = self._next_floor, None
+		if next_floor is None:
+			return None
+		
+		number, future = next_floor
+		if number != floor_number or not future.done() or future.exception() is not None:
+			return None
+		
+		data, identification = future.result()
+		if not identification.matches(self.engine.identification):
+			return None
+		return data, identification
+	
 	def generate_floor(self) -> None:
-		""" Called whenever a new floor is necessary, chooses wether drunkjard or rectangular floor will be created """
+		""" Called whenever a new floor is necessary. Takes the floor generated in the background if it is ready,
+		otherwise generates the same floor right now. The player is placed at the upstairs """
+		self.current_floor += 1
+		
+		floor = self.take_pregenerated_floor(self.current_floor)
+		if floor is None:
+			""" Generate the floor without changing the games random numbers """
+			state = random.getstate()
+			floor = build_floor(
+				self.world_settings, self.current_floor, self.seed + self.current_floor,
+				FloorIdentification(self.engine.identification),
+			)
+			random.setstate(state)
+		
+		""" Take over the item kinds registered while generating, then link the floor with the engine """
+		data, identification = floor
+		self.engine.identification.update(identification)
+		self.engine.new_map = FloorUnpickler(io.BytesIO(data), self.engine).load()
+		
+		self.engine.player.place(*self.engine.new_map.upstairs_location, self.engine.new_map)
+		
+		if self.current_floor == 1:
+			self.engine.game_map = self.engine.new_map
+		
+		""" The player will most likely go deeper """
+		self.pregenerate_floor(self.current_floor + 1)
+	
+	def generate_random_floor(self) -> None:
+		""" Chooses wether drunkjard or rectangular floor will be created """
 		
 		x = randint(1,4)	# 25% chance to generate drunkjard floor
 		
@@ -200,19 +698,14 @@ class GameWorld:
 		""" loads the previous floor when going upstairs """
 		
 		self.current_floor -= 1
-		filename = str(self.current_floor) + ".lev"
 		
 		""" Open floor and place player """
-		with open(filename, "rb") as f:
-			self.engine.new_map = pickle.loads(lzma.decompress(f.read()))
+		self.engine.new_map = self.fetch_floor(self.current_floor)
 		
 		self.engine.player.place(self.engine.new_map.downstairs_location[0], self.engine.new_map.downstairs_location[1], self.engine.new_map)
 
-		""" Save the actual dungeon level """
-		filename = str(self.engine.game_world.current_floor + 1) + ".lev"
-		save_level = lzma.compress(pickle.dumps(self.engine.game_map))
-		with open(filename, "wb") as f:
-			f.write(save_level)
+		""" Store the actual dungeon level """
+		self.store_floor(self.current_floor + 1, self.engine.game_map)
 
 		""" Switch the game_map & game engine to the new floor """
 		self.engine.game_map = self.engine.new_map
@@ -224,18 +717,12 @@ class GameWorld:
 	def load_next_floor(self) -> None:
 		""" loads the next floor when going downstarts. UPDATE: Make one function for both """
 		self.current_floor += 1
-		filename = str(self.current_floor) + ".lev"
-		with open(filename, "rb") as f:
-			self.engine.new_map = pickle.loads(lzma.decompress(f.read()))
+		self.engine.new_map = self.fetch_floor(self.current_floor)
 		
 		self.engine.player.place(self.engine.new_map.upstairs_location[0], self.engine.new_map.upstairs_location[1], self.engine.new_map)
 
-		""" Save the previous dungeon level """
-		filename = str(self.engine.game_world.current_floor - 1) + ".lev"
-		save_level = lzma.compress(pickle.dumps(self.engine.game_map))
-		with open(filename, "wb") as f:
-			f.write(save_level)
-
+		""" Store the previous dungeon level """
+		self.store_floor(self.current_floor - 1, self.engine.game_map)
 
 		self.engine.game_map = self.engine.new_map
 		self.engine.game_map.engine = self.engine
@@ -250,10 +737,8 @@ class GameWorld:
 		self.current_floor = floor_number
 		
 		""" Load floor if exists, otherwise create new floor """
-		if os.path.isfile(str(floor_number) + ".lev"):
-			filename = str(floor_number) + ".lev"
-			with open(filename, "rb") as f:
-				self.engine.new_map = pickle.loads(lzma.decompress(f.read()))
+		if self.floor_exists(floor_number):
+			self.engine.new_map = self.fetch_floor(floor_number)
 		else:
 			self.engine.new_map = self.engine.game_world.generate_new_floor()
 		
@@ -268,11 +753,8 @@ class GameWorld:
 		self.engine.player.place(place_x, place_y, self.engine.new_map)
 		assert self.engine.player not in self.engine.game_map.entities	# Checks wether player is deleted from old map
 
-		""" Save the actual dungeon floor """
-		filename = str(self.engine.game_world.current_floor - 1) + ".lev"
-		save_level = lzma.compress(pickle.dumps(self.engine.game_map))
-		with open(filename, "wb") as f:
-			f.write(save_level)
+		""" Store the actual dungeon floor """
+		self.store_floor(self.current_floor - 1, self.engine.game_map)
 		
 		""" Set up new floor as actual floor """
 		self.engine.game_map = self.engine.new_map
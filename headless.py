@@ -0,0 +1,110 @@
+""" Run games without a window or tileset, used for soak tests and measuring turns per second.
+use python3.11 headless.py --turns 1000 to start """
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from typing import Callable, Iterable, Optional, Tuple
+
+import actions
+import game_map
+import input_handlers
+import setup_game
+
+from engine import Engine
+
+
+""" A bot returns the next action for the player, None ends the game """
+Bot = Callable[[Engine], Optional[actions.Action]]
+
+DIRECTIONS = (
+	(-1, -1),	# Northwest
+	(0, -1),	# North
+	(1, -1),	# Northeast
+	(-1, 0),	# West
+	(1, 0),		# East
+	(-1, 1),	# Southwest
+	(0, 1),		# South
+	(1, 1),		# Southeast
+)
+
+
+def random_bot(engine: Engine) -> actions.Action:
+	""" Walk around randomly, attack whatever is in the way and take the stairs down when standing on them """
+	player = engine.player
+	if (player.x, player.y) == engine.game_map.downstairs_location:
+		return actions.TakeStairsAction(player)
+
+	dx, dy = random.choice(DIRECTIONS)
+	return actions.BumpAction(player, dx, dy)
+
+def scripted_bot(script: Iterable[Callable[[Engine], actions.Action]]) -> Bot:
+	""" Turn a list of functions creating actions (e.g. lambda engine: WaitAction(engine.player)) into a bot,
+	the game ends with the script """
+	steps = iter(script)
+
+	def bot(engine: Engine) -> Optional[actions.Action]:
+		step = next(steps, None)
+		return step(engine) if step else None
+
+	return bot
+
+def run(engine: Engine, bot: Bot = random_bot, turns: int = 1000) -> Tuple[int, int]:
+	""" Feed the actions of the bot to the engine the same way the main game does, until the number of turns
+	passed, the player died or the bot stopped. Returns the number of actions and the number of turns passed """
+	handler = input_handlers.MainGameEventHandler(engine)
+	performed = 0
+	passed = 0
+
+	while passed < turns and engine.player.is_alive:
+		action = bot(engine)
+		if action is None:
+			break
+
+		performed += 1
+		if handler.handle_action(action):
+			passed += 1
+
+	return performed, passed
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Run ThunderpigsRL without a window")
+	parser.add_argument("--games", type=int, default=1, help="number of games to play")
+	parser.add_argument("--turns", type=int, default=1000, help="maximum number of turns per game")
+	parser.add_argument("--seed", type=int, default=None, help="seed of the first game, following games count up")
+	args = parser.parse_args()
+
+	""" Floors are saved as .lev files in the working directory, keep them away from the real game """
+	with tempfile.TemporaryDirectory() as directory:
+		os.chdir(directory)
+
+		for game in range(args.games):
+			if args.seed is not None:
+				random.seed(args.seed + game)
+			for level_file in os.listdir(directory):
+				os.remove(level_file)
+
+			start = time.perf_counter()
+			engine = setup_game.new_game()
+			performed, passed = run(engine, turns=args.turns)
+			duration = time.perf_counter() - start
+
+			print(
+				f"Game {game + 1}: {passed} turns ({performed} actions) in {duration:.2f}s, "
+				f"{passed / duration:.0f} turns/s, floor {engine.game_world.current_floor}, "
+				f"{'alive' if engine.player.is_alive else 'dead'}"
+			)
+		
+		""" The worker generating floors is started in the temporary directory, stop it before it is removed """
+		if game_map.floor_generator:
+			game_map.floor_generator.shutdown()
+
+
+if __name__ == "__main__":
+	main()
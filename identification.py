@@ -0,0 +1,92 @@
+""" Registry of the item kinds spawned in the game. Kinds which have to be identified (scrolls) show an encrypted
+name until the first item of the kind is used. The registry is saved with the engine """
+
+from __future__ import annotations
+
+import copy
+import random
+
+from typing import Dict, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from entity import Item
+
+
+class Identity:
+	""" Shared by all items of a kind, Item.name shows the encrypted name as long as the kind isn't known """
+	def __init__(self, key: str, encrypted_name: str):
+		self.key = key
+		self.encrypted_name = encrypted_name
+		self.known = False
+
+
+class Identification:
+	""" Item kinds are keyed by the real name of the item """
+	def __init__(self) -> None:
+		self.identities: Dict[str, Identity] = {}
+		self.samples: Dict[str, Item] = {}		# Kind -> a copy of the first item spawned, used to fill chests
+		self.counts: Dict[str, int] = {}		# Kind -> number of items spawned
+
+	def identity(self, item: Item) -> Identity:
+		""" The identity of the items kind, a new kind gets a new encrypted name """
+		key = item.real_name
+		if key not in self.identities:
+			self.identities[key] = Identity(key, item.encrypted_name())
+		return self.identities[key]
+
+	def identify(self, item: Item) -> None:
+		""" The kind of the item is known from now on """
+		if item.identity is not None:
+			item.identity.known = True
+
+	def spawned(self, item: Item) -> None:
+		""" Count a spawned item, the first one of each kind is kept as sample """
+		key = item.real_name
+		if key not in self.samples:
+			self.samples[key] = item.clone()
+		self.counts[key] = self.counts.get(key, 0) + 1
+
+	def random_item(self) -> Optional[Item]:
+		""" A copy of a spawned item, kinds spawned more often are chosen more often. None if nothing was spawned """
+		if not self.counts:
+			return None
+		key = random.choices(list(self.counts), weights=list(self.counts.values()))[0]
+		return self.samples[key].clone()
+
+	def update(self, other: FloorIdentification) -> None:
+		""" Take over the kinds registered and the items spawned by a floor, see GameWorld.generate_floor. Identities
+		already known here stay, so items keep sharing them """
+		for key, identity in other.identities.items():
+			self.identities.setdefault(key, identity)
+		for key, sample in other.samples.items():
+			self.samples.setdefault(key, sample)
+		for key, count in other.counts.items():
+			self.counts[key] = self.counts.get(key, 0) + count - other.counts_before.get(key, 0)
+
+
+class FloorIdentification(Identification):
+	""" Copy of the games registry a floor is generated with. It remembers which parts of the registry the floor
+	depended on, so a floor generated in the background can be checked against the registry of the game later on """
+	def __init__(self, identification: Identification):
+		self.__dict__.update(copy.deepcopy(identification.__dict__))
+		self.names_before = {key: identity.encrypted_name for key, identity in self.identities.items()}
+		self.counts_before = dict(self.counts)
+		self.used: Set[str] = set()		# Kinds whose identity the floor asked for
+		self.counts_used = False		# The floor chose items by the spawn counts
+
+	def identity(self, item: Item) -> Identity:
+		self.used.add(item.real_name)
+		return super().identity(item)
+
+	def random_item(self) -> Optional[Item]:
+		self.counts_used = True
+		return super().random_item()
+
+	def matches(self, identification: Identification) -> bool:
+		""" True if the floor would be the same when generated from identification. Only the kinds the floor used
+		are compared, kinds registered meanwhile don't matter otherwise """
+		for key in self.used:
+			identity = identification.identities.get(key)
+			if self.names_before.get(key) != (identity.encrypted_name if identity else None):
+				return False
+		return not self.counts_used or self.counts_before == identification.counts
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import os
-import glob
+import itertools
 import lzma
 import pickle
 
@@ -32,6 +32,8 @@ from actions import (
 import settings
 import color
 import exceptions
+import game_map
+import savegame
 
 
 if TYPE_CHECKING:
@@ -169,6 +171,7 @@ class EventHandler(BaseEventHandler):
 		""" Perform enemy turns and update fov in case a vaild action was performed """
 		self.engine.handle_enemy_turns()
 		self.engine.update_fov()
+		self.engine.autosave()
 		return True
 		
 
@@ -264,8 +267,8 @@ class CharacterScreenEventHandler(AskUserEventHandler):
 			console.print( x=x + 1, y = y + 21, string=settings.str_size.ljust(24) + f" : {self.engine.player.dimensions.size}")
 
 		if self.engine.player.skills:
-			skills = f"{self.engine.player.skills.skills[0]}\n"
-			for skill in self.engine.player.skills.skills[1:]:
+			skills = ""
+			for skill in sorted(self.engine.player.skills.skills):
 				skills += f"{skill}\n"
 			console.print( x=x + 1, y = y + 23, string=settings.str_skills + f":\n{skills}")
 		
@@ -819,14 +822,9 @@ class MainGameEventHandler(EventHandler):
 			return TakeStairsAction(player)
 
 		elif key == tcod.event.K_ESCAPE:
-			""" Exit game and delete temp levels """
-			level_files = glob.glob("*.lev")
+			""" Exit game and delete temp levels, levels still being written are deleted as well """
 			print("Deleting temporary levels.")
-			for filePath in level_files:
-				try:
-					os.remove(filePath)	# Deletes the active save file
-				except:
-					print(f"Error while deleting file : {filePath}")
+			game_map.remove_floor_files()
 			raise SystemExit()
 
 		elif key in MOVE_KEYS:
@@ -878,13 +876,13 @@ class MainGameEventHandler(EventHandler):
 			tmp3 = (self.engine.player.x, self.engine.player.y-1)
 			tmp4 = (self.engine.player.x, self.engine.player.y+1)
 			found = 0
-			if self.engine.game_map.tiles["kind"][tmp1] == b"Shop":
+			if self.engine.game_map.tiles["kind"][tmp1] == tile_types.TileKind.SHOP:
 				found =1
-			if self.engine.game_map.tiles["kind"][tmp2] == b"Shop":
+			if self.engine.game_map.tiles["kind"][tmp2] == tile_types.TileKind.SHOP:
 				found =1
-			if self.engine.game_map.tiles["kind"][tmp3] == b"Shop":
+			if self.engine.game_map.tiles["kind"][tmp3] == tile_types.TileKind.SHOP:
 				found =1
-			if self.engine.game_map.tiles["kind"][tmp4] == b"Shop":
+			if self.engine.game_map.tiles["kind"][tmp4] == tile_types.TileKind.SHOP:
 				found =1
 			
 			""" If shop found activate ShopEventHandler """
@@ -1061,7 +1059,8 @@ class SetupClassEventHandler(AskUserEventHandler):
 class GameOverEventHandler(EventHandler):
 	""" Handles the exit of the game """
 	def on_quit(self) -> None:
-		""" Handle exiting out of a finished game. """
+		""" Handle exiting out of a finished game. Autosaves still being written would bring the save file back """
+		savegame.flush_saves()
 		if os.path.exists(settings.save_file):
 			print("Savefile deleted.")
 			os.remove(settings.save_file)	# Deletes the active save file
@@ -1108,7 +1107,7 @@ class HistoryViewer(EventHandler):
 			1,
 			log_console.width -2,
 			log_console.height -2,
-			self.engine.message_log.messages[: self.cursor + 1],
+			list(itertools.islice(self.engine.message_log.messages, self.cursor + 1)),
 		)
 		log_console.blit(console, 3, 3)
 		
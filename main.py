@@ -56,17 +56,32 @@ def main() -> None:
 	) as context:
 		root_console = tcod.Console(screen_width, screen_height, order="F")
 
+		""" Frames are only rendered when an event could have changed the screen """
+		dirty = True
+		mouse_tile = None
+
 		try:
 			while True:
-				root_console.clear()
-				handler.on_render(console=root_console)
-				context.present(root_console)
+				if dirty:
+					root_console.clear()
+					handler.on_render(console=root_console)
+					context.present(root_console)
+					dirty = False
 			
 				try:
 					for event in tcod.event.wait():
 						context.convert_event(event)
+						
+						""" Moving the mouse within a tile changes nothing """
+						if isinstance(event, tcod.event.MouseMotion):
+							if tuple(event.tile) == mouse_tile:
+								continue
+							mouse_tile = tuple(event.tile)
+						
+						dirty = True
 						handler = handler.handle_events(event)
 				except Exception:	# Handle exceptions in game.
+					dirty = True
 					traceback.print_exc()	# Print error to stderr.
 					# Then print the error to the message log.
 					if isinstance(handler, input_handlers.EventHandler):
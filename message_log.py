@@ -1,8 +1,10 @@
-from typing import Iterable, List, Reversible, Tuple
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Reversible, Tuple
 import textwrap
 
 import tcod
 import color
+import settings
 
 
 class Message:
@@ -11,6 +13,28 @@ class Message:
 		self.plain_text = text
 		self.fg = fg
 		self.count = 1
+		self._wrapped: Dict[int, List[str]] = {}	# Width -> wrapped lines of the full text
+	
+	def __getstate__(self) -> dict:
+		""" Wrapped lines are not saved """
+		state = self.__dict__.copy()
+		state["_wrapped"] = {}
+		return state
+	
+	def __setstate__(self, state: dict) -> None:
+		self.__dict__.update(state)
+		self._wrapped = {}
+	
+	def stack(self) -> None:
+		""" Count the message once more, the full text changes so the wrapped lines are outdated """
+		self.count += 1
+		self._wrapped = {}
+	
+	def wrapped(self, width: int) -> List[str]:
+		""" The full text wrapped to the given width, only wrapped once for each width """
+		if width not in self._wrapped:
+			self._wrapped[width] = list(MessageLog.wrap(self.full_text, width))
+		return self._wrapped[width]
 		
 	@property
 	def full_text(self) -> str:
@@ -21,18 +45,41 @@ class Message:
 		
 		
 class MessageLog:
+	""" Keeps the last settings.message_log_size messages, older messages are appended to
+	settings.message_archive_file in case it is set """
 	def __init__(self) -> None:
-		self.messages: List[Message] = []
+		self.messages: Deque[Message] = deque(maxlen=settings.message_log_size)
+		self.added = 0		# Number of messages added or stacked up to now, changes with every new message
+	
+	def __getstate__(self) -> dict:
+		state = self.__dict__.copy()
+		state["messages"] = list(self.messages)
+		return state
+	
+	def __setstate__(self, state: dict) -> None:
+		""" Saves of older versions kept all messages, only the last ones are loaded """
+		self.__dict__.update(state)
+		self.messages = deque(self.messages, maxlen=settings.message_log_size)
+		self.added = state.get("added", len(self.messages))
 		
 	def add_message(self, text: str, fg: Tuple[int, int, int] = color.white, *, stack: bool = True,) -> None:
 		""" Add a message to this log. Text is the message text, fg the txt color.
 		if stack is true then the message can stack with a previous message of the same text.
 		"""
 		
+		self.added += 1
 		if stack and self.messages and text == self.messages[-1].plain_text:
-			self.messages[-1].count += 1
+			self.messages[-1].stack()
 		else:
+			if len(self.messages) == self.messages.maxlen:
+				self.archive(self.messages[0])
 			self.messages.append(Message(text, fg))
+	
+	def archive(self, message: Message) -> None:
+		""" Append a message dropped from the log to the archive file """
+		if settings.message_archive_file:
+			with open(settings.message_archive_file, "a", encoding="utf-8") as f:
+				f.write(message.full_text + "\n")
 			
 	def render(self, console: tcod.Console, x: int, y: int, width: int, height: int,) -> None:
 		""" Render the log over the given area
@@ -65,7 +112,7 @@ class MessageLog:
 		y_offset = height - 1
 		
 		for message in reversed(messages):
-			for line in reversed(list(cls.wrap(message.full_text, width))):
+			for line in reversed(message.wrapped(width)):
 				console.print(x=x, y=y + y_offset, string=line, fg=message.fg)
 				y_offset -= 1
 				if y_offset < 0:
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import random
 import tcod
-import copy
+
+import numpy as np	# type: ignore
 
 from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
 
@@ -88,11 +89,11 @@ def get_max_value_for_floor(
 			
 	return current_value
 
-def get_entities_at_random(
-	weighted_chances_by_floor: Dict[int, List[Tuple[Entity, int]]],
-	number_of_entities: int,
-	floor: int,
-) -> List[Entity]:
+def get_weighted_chances(
+	weighted_chances_by_floor: Dict[int, List[Tuple[Entity, int]]], floor: int,
+) -> Dict[Entity, int]:
+	""" The entities which can be spawned on the floor and their weighted chances, later floors of the table
+	override the chances of earlier ones """
 	entity_weighted_chances = {}
 	
 	for key, values in weighted_chances_by_floor.items():
@@ -104,7 +105,16 @@ def get_entities_at_random(
 				weighted_chance = value[1]
 				
 				entity_weighted_chances[entity] = weighted_chance
-				
+	
+	return entity_weighted_chances
+
+def get_entities_at_random(
+	weighted_chances_by_floor: Dict[int, List[Tuple[Entity, int]]],
+	number_of_entities: int,
+	floor: int,
+) -> List[Entity]:
+	entity_weighted_chances = get_weighted_chances(weighted_chances_by_floor, floor)
+	
 	entities = list(entity_weighted_chances.keys())
 	entity_weighted_chance_values = list(entity_weighted_chances.values())
 	
@@ -191,13 +201,13 @@ def place_entities(room: RectangularRoom, dungeon: GameMap, floor_number: int, )
 	""" Place entities, check if tile is floor and not occupied by another entity """			
 	for entity in monsters + items + traps:
 		x, y = 1, 1
-		while (dungeon.tiles[x,y]["kind"]) != b"Floor":
+		while (dungeon.tiles[x,y]["kind"]) != tile_types.TileKind.FLOOR:
 			# Get new xy coord in room until not occupied by wall, should not happen anyway
 			x = random.randint(room.x1 + 1, room.x2 - 1)
 			y = random.randint(room.y1 + 1, room.y2 - 1)
 		
 		""" Place entity if not occupied by another entity """
-		if not any(entity.x == x and entity.y == y for entity in dungeon.entities):
+		if dungeon.get_entity_at_location(x, y) is None:
 			entity.spawn(dungeon, x, y)		
 
 def tunnel_between(start: Tuple[int, int], end: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
@@ -217,9 +227,38 @@ def tunnel_between(start: Tuple[int, int], end: Tuple[int, int]) -> Iterator[Tup
 	for x, y in tcod.los.bresenham((corner_x, corner_y), (x2, y2)).tolist():
 		yield x, y
 
-def bitmasking( dungeon: GameMap, x: int, y: int, kind: str) -> int:
+""" Neighbour offsets (dx, dy, bit) of the 8-bit and the 24-bit bitmask, see the tables below """
+BITMASK_8 = (
+	(-1, -1, 0x1), (0, -1, 0x2), (1, -1, 0x4), (1, 0, 0x8),
+	(1, 1, 0x10), (0, 1, 0x20), (-1, 1, 0x40), (-1, 0, 0x80),
+)
+BITMASK_24 = BITMASK_8 + (
+	(-2, -2, 0x100), (-1, -2, 0x200), (0, -2, 0x400), (1, -2, 0x800),
+	(2, -2, 0x1000), (2, -1, 0x2000), (2, 0, 0x4000), (2, 1, 0x8000),
+	(2, 2, 0x10000), (1, 2, 0x20000), (0, 2, 0x40000), (-1, 2, 0x80000),
+	(-2, 2, 0x100000), (-2, 1, 0x200000), (-2, 0, 0x400000), (-2, -1, 0x800000),
+)
+
+def neighbour_bitmask(is_kind: np.ndarray, offsets: Tuple = BITMASK_8) -> np.ndarray:
+	""" Build the bitmask of every tile at once out of a boolean array by adding up shifted copies of it.
+	Tiles closer to the border than the mask reaches get 0, they were never checked by the tile loops """
+	radius = max(max(abs(dx), abs(dy)) for dx, dy, _ in offsets)
+	width, height = is_kind.shape
+	padded = np.pad(is_kind, radius)
+	result = np.zeros(is_kind.shape, dtype=np.int32)
+
+	for dx, dy, bit in offsets:
+		result[padded[radius + dx:radius + dx + width, radius + dy:radius + dy + height]] |= bit
+
+	result[:radius, :] = 0
+	result[-radius:, :] = 0
+	result[:, :radius] = 0
+	result[:, -radius:] = 0
+	return result
+
+def bitmasking(dungeon: GameMap, kind: tile_types.TileKind) -> np.ndarray:
 	""" 
-	+---+---+---+	8-bit bitmasking of surrounding tiles, used for checking
+	+---+---+---+	8-bit bitmasking of surrounding tiles for the whole map, used for checking
 	| 1 | 2 | 4 |   places were doors can be inserted
 	+---+---+---+
 	|128|   | 8 |
@@ -227,37 +266,11 @@ def bitmasking( dungeon: GameMap, x: int, y: int, kind: str) -> int:
 	| 64| 32| 16|
 	+---+---+---+
 	"""
-	result = 0
-	# NW
-	if (dungeon.tiles[x-1, y-1]["kind"] == bytes(kind, "utf-8")):
-		result += 1
-	# N
-	if (dungeon.tiles[x, y-1]["kind"] == bytes(kind, "utf-8")):
-		result += 2
-	# NE
-	if (dungeon.tiles[x+1, y-1]["kind"] == bytes(kind, "utf-8")):
-		result += 4
-	# E
-	if (dungeon.tiles[x+1, y]["kind"] == bytes(kind, "utf-8")):
-		result += 8
-	# SE
-	if (dungeon.tiles[x+1, y+1]["kind"] == bytes(kind, "utf-8")):
-		result += 16
-	# S
-	if (dungeon.tiles[x, y+1]["kind"] == bytes(kind, "utf-8")):
-		result += 32
-	# SW
-	if (dungeon.tiles[x-1, y+1]["kind"] == bytes(kind, "utf-8")):
-		result += 64
-	# W
-	if (dungeon.tiles[x-1, y]["kind"] == bytes(kind, "utf-8")):
-		result += 128
-	
-	return result
+	return neighbour_bitmask(dungeon.tiles["kind"] == kind, BITMASK_8)
 
-def bitmasking24bit( dungeon: GameMap, x: int, y: int, kind: str) -> int:
+def bitmasking24bit(dungeon: GameMap, kind: tile_types.TileKind) -> np.ndarray:
 	"""
-	Bitmasking of 5x5 area, used for checking open spaces in drunkjard maps to find suitable places for rooms
+	Bitmasking of 5x5 area for the whole map, used for checking open spaces in drunkjard maps to find suitable places for rooms
 	+--------+-------+-------+-------+-------+
 	|   WWNN |  WNN  |  NN   |  ENN  |  EENN |
 	|  0x100 | 0x200 | 0x400 | 0x800 |0x1000 |
@@ -283,208 +296,104 @@ def bitmasking24bit( dungeon: GameMap, x: int, y: int, kind: str) -> int:
 	5x3 3wide:		0000 1110 0000 1110 1111 1111	0x0E0EFF
 	5x3 5wide:		1110 0000 1110 0000 1111 1111	0xE0E0FF
 		"""
-
-	result = 0
-	if (dungeon.tiles[x-1, y-1]["kind"] == bytes(kind, "utf-8")):
-		result += 0x1
-	if (dungeon.tiles[x, y-1]["kind"] == bytes(kind, "utf-8")):
-		result += 0x2
-	if (dungeon.tiles[x+1, y-1]["kind"] == bytes(kind, "utf-8")):
-		result += 0x4
-	if (dungeon.tiles[x+1, y]["kind"] == bytes(kind, "utf-8")):
-		result += 0x8
-	if (dungeon.tiles[x+1, y+1]["kind"] == bytes(kind, "utf-8")):
-		result += 0x10
-	if (dungeon.tiles[x, y+1]["kind"] == bytes(kind, "utf-8")):
-		result += 0x20
-	if (dungeon.tiles[x-1, y+1]["kind"] == bytes(kind, "utf-8")):
-		result += 0x40
-	if (dungeon.tiles[x-1, y]["kind"] == bytes(kind, "utf-8")):
-		result += 0x80
-	if (dungeon.tiles[x-2, y-2]["kind"] == bytes(kind, "utf-8")):
-		result += 0x100
-	if (dungeon.tiles[x-1, y-2]["kind"] == bytes(kind, "utf-8")):
-		result += 0x200
-	if (dungeon.tiles[x, y-2]["kind"] == bytes(kind, "utf-8")):
-		result += 0x400
-	if (dungeon.tiles[x+1, y-2]["kind"] == bytes(kind, "utf-8")):
-		result += 0x800
-	if (dungeon.tiles[x+2, y-2]["kind"] == bytes(kind, "utf-8")):
-		result += 0x1000
-	if (dungeon.tiles[x+2, y-1]["kind"] == bytes(kind, "utf-8")):
-		result += 0x2000
-	if (dungeon.tiles[x+2, y]["kind"] == bytes(kind, "utf-8")):
-		result += 0x4000
-	if (dungeon.tiles[x+2, y+1]["kind"] == bytes(kind, "utf-8")):
-		result += 0x8000
-	if (dungeon.tiles[x+2, y+2]["kind"] == bytes(kind, "utf-8")):
-		result += 0x10000
-	if (dungeon.tiles[x+1, y+2]["kind"] == bytes(kind, "utf-8")):
-		result += 0x20000
-	if (dungeon.tiles[x, y+2]["kind"] == bytes(kind, "utf-8")):
-		result += 0x40000
-	if (dungeon.tiles[x-1, y+2]["kind"] == bytes(kind, "utf-8")):
-		result += 0x80000
-	if (dungeon.tiles[x-2, y+2]["kind"] == bytes(kind, "utf-8")):
-		result += 0x100000
-	if (dungeon.tiles[x-2, y+1]["kind"] == bytes(kind, "utf-8")):
-		result += 0x200000
-	if (dungeon.tiles[x-2, y]["kind"] == bytes(kind, "utf-8")):
-		result += 0x400000
-	if (dungeon.tiles[x-2, y-1]["kind"] == bytes(kind, "utf-8")):
-		result += 0x800000
-
-	return result
-
-def random_tile_in_map(dungeon, map_width, map_height, tile) -> Tuple:
-	""" Randomly tests places on the map if they are of the given kind. If so return it. Starts at random location
-	BUG to fix: Might go into an endless loop in case no tile of that kind is present """
-
-	start_point = (random.randint(0, map_width-1), random.randint(0, map_height-1))
-	while (dungeon.tiles[start_point]["kind"]) != tile:
-		start_point = (random.randint(0, map_width-1), random.randint(0, map_height-1))
-	
-	return start_point
-
-
-def random_turn(heading) -> Tuple:
-	""" Returns either a left or a right turn for the given heading. Used in drunkjards walk.
-		-1,-1  0,-1  1,-1
-		-1,0    x    1,0
-		-1,1   0,1   1,1 
-	"""
-	if heading == (-1, 0):
-		new_heading = random.choice(((-1,-1), (-1,1),))
-	elif heading == (-1, 1):
-		new_heading = random.choice(((-1,0), (0,1),))
-	elif heading == (0, 1):
-		new_heading = random.choice(((-1,1), (1,1),))
-	elif heading == (1, 1):
-		new_heading = random.choice(((0,1), (1,0),))
-	elif heading == (1, 0):
-		new_heading = random.choice(((1,1), (1,-1),))
-	elif heading == (1, -1):
-		new_heading = random.choice(((1,0), (0,-1),))
-	elif heading == (0, -1):
-		new_heading = random.choice(((-1,-1), (1,-1),))
-	elif heading == (-1, -1):
-		new_heading =random.choice(((-1,0), (0,-1),))
-	else:
-		print(f"Heading Error! {type(heading)}")
-	return new_heading
+	return neighbour_bitmask(dungeon.tiles["kind"] == kind, BITMASK_24)
 
 def remove_single_walls(dungeon, map_width, map_height) -> None:
 	""" Remove single walls (pillars) from the map """
-	for i in range(1, map_width-1):
-		for j in range(1, map_height-1):
-			result = 0
-			if (dungeon.tiles[i, j]["kind"]) == b"Wall":
-				result = bitmasking(dungeon, i, j, "Floor")
-				if result == 255:
-					dungeon.tiles[i,j] = tile_types.floor
+	pillars = (dungeon.tiles["kind"] == tile_types.TileKind.WALL) & (bitmasking(dungeon, tile_types.TileKind.FLOOR) == 255)
+	dungeon.tiles[pillars] = tile_types.floor
 	return
 
 
 def randomize_tiles(dungeon, map_width, map_height) -> None:
-	""" Get the walls and the floor a more random look by changing their color slightly """
-	for i in range(1, map_width-1):
-		for j in range(1, map_height-1):
-			if (dungeon.tiles[i, j]["kind"]) == b"Wall":
-				dungeon.tiles[i, j][3][2][0] += random.randint(-5, 5)
-				dungeon.tiles[i, j][3][2][1] += random.randint(-5, 5)
-				dungeon.tiles[i, j][3][2][2] += random.randint(-5, 5)
-			elif (dungeon.tiles[i, j]["kind"]) == b"Floor":
-				dungeon.tiles[i, j][3][2][0] += random.randint(-3, 3)
-				dungeon.tiles[i, j][3][2][1] += random.randint(-3, 3)
-				dungeon.tiles[i, j][3][2][2] += random.randint(-3, 3)
+	""" Get the walls and the floor a more random look by changing their color slightly. The offsets are stored in
+	the jitter layer of the map, they are added to the light background colors when the map is rendered """
+	rng = np.random.default_rng(random.getrandbits(64))
+	
+	kind = dungeon.tiles["kind"][1:-1, 1:-1, np.newaxis]
+	spread = np.select([kind == tile_types.TileKind.WALL, kind == tile_types.TileKind.FLOOR], [5, 3], 0)
+	dungeon.jitter[1:-1, 1:-1] = rng.integers(-spread, spread, size=(map_width - 2, map_height - 2, 3), endpoint=True)
 	return
 
 def place_ironbars(dungeon, map_width, map_height) -> None:
 	""" Place Ironbars with a 1/10 chance in 1 tile wide walls """
-	iron_bars = copy.deepcopy(entity_factories.iron_bars)
+	iron_bars = entity_factories.iron_bars
+	
+	is_wall = dungeon.tiles["kind"] == tile_types.TileKind.WALL
+	result = neighbour_bitmask(is_wall)
 	
-	for i in range(1, map_width-1):
-		for j in range(1, map_height-1):
-			result = 0
-			if (dungeon.tiles[i, j]["kind"]) == b"Wall":
-				result = bitmasking(dungeon, i, j, "Wall")
-			# Possilbe place found, place with 1/10 chance:
-			if result == 34 or result == 136:
-				x = random.randint(0, 10)
-				if x == 5:
-					# Place Iron Bars (Furniture) together with its base
-					dungeon.tiles[i,j] = tile_types.window_base
-					iron_bars.spawn(dungeon, i,j)
+	for i, j in np.argwhere(is_wall & ((result == 34) | (result == 136))).tolist():
+		""" Placed bars are no walls anymore, recheck the candidate in case a neighbour was already replaced """
+		if neighbour_bitmask(is_wall[i-1:i+2, j-1:j+2])[1, 1] not in (34, 136):
+			continue
+		# Possilbe place found, place with 1/10 chance:
+		x = random.randint(0, 10)
+		if x == 5:
+			# Place Iron Bars (Furniture) together with its base
+			dungeon.tiles[i,j] = tile_types.window_base
+			is_wall[i, j] = False
+			iron_bars.spawn(dungeon, i,j)
 	return
 
 
 def place_doors(dungeon, map_width, map_height) -> None:
 	""" Place Doors between rooms and tunnels"""
-	door = copy.deepcopy(entity_factories.door)
-
-	for i in range(1, map_width-1):
-		for j in range(1, map_height-1):
-			result = 0
-			if (dungeon.tiles[i, j]["kind"]) == b"Floor":
-				result = bitmasking(dungeon, i, j, "Wall")
-			# Place doors on suitable locations
-			if result == 99 or result == 54 or result == 141 or result == 216:
-				door.parent = dungeon
-				door.usable.initialize(dungeon, i, j)
-				door.spawn(dungeon, i,j)
+	door = entity_factories.door.clone()
+
+	result = bitmasking(dungeon, tile_types.TileKind.WALL)
+	suitable = (dungeon.tiles["kind"] == tile_types.TileKind.FLOOR) & np.isin(result, (99, 54, 141, 216))
+
+	# Place doors on suitable locations
+	for i, j in np.argwhere(suitable).tolist():
+		door.parent = dungeon
+		door.usable.initialize(dungeon, i, j)
+		door.spawn(dungeon, i,j)
 	return
 
 def remove_doors_at_intersection(dungeon, map_width, map_height) -> None:
 	""" Remove doors at Intersections to avoid up to 4 doors by intersecting tunnels """
-	for i in range(1, map_width-1):
-		for j in range(1, map_height-1):
-			result = 0
-			if (dungeon.tiles[i, j]["kind"]) == b"Floor":
-				result = bitmasking(dungeon, i, j, "Door")
-				
-			if result == 170 or result == 138 or result == 42 or result == 162 or result == 168:
-				if (dungeon.tiles[i, j-1]["kind"]) == b"Door":
-					dungeon.entities.remove(dungeon.get_entity_at_location(i, j-1))
-					dungeon.tiles[i,j-1] = tile_types.floor
-					
-				if (dungeon.tiles[i-1, j]["kind"]) == b"Door":
-					dungeon.entities.remove(dungeon.get_entity_at_location(i-1, j))
-					dungeon.tiles[i-1,j] = tile_types.floor
-					
-				if (dungeon.tiles[i, j+1]["kind"]) == b"Door":
-					dungeon.entities.remove(dungeon.get_entity_at_location(i, j+1))
-					dungeon.tiles[i,j+1] = tile_types.floor
-					
-				if (dungeon.tiles[i+1, j]["kind"]) == b"Door":
-					dungeon.entities.remove(dungeon.get_entity_at_location(i+1, j))
-					dungeon.tiles[i+1,j] = tile_types.floor
+	intersections = (170, 138, 42, 162, 168)
+	is_door = dungeon.tiles["kind"] == tile_types.TileKind.DOOR
+	result = neighbour_bitmask(is_door)
+	
+	""" Removed doors change the masks of the following tiles, e.g. a tile loses its diagonal door and becomes an
+	intersection. Doors are only removed, so every floor tile with doors on at least three sides is a candidate,
+	checked in the order of the tile loop against the doors left at that point. Removed doors never become
+	intersections themselves, the floor they were removed for is one of their sides """
+	cardinal_doors = sum((result & bit) != 0 for bit in (2, 8, 32, 128))
+	candidates = (dungeon.tiles["kind"] == tile_types.TileKind.FLOOR) & (cardinal_doors >= 3)
+	for i, j in np.argwhere(candidates).tolist():
+		if neighbour_bitmask(is_door[i-1:i+2, j-1:j+2])[1, 1] not in intersections:
+			continue
+
+		for x, y in ((i, j-1), (i-1, j), (i, j+1), (i+1, j)):
+			if is_door[x, y]:
+				dungeon.remove_entity(dungeon.get_entity_at_location(x, y))
+				dungeon.tiles[x, y] = tile_types.floor
+				is_door[x, y] = False
 	return
 
 def search_rooms_in_dungeon_5x5(dungeon, map_width, map_height, rooms) -> List:
 	""" search for floors in sizes 5x5, 3x5, 5x3 and 3x3 and set them to rectangular_room, final room sizes
 	are larger to calculate properly the inner and area function (expects walls around rooms) """
-	for i in range(2, map_width-2):
-		for j in range(2, map_height-2):
-			result = 0
-			if (dungeon.tiles[i, j]["kind"]) == b"Floor":
-				result = bitmasking24bit(dungeon, i, j, "Floor")
-				if result == 0xFFFFFF:
-					new_room = RectangularRoom(i-3,j-3, 6, 6)		# room 5x5
-				elif result & 0xE0EFF == 0xE0EFF:
-					new_room = RectangularRoom(i-2,j-3, 4, 6)		# room 3x5				
-				elif result & 0xE0E0FF== 0xE0E0FF:
-					new_room = RectangularRoom(i-3,j-2, 6, 4)		# room 5x3
-				elif result & 0xFF == 0xFF:
-					new_room = RectangularRoom(i-2, j-2, 5, 5)		# room 3x3		
-				else:
-					new_room = False
-
-				""" Check wether new room intersects with existing room, if not, append to room list """
-				if new_room:
-					if not any(new_room.intersects(other_room) for other_room in rooms):
-						rooms.append(new_room)
-					else:
-						pass
+	is_floor = dungeon.tiles["kind"] == tile_types.TileKind.FLOOR
+	results = neighbour_bitmask(is_floor, BITMASK_24)
+	
+	""" Every room needs at least the 3x3 middle to be floor """
+	for i, j in np.argwhere(is_floor & (results & 0xFF == 0xFF)).tolist():
+		result = results[i, j]
+		if result == 0xFFFFFF:
+			new_room = RectangularRoom(i-3,j-3, 6, 6)		# room 5x5
+		elif result & 0xE0EFF == 0xE0EFF:
+			new_room = RectangularRoom(i-2,j-3, 4, 6)		# room 3x5				
+		elif result & 0xE0E0FF== 0xE0E0FF:
+			new_room = RectangularRoom(i-3,j-2, 6, 4)		# room 5x3
+		else:
+			new_room = RectangularRoom(i-2, j-2, 5, 5)		# room 3x3		
+
+		""" Check wether new room intersects with existing room, if not, append to room list """
+		if not any(new_room.intersects(other_room) for other_room in rooms):
+			rooms.append(new_room)
 	return rooms
 
 
@@ -504,7 +413,7 @@ def decorate_room(dungeon, rooms, current_floor) -> None:
 		elif room == rooms[len(rooms)-1]:
 			if current_floor == 10:
 				# Place finish-game-button for testing
-				button = copy.deepcopy(entity_factories.button)
+				button = entity_factories.button.clone()
 				button.parent = dungeon
 				button.spawn(dungeon, room.center[0], room.center[1])
 			else:
@@ -524,43 +433,43 @@ def decorate_room(dungeon, rooms, current_floor) -> None:
 					""" Shoproom: Place Shopkeeper inside room, not used at the moment  """
 					x = random.randint(room.x1 + 2, room.x2 - 2)
 					y = random.randint(room.y1 + 2, room.y2 - 2)					
-					shopkeeper = copy.deepcopy(entity_factories.npc)
+					shopkeeper = entity_factories.npc
 		
 					""" Place shopkeeper: BUG: place shopkeeper on a diffent location in case space is occupied """
-					if not any(entity.x == x and entity.y == y for entity in dungeon.entities):
+					if dungeon.get_entity_at_location(x, y) is None:
 						shopkeeper.spawn(dungeon, x, y)
 				
 				elif choice == "Fountainroom":
 					""" Fountainroom: Place a Fountain inside room, never placed directly at the walls (x,y +/-2) """					
-					fountain = copy.deepcopy(entity_factories.fountain)
+					fountain = entity_factories.fountain
 
 					x, y = 0, 0
-					while (dungeon.tiles[x,y]["kind"]) != b"Floor":
+					while (dungeon.tiles[x,y]["kind"]) != tile_types.TileKind.FLOOR:
 						x = random.randint(room.x1 + 2, room.x2 - 2)
 						y = random.randint(room.y1 + 2, room.y2 - 2)
 
 					""" BUG: like shopkeeper """
-					if not any(entity.x == x and entity.y == y for entity in dungeon.entities):
+					if dungeon.get_entity_at_location(x, y) is None:
 						fountain.spawn(dungeon, x, y)
 				
 				elif choice == "Treeroom":
 					""" Place Trees inside room, one tree per 10 tiles of room area. Never placed directly at the walls
 					(x,y +/-2) not to block doors """
 					trees = room.area // 10
-					tree = copy.deepcopy(entity_factories.tree)
+					tree = entity_factories.tree
 
 					""" TODO: add while loop like above """
 					for i in range(trees):
 						x = random.randint(room.x1 + 2, room.x2 - 2)
 						y = random.randint(room.y1 + 2, room.y2 - 2)
 		
-						if not any(entity.x == x and entity.y == y for entity in dungeon.entities):							
+						if dungeon.get_entity_at_location(x, y) is None:							
 							tree.spawn(dungeon, x, y)
 							dungeon.tiles[(x, y)] = tile_types.fake_wall
 							
 				elif choice == "Cloudroom":
 					""" Place clouds inside room (3x3). Not nice, but ok for the moment """
-					cloud = copy.deepcopy(entity_factories.cloud)
+					cloud = entity_factories.cloud
 
 					x = random.randint(room.x1 + 2, room.x2 - 2)
 					y = random.randint(room.y1 + 2, room.y2 - 2)
@@ -586,7 +495,7 @@ def decorate_room(dungeon, rooms, current_floor) -> None:
 		
 				elif choice == "Pillarroom":
 					""" Place 4 pillars inside room """
-					pillar = copy.deepcopy(entity_factories.pillar)
+					pillar = entity_factories.pillar
 
 					x,y = room.center
 
@@ -601,7 +510,7 @@ def decorate_room(dungeon, rooms, current_floor) -> None:
 					
 				elif choice == "Chestroom":
 					""" Place a chest inside the room and fill with stuff """
-					chest = copy.deepcopy(entity_factories.chest)
+					chest = entity_factories.chest.clone()
 					x,y = room.center
 					chest.usable.initialize(dungeon)
 					chest.spawn(dungeon, x, y)
@@ -616,54 +525,59 @@ def decorate_room(dungeon, rooms, current_floor) -> None:
 			"""
 	return
 
+""" Relative x,y values (8-way) where the dwarf might go, in clockwise order so that a turn of 45 degrees to the
+left or right is the previous or next heading """
+HEADINGS = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
 def drunkwalk(dungeon, map_width, map_height, drunks_min, drunks_max, turns_min, turns_max, steps_min, steps_max) -> None:
-	""" The drunkwalk loop lets the drunken dwarf run and smash stones.
+	""" The drunkwalk lets the drunken dwarf run and smash stones.
 	drunks min/max: how often the dwarf starts, turns min/max: how often he turns, steps min/max: how many steps he will
-	make straight  """
+	make straight. The turns and steps of a walk are drawn at once and its path is the cumulative sum of the steps,
+	all paths are dug out together at the end """
 	
-	map_center = (int(map_width/2), int(map_height/2))
-
-	""" Relative x,y values (8-way) where the dwarf might go """
-	directions = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+	""" numpy draws the walks, seeded from random so the same seed still gives the same floor """
+	rng = np.random.default_rng(random.getrandbits(64))
+	headings_xy = np.array(HEADINGS)
 	
 	""" Get random number of drunks and dig out the middle of the map"""
 	drunks = random.randint(drunks_min, drunks_max)
-	dungeon.tiles[map_center] = tile_types.floor
-
-	""" The drunkwalk loop """
-	current_drunk = 0
-	while current_drunk < drunks:
-		""" Get a random start direction and a random start point (1st drunk it will be the map center) and store the
-		actual pos of the dwarf """
-		direction = random.choice(directions)
-		start_pos = random_tile_in_map(dungeon, map_width, map_height, b"Floor")
-		act_pos = start_pos
-
-		""" The drunkjards turn loop """
-		current_turn = 0
-		turns = random.randint(turns_min, turns_max)
-
-		while current_turn < turns:
-			
-			""" The drunkjards step loop, get no of steps and a new direction """
-			current_step = 0
-			steps = random.randint(steps_min, steps_max)
-			direction = random_turn(direction)
-
-			while current_step < steps:
-				next_pos = (act_pos[0] + direction[0], act_pos[1] + direction[1])
-
-				""" Check if next step is inside map boundaries	"""
-				if 1 <= next_pos[0] <= (map_width -2) and 1 <= next_pos[1] <= (map_height -2):
-					dungeon.tiles[next_pos] = tile_types.floor
-					act_pos = next_pos
-					current_step += 1
-				else:
-					break
-
-			current_turn += 1
-		current_drunk += 1
-
+	dug = dungeon.tiles["kind"] == tile_types.TileKind.FLOOR
+	dug[map_width // 2, map_height // 2] = True
+	
+	""" The floor tiles as (x, y), the first count entries are valid. Tiles dug by a drunk are appended """
+	floor_tiles = np.empty((map_width * map_height, 2), dtype=np.intp)
+	count = np.count_nonzero(dug)
+	floor_tiles[:count] = np.argwhere(dug)
+	
+	for _ in range(drunks):
+		""" Start at a random floor tile (the 1st drunk starts in the map center) with a random heading, each turn
+		goes 45 degrees to the left or right """
+		start = floor_tiles[rng.integers(count)]
+		turns = rng.integers(turns_min, turns_max, endpoint=True)
+		headings = (rng.integers(8) + np.cumsum(rng.choice((-1, 1), size=turns))) % 8
+		steps = rng.integers(steps_min, steps_max, size=turns, endpoint=True)
+		
+		""" The dwarf walks straight between the turns and stops at the walls around the map until he turns again,
+		only the ends of the straight walks are followed one by one """
+		x, y = start.tolist()
+		walked = []
+		for heading, length in zip(headings.tolist(), steps.tolist()):
+			dx, dy = HEADINGS[heading]
+			if dx:
+				length = min(length, map_width - 2 - x if dx > 0 else x - 1)
+			if dy:
+				length = min(length, map_height - 2 - y if dy > 0 else y - 1)
+			x += dx * length
+			y += dy * length
+			walked.append(length)
+		
+		path = start + np.cumsum(headings_xy[np.repeat(headings, walked)], axis=0)
+		new_tiles = np.unique(path[~dug[path[:, 0], path[:, 1]]], axis=0)
+		floor_tiles[count:count + len(new_tiles)] = new_tiles
+		count += len(new_tiles)
+		dug[path[:, 0], path[:, 1]] = True
+	
+	dungeon.tiles[dug] = tile_types.floor
 
 
 def generate_drunkjard(
@@ -689,25 +603,25 @@ def generate_drunkjard(
 	two more """
 
 	while (len(rooms) < 4):
-		""" Dig out the Map """
+		""" Dig out the Map (further) and remove single walls (pillars) """
 		drunkwalk(dungeon, map_width, map_height, drunks_min, drunks_max, walks_min, walks_max, steps_min, steps_max)
-
-		""" Remove single walls (pillars) and randomize floors & walls """
 		remove_single_walls(dungeon, map_width, map_height)
-		randomize_tiles(dungeon, map_width, map_height)
-
-		""" Generate (search) rooms and place entities """
-		rooms = search_rooms_in_dungeon_5x5(dungeon, map_width, map_height, rooms)
-		for room in rooms:
-			place_entities(room, dungeon, engine.game_world.current_floor)
 
-		""" Place doors, decorate rooms and add ironbars on single-tile walls (not many in drunkjard). """
-		place_doors(dungeon, map_width, map_height)
-		decorate_room(dungeon, rooms, current_floor)
-		place_ironbars(dungeon, map_width, map_height)
+		""" Generate (search) rooms """
+		rooms = search_rooms_in_dungeon_5x5(dungeon, map_width, map_height, [])
 
 		#print(f"{len(rooms)} rooms found in drunkjards walk.")
 
+	""" Randomize floors & walls and place entities, only once the map is finished """
+	randomize_tiles(dungeon, map_width, map_height)
+	for room in rooms:
+		place_entities(room, dungeon, engine.game_world.current_floor)
+
+	""" Place doors, decorate rooms and add ironbars on single-tile walls (not many in drunkjard). """
+	place_doors(dungeon, map_width, map_height)
+	decorate_room(dungeon, rooms, current_floor)
+	place_ironbars(dungeon, map_width, map_height)
+
 
 	""" Place player in first rooms center pos. """
 	player.place(*((rooms)[0].center), dungeon)
@@ -765,13 +679,13 @@ def generate_dungeon(
 			# dungeon.tiles[(center_of_first_room[0]+1, center_of_first_room[1]+1)] = tile_types.shop
 			
 			# Place a Door for testing purposes
-			# door = copy.deepcopy(entity_factories.door)
+			# door = entity_factories.door.clone()
 			# door.parent = dungeon
 			# door.usable.initialize(dungeon,center_of_first_room[0]+1, center_of_first_room[1]+1 )
 			# door.spawn(dungeon, center_of_first_room[0]+1, center_of_first_room[1]+1)
 			
 			# Place finish-game-button for testing
-			# button = copy.deepcopy(entity_factories.button)
+			# button = entity_factories.button.clone()
 			# button.parent = dungeon
 			# button.spawn(dungeon, center_of_first_room[0]+1, center_of_first_room[1]+1)
 
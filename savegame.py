@@ -0,0 +1,442 @@
+""" Versioned save game container, used instead of pickling the whole engine.
+
+The file starts with MAGIC and the length of a small JSON header, followed by the data sections the header
+points to:
+	blocks:		numpy arrays (tiles, visible, explored, ...) as zlib compressed raw bytes, version 1 stored them
+				uncompressed
+	records:	lzma compressed JSON, one record per object (entities, components, maps, ...) holding the class
+				name and the state of the object. Objects refer to each other by record number.
+
+Records only depend on class names and attribute names, not on the pickle protocol, so renamed classes can be
+mapped to their new names with renamed_classes. Saves of newer versions than VERSION are rejected, plain pickled
+saves are loaded by setup_game.load_game as before.
+
+Saving takes a snapshot first: the states of all objects, shallow copies of all containers and copies of all
+arrays. Encoding and writing the snapshot can be done in the background (see Engine.autosave).
+
+Each save writes the whole game into a new file, which replaces the old one at once. Objects which count their
+changes in a save_version (the maps, see GameMap.changed) keep the compressed blocks of their arrays in block_cache.
+As long as their version is unchanged the next save reuses these blocks instead of copying and compressing the arrays
+again, so mainly the maps changed since the last save cost time. Records are always encoded again, they are small.
+"""
+
+from __future__ import annotations
+
+import base64
+import enum
+import functools
+import importlib
+import json
+import lzma
+import os
+import struct
+import weakref
+import zlib
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np	# type: ignore
+
+
+MAGIC = b"TPRLSAVE"
+VERSION = 2
+
+""" Values which never contain other values """
+ATOMS = {type(None), bool, int, float, str}
+
+""" Old class name -> new class name, for classes renamed or moved after saves were written """
+renamed_classes: Dict[str, str] = {}
+
+""" Writes save games in the background, one after the other """
+save_writer = ThreadPoolExecutor(max_workers=1)
+
+
+class Block(NamedTuple):
+	""" An array encoded for the save game, the entry of the block table without the offset """
+	entry: Dict[str, Any]
+	data: bytes
+
+class CachedBlock(NamedTuple):
+	""" The block of an array of an object with a save_version, valid as long as both are unchanged """
+	owner: weakref.ref
+	array: weakref.ref
+	version: Any
+	block: Optional[Block]	# None until the save is written
+
+""" (id(owner), attribute name) -> block written by the last save """
+block_cache: Dict[Tuple[int, str], CachedBlock] = {}
+
+
+class SaveFormatError(Exception):
+	""" Raised when a file is not a save game or was written by an unsupported version """
+
+
+def class_name(cls: type) -> str:
+	return f"{cls.__module__}.{cls.__qualname__}"
+
+@functools.lru_cache(maxsize=None)
+def find_class(name: str) -> type:
+	""" Import the class with the given (eventually renamed) name """
+	name = renamed_classes.get(name, name)
+	module_name, _, qualname = name.rpartition(".")
+	obj: Any
+
+	""" Nested classes have dots in their qualname, walk down until the module can be imported """
+	while True:
+		try:
+			obj = importlib.import_module(module_name)
+			break
+		except ModuleNotFoundError:
+			module_name, _, outer = module_name.rpartition(".")
+			qualname = f"{outer}.{qualname}"
+	for part in qualname.split("."):
+		obj = getattr(obj, part)
+	return obj
+
+def get_state(obj: Any) -> Any:
+	""" The state of obj like pickle takes it. Classes without their own __getstate__ only have object.__getstate__
+	since python 3.11, for older versions the state is built the same way: the __dict__, or (__dict__, slots) in case
+	the class has __slots__ """
+	getstate = getattr(obj, "__getstate__", None)
+	if getstate is not None:
+		return getstate()
+
+	slots = {}
+	for cls in type(obj).__mro__:
+		names = cls.__dict__.get("__slots__", ())
+		for name in (names,) if isinstance(names, str) else names:
+			if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+				slots[name] = getattr(obj, name)
+	instance_dict = getattr(obj, "__dict__", None)
+	if slots:
+		return instance_dict or None, slots
+	return instance_dict
+
+def is_record(obj: Any) -> bool:
+	""" Instances of classes (entities, components, ...) are stored as records, everything else inline """
+	return not isinstance(
+		obj, (type(None), bool, int, float, str, bytes, list, tuple, set, frozenset, dict, enum.Enum, np.ndarray, np.generic, type)
+	)
+
+
+class Writer:
+	""" Turns an object graph into records and blocks. freeze() copies everything the records depend on, so write()
+	encodes the graph as it was when frozen, even while the game goes on """
+	def __init__(self):
+		self.records: List[Dict[str, Any]] = []
+		self.blocks: List[Union[np.ndarray, Block]] = []
+		self.ids: Dict[int, int] = {}			# id(obj) -> record number
+		self.states: Dict[int, Any] = {}		# id(obj) -> state, keeps the states alive so that their ids stay unique
+		self.copies: Dict[int, Any] = {}		# id(container or array) -> copy or cached Block, the copies keep the originals alive
+		self.cached: Dict[int, Tuple[Tuple[int, str], CachedBlock]] = {}	# id(copy) -> where to cache its block
+		self.shared: set = set()				# ids of containers referenced more than once
+
+	def freeze(self, root: Any) -> None:
+		""" Take the states of all records and copy all containers and arrays. Containers referenced from more than
+		one place are stored as records to keep them shared """
+		seen_objects = set()
+		stack = [root]
+		while stack:
+			obj = stack.pop()
+			if type(obj) in ATOMS:
+				continue
+			if isinstance(obj, (list, dict, set)):
+				if id(obj) in self.copies:
+					self.shared.add(id(obj))
+					continue
+				copy = obj.copy()
+				self.copies[id(obj)] = copy
+				if isinstance(copy, dict):
+					stack.extend(copy.keys())
+					stack.extend(copy.values())
+				else:
+					stack.extend(copy)
+			elif isinstance(obj, np.ndarray):
+				if id(obj) not in self.copies:
+					self.copies[id(obj)] = obj.copy(order="K")
+			elif isinstance(obj, (tuple, frozenset)):
+				stack.extend(obj)
+			elif is_record(obj):
+				if id(obj) in seen_objects:
+					continue
+				seen_objects.add(id(obj))
+				state = get_state(obj)
+				self.states[id(obj)] = state
+				if hasattr(type(obj), "save_version") and isinstance(state, dict):
+					self.freeze_versioned(obj, state)
+				stack.append(state)
+
+	def freeze_versioned(self, obj: Any, state: Dict[str, Any]) -> None:
+		""" Arrays of objects with a save_version reuse the blocks of the last save while the version and the arrays
+		are the same. Otherwise they are copied and their blocks are cached by write_snapshot """
+		version = obj.save_version
+		for name, value in state.items():
+			if not isinstance(value, np.ndarray) or id(value) in self.copies:
+				continue
+			key = (id(obj), name)
+			cached = block_cache.get(key)
+			if (
+				cached is not None and cached.block is not None and cached.owner() is obj and cached.array() is value
+				and cached.version == version
+			):
+				self.copies[id(value)] = cached.block
+			else:
+				copy = value.copy(order="K")
+				self.copies[id(value)] = copy
+				self.cached[id(copy)] = (key, CachedBlock(weakref.ref(obj), weakref.ref(value), version, None))
+
+	def encode(self, obj: Any) -> Any:
+		""" Returns the JSON representation of obj, records are referenced by number """
+		if type(obj) in ATOMS:
+			return obj
+		if isinstance(obj, np.generic):
+			return {"$n": obj.dtype.str, "v": obj.item()}
+		if isinstance(obj, np.ndarray):
+			self.blocks.append(self.copies[id(obj)])
+			return {"$a": len(self.blocks) - 1}
+		if isinstance(obj, enum.Enum):
+			return {"$e": class_name(type(obj)), "v": obj.name}
+		if isinstance(obj, type):
+			return {"$c": class_name(obj)}
+		if isinstance(obj, bytes):
+			return {"$b": base64.b64encode(obj).decode("ascii")}
+		if isinstance(obj, tuple):
+			if hasattr(obj, "_fields"):
+				""" Named tuples like dice.Dice keep their class """
+				return {"$nt": class_name(type(obj)), "v": [self.encode(item) for item in obj]}
+			return {"$t": [self.encode(item) for item in obj]}
+		if isinstance(obj, frozenset):
+			return {"$f": [self.encode(item) for item in obj]}
+		if id(obj) in self.shared or is_record(obj):
+			return {"$r": self.record(obj)}
+		return self.encode_container(obj)
+
+	def encode_container(self, obj: Any) -> Any:
+		obj = self.copies[id(obj)]
+		if isinstance(obj, list):
+			return [self.encode(item) for item in obj]
+		if isinstance(obj, set):
+			return {"$s": [self.encode(item) for item in obj]}
+		if isinstance(obj, OrderedDict):
+			return {"$o": [[self.encode(key), self.encode(value)] for key, value in obj.items()]}
+		if isinstance(obj, dict):
+			if all(type(key) is str and not key.startswith("$") for key in obj):
+				""" Attribute dicts, stored as JSON objects """
+				return {key: self.encode(value) for key, value in obj.items()}
+			return {"$d": [[self.encode(key), self.encode(value)] for key, value in obj.items()]}
+		raise TypeError(f"Can't save {type(obj)}")
+
+	def record(self, obj: Any) -> int:
+		""" Returns the record number of obj, the record is filled in by write() """
+		if id(obj) not in self.ids:
+			self.ids[id(obj)] = len(self.records)
+			self.records.append({"c": class_name(type(obj)), "obj": obj})
+		return self.ids[id(obj)]
+
+	def write(self, root: Any) -> Tuple[List[Dict[str, Any]], Any]:
+		""" Encode root and all records reachable from it, as they were when frozen """
+		encoded_root = self.encode(root)
+
+		""" Records found while encoding are appended to the list, so loop until all are done """
+		number = 0
+		while number < len(self.records):
+			record = self.records[number]
+			obj = record.pop("obj")
+			if is_record(obj):
+				record["s"] = self.encode(self.states[id(obj)])
+			else:
+				record["s"] = self.encode_container(obj)
+			number += 1
+		return self.records, encoded_root
+
+
+class Reader:
+	""" Rebuilds the object graph from records and blocks """
+	def __init__(self, records: List[Dict[str, Any]], blocks: List[np.ndarray]):
+		self.records = records
+		self.blocks = blocks
+		self.objects: List[Any] = []
+
+	def decode(self, data: Any) -> Any:
+		data_type = type(data)
+		if data_type is list:
+			return [self.decode(item) for item in data]
+		if data_type is not dict or not data:
+			return data
+
+		tag, value = next(iter(data.items()))
+		if not tag.startswith("$"):
+			return {key: self.decode(item) for key, item in data.items()}
+		if tag == "$r":
+			return self.objects[value]
+		if tag == "$t":
+			return tuple(self.decode(item) for item in value)
+		if tag == "$s":
+			return set(self.decode(item) for item in value)
+		if tag == "$f":
+			return frozenset(self.decode(item) for item in value)
+		if tag == "$d":
+			return {self.decode(key): self.decode(item) for key, item in value}
+		if tag == "$o":
+			return OrderedDict((self.decode(key), self.decode(item)) for key, item in value)
+		if tag == "$a":
+			return self.blocks[value]
+		if tag == "$n":
+			return np.dtype(value).type(data["v"])
+		if tag == "$nt":
+			return find_class(value)(*(self.decode(item) for item in data["v"]))
+		if tag == "$e":
+			return find_class(value)[data["v"]]
+		if tag == "$c":
+			return find_class(value)
+		if tag == "$b":
+			return base64.b64decode(value)
+		raise SaveFormatError(f"Unknown record tag {tag}")
+
+	def read(self, encoded_root: Any) -> Any:
+		""" First create all objects empty, so records can refer to each other, then fill them """
+		for record in self.records:
+			cls = find_class(record["c"])
+			self.objects.append(cls.__new__(cls) if cls not in (list, dict, set, OrderedDict) else cls())
+
+		for obj, record in zip(self.objects, self.records):
+			state = self.decode(record["s"])
+			if isinstance(obj, (list, set)):
+				obj.update(state) if isinstance(obj, set) else obj.extend(state)
+			elif isinstance(obj, dict):
+				obj.update(state)
+			elif hasattr(obj, "__setstate__"):
+				obj.__setstate__(state)
+			elif isinstance(state, tuple):
+				""" Objects with __slots__ return (dict, slots) """
+				instance_dict, slots = state
+				obj.__dict__.update(instance_dict or {})
+				for name, item in (slots or {}).items():
+					setattr(obj, name, item)
+			elif state:
+				obj.__dict__.update(state)
+
+		return self.decode(encoded_root)
+
+
+def encode_block(array: np.ndarray) -> Block:
+	""" The maps compress very well, zlib is much faster than lzma and hardly larger """
+	order = "F" if array.flags.f_contiguous and not array.flags.c_contiguous else "C"
+	return Block(
+		{
+			"compression": "zlib",
+			"dtype": np.lib.format.dtype_to_descr(array.dtype),
+			"shape": list(array.shape),
+			"order": order,
+		},
+		zlib.compress(array.tobytes(order=order)),
+	)
+
+
+class Snapshot(NamedTuple):
+	""" Everything needed to write a save game, independent of the game going on """
+	writer: Writer		# Frozen by snapshot(), not written yet
+	root: Any
+
+def snapshot(obj: Any) -> Snapshot:
+	""" Take the states of obj and copy its containers and arrays. This is the only part of saving that needs the
+	game to stand still """
+	writer = Writer()
+	writer.freeze(obj)
+	return Snapshot(writer, obj)
+
+def write_snapshot(snapshot: Snapshot, filename: str) -> None:
+	""" Encode a snapshot and write it into a save game file. The file is replaced at once, so a crash never leaves
+	half a save """
+	records, root = snapshot.writer.write(snapshot.root)
+
+	""" Blocks follow each other. Blocks of arrays with a save_version are cached for the next save """
+	for key, cached in list(block_cache.items()):
+		if cached.owner() is None:
+			del block_cache[key]
+	offset = 0
+	blocks = []
+	block_table = []
+	for array in snapshot.writer.blocks:
+		if isinstance(array, Block):
+			block = array
+		else:
+			block = encode_block(array)
+			if id(array) in snapshot.writer.cached:
+				key, cached = snapshot.writer.cached[id(array)]
+				block_cache[key] = cached._replace(block=block)
+		blocks.append(block.data)
+		block_table.append({"offset": offset, "length": len(block.data), **block.entry})
+		offset += len(block.data)
+
+	""" Low compression presets are much faster and the records compress well anyway """
+	record_data = lzma.compress(
+		json.dumps({"records": records, "root": root}, separators=(",", ":")).encode("utf-8"),
+		preset=1,
+	)
+	header = json.dumps({
+		"version": VERSION,
+		"blocks": block_table,
+		"records": {"offset": offset, "length": len(record_data)},
+	}).encode("utf-8")
+
+	temp_filename = filename + ".tmp"
+	with open(temp_filename, "wb") as f:
+		f.write(MAGIC)
+		f.write(struct.pack("<I", len(header)))
+		f.write(header)
+		for data in blocks:
+			f.write(data)
+		f.write(record_data)
+	os.replace(temp_filename, filename)
+
+def save_in_background(obj: Any, filename: str) -> Future:
+	""" Take a snapshot of obj now, encoding, compressing and writing it is done by the save_writer """
+	return save_writer.submit(write_snapshot, snapshot(obj), filename)
+
+def save(obj: Any, filename: str) -> None:
+	""" Save obj and wait until it is written. Goes through the save_writer as well, so a save written in the
+	background can never replace a newer one """
+	save_in_background(obj, filename).result()
+
+def flush_saves() -> None:
+	""" Wait for all saves written in the background """
+	save_writer.submit(lambda: None).result()
+
+def is_save_file(filename: str) -> bool:
+	with open(filename, "rb") as f:
+		return f.read(len(MAGIC)) == MAGIC
+
+def load(filename: str) -> Any:
+	""" Load the object saved in filename. Blocks are read into memory, so the file is closed afterwards and can be
+	replaced by the next save or deleted (files still mapped can't be on Windows) """
+	with open(filename, "rb") as f:
+		if f.read(len(MAGIC)) != MAGIC:
+			raise SaveFormatError(f"{filename} is no save game")
+		header_length, = struct.unpack("<I", f.read(4))
+		header = json.loads(f.read(header_length))
+		start = len(MAGIC) + 4 + header_length
+
+		if header["version"] > VERSION:
+			raise SaveFormatError(f"Save game version {header['version']} is newer than this game")
+
+		blocks = []
+		for block in header["blocks"]:
+			dtype = np.lib.format.descr_to_dtype(block["dtype"])
+			shape = tuple(block["shape"])
+			f.seek(start + block["offset"])
+			data = f.read(block["length"])
+			compression = block.get("compression")
+			if compression == "zlib":
+				data = zlib.decompress(data)
+			elif compression is not None:
+				raise SaveFormatError(f"Unknown block compression {compression}")
+			array = np.frombuffer(data, dtype=dtype).reshape(shape, order=block["order"])
+			blocks.append(array.copy(order="K"))
+
+		f.seek(start + header["records"]["offset"])
+		data = json.loads(lzma.decompress(f.read(header["records"]["length"])))
+
+	return Reader(data["records"], blocks).read(data["root"])
@@ -0,0 +1,94 @@
+""" Decides which actor acts when, based on their speed_points """
+
+from __future__ import annotations
+
+import heapq
+
+from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from entity import Actor
+
+
+""" Time one action takes for an actor with 100 speed points """
+TURN_TIME = 100
+
+
+def action_time(actor: Actor) -> int:
+	""" Faster actors need less time for an action, e.g. 200 speed points act twice per turn """
+	return max(1, TURN_TIME * 100 // max(1, actor.speed_points))
+
+
+class TurnScheduler:
+	""" Heap of (time of the next action, sequence number, actor) for all actors of a game map except the player.
+	The sequence number decides between actors acting at the same time, so the order is always the same.
+	Entries of removed or dormant actors are not searched in the heap, they are skipped when they come up """
+
+	def __init__(self) -> None:
+		self.clock = 0
+		self._heap: List[Tuple[int, int, Actor]] = []
+		self._entries: Dict[Actor, int] = {}		# Actor -> sequence number of its valid heap entry
+		self._sequence = 0
+		self.dormant: Dict[Actor, None] = {}		# Actors skipped until they are woken up
+
+	def __setstate__(self, state: dict) -> None:
+		self.__dict__.update(state)
+		self.__dict__.setdefault("dormant", {})
+
+	def __contains__(self, actor: Actor) -> bool:
+		return actor in self._entries or actor in self.dormant
+
+	def __len__(self) -> int:
+		return len(self._entries) + len(self.dormant)
+
+	def _push(self, actor: Actor, time: int) -> None:
+		self._sequence += 1
+		self._entries[actor] = self._sequence
+		heapq.heappush(self._heap, (time, self._sequence, actor))
+
+	def _compact(self) -> None:
+		""" Clean up the heap when it mostly consists of entries of removed or dormant actors """
+		if len(self._heap) > 2 * len(self._entries) + 32:
+			self._heap = [entry for entry in self._heap if self._entries.get(entry[2]) == entry[1]]
+			heapq.heapify(self._heap)
+
+	def add(self, actor: Actor) -> None:
+		""" Schedule an actor, it acts for the first time one action from now """
+		if actor not in self:
+			self._push(actor, self.clock + action_time(actor))
+
+	def remove(self, actor: Actor) -> None:
+		""" Unschedule an actor """
+		self.dormant.pop(actor, None)
+		if self._entries.pop(actor, None) is not None:
+			self._compact()
+
+	def sleep(self, actor: Actor) -> None:
+		""" Skip an actor until it is woken up """
+		if self._entries.pop(actor, None) is not None:
+			self.dormant[actor] = None
+			self._compact()
+
+	def wake(self, actor: Actor) -> bool:
+		""" Schedule a dormant actor again, it acts one action from now. Returns False if it wasn't dormant """
+		if actor not in self.dormant:
+			return False
+		del self.dormant[actor]
+		self._push(actor, self.clock + action_time(actor))
+		return True
+
+	def advance(self, duration: int) -> Iterator[Actor]:
+		""" Let the time pass and yield the actors in the order they act. Actors are scheduled for their next action
+		before they act, actors removed in the meantime (e.g. killed) don't act again """
+		self.clock += duration
+
+		while self._heap and self._heap[0][0] <= self.clock:
+			time, sequence, actor = heapq.heappop(self._heap)
+			if self._entries.get(actor) != sequence:
+				continue
+			if not actor.is_alive:
+				del self._entries[actor]
+				continue
+
+			self._push(actor, time + action_time(actor))
+			yield actor
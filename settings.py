@@ -16,6 +16,14 @@ url = "https://github.com/Thunder-Pig/ThunderRL"
 
 save_file = "tpsav.sav"
 
+""" Save the game every autosave_interval game ticks, 0 turns autosaving off """
+autosave_interval = 20
+
+""" Number of messages kept in the message log, older messages are appended to message_archive_file
+in case it is set (e.g. "messages.txt") """
+message_log_size = 500
+message_archive_file = None
+
 """ Screen Settings """
 screen_width = 80
 screen_height = 50
@@ -31,6 +39,17 @@ room_max_size = 10
 room_min_size = 6
 max_rooms = 15
 
+""" Number of visited floors kept in memory, older ones are written to .lev files """
+floor_cache_size = 3
+
+""" Generate the next floor in a worker process while the actual one is played """
+pregenerate_floors = True
+
+""" Actors further away from the player than ai_activity_radius tiles, or out of sight with nothing to do, sleep
+until they see the player, get hurt or hear a fight within noise_radius tiles """
+ai_activity_radius = 20
+noise_radius = 8
+
 """ Main Menu """
 if language == "DE":
 	str_new_game = "[N] Neues Spiel"
@@ -39,6 +58,7 @@ if language == "DE":
 	str_quit_game = "[Q] Spiel beenden"
 	str_file_not_found = "Spielstand nicht gefunden!"
 	str_file_saved = "Spielstand gespeichert"
+	str_autosave_failed = "Automatisches Speichern fehlgeschlagen!"
 	welcome_text = "Hallo Abenteurer, willkommen zur " + title + " Dungeon Erfahrung!"
 else:
 	str_new_game = "[N] New Game"
@@ -47,6 +67,7 @@ else:
 	str_quit_game = "[Q] Quit Game"
 	str_file_not_found = "No saved game found."
 	str_file_saved = "Game saved"
+	str_autosave_failed = "Autosave failed!"
 	welcome_text = "Hello Adventurerer, welcome to the " + title + " dungeon experience!"
 
 """ Setup Game """
@@ -206,21 +227,13 @@ if language == "DE":
 	str_ant_name = "Ameise"
 	str_sm_zombie_name = "Kleiner Zombie"
 	str_lockpick_scroll = "Oeffnungsrune"
-	str_lockpick_scroll_enc = ""
 	str_amputation_scroll = "Amputationsrune"
-	str_amputation_scroll_enc = ""
 	str_blind_scroll = "Blindenrune"
-	str_blind_scroll_enc = ""
 	str_vision_scroll = "Visionsrune"
-	str_vision_scroll_enc = ""
 	str_dumb_scroll = "Stumme Rune"
-	str_dumb_scroll_enc = ""
 	str_fireball_scroll_name = "Feuerball Rune"
-	str_fireball_scroll_name_enc = ""
 	str_confusion_scroll_name = "Verwirrungsrune"
-	str_confusion_scroll_name_enc = ""
 	str_lightning_scroll_name = "Blitzrune"
-	str_lightning_scroll_name_enc = ""
 	str_health_potion_name = "Heiltrank"
 	str_wodden_bow_name = "Holzbogen"
 	str_arrow = "Pfeil"
@@ -260,7 +273,6 @@ else:
 	str_blind_scroll = "Blinded Scroll"
 	str_vision_scroll = "Vision Scroll"
 	str_dumb_scroll = "Dumb Scroll"
-	str_dumb_scroll_enc = ""
 	str_fireball_scroll_name = "Fireball Scroll"
 	str_confusion_scroll_name = "Confusion Scroll"
 	str_lightning_scroll_name = "Lightning Scroll"
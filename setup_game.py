@@ -2,26 +2,36 @@
 
 from __future__ import annotations
 
-import copy
 import lzma
 import pickle
 import traceback
 
 from typing import Optional
 
+import numpy as np	# type: ignore
 import tcod
 
 import settings
 import color
 from engine import Engine
 import entity_factories
+import game_map
 from game_map import GameWorld
 import input_handlers
+import savegame
 
 
-""" Load the background image and remove the alpha channel """
+""" The background image is loaded on first use, so games can be set up without the image (e.g. headless) """
 background_file = settings.menu_background_file
-background_image = tcod.image.load(background_file)[:, :, :3]
+background_image = None
+
+
+def get_background_image() -> np.ndarray:
+	""" Load the background image and remove the alpha channel """
+	global background_image
+	if background_image is None:
+		background_image = tcod.image.load(background_file)[:, :, :3]
+	return background_image
 
 
 def new_game() -> Engine:
@@ -33,7 +43,7 @@ def new_game() -> Engine:
 	max_rooms = settings.max_rooms
 	
 	""" Create the player """
-	player = copy.deepcopy(entity_factories.player)
+	player = entity_factories.player.clone()
 	
 	""" Set up the game engine and floor """
 	engine = Engine(player=player)
@@ -46,6 +56,8 @@ def new_game() -> Engine:
 		map_height = map_height,
 	)
 		
+	""" Floors left over from earlier games must not be taken for floors of this one """
+	game_map.remove_floor_files()
 	engine.game_world.generate_floor()
 
 	""" Calculate Fov and display welcome message """
@@ -53,12 +65,12 @@ def new_game() -> Engine:
 	engine.message_log.add_message(settings.welcome_text, color.welcome_text)
 	
 	""" Place dagger and healing potion in inventory and equip it without displaying equip message """
-	dagger = copy.deepcopy(entity_factories.dagger)
+	dagger = entity_factories.dagger.clone()
 	dagger.parent = player.inventory
 	player.inventory.items.append(dagger)
 	player.equipment.toggle_equip(dagger, add_message=False)
 	
-	potion = copy.deepcopy(entity_factories.health_potion)
+	potion = entity_factories.health_potion.clone()
 	potion.parent = player.inventory
 	player.inventory.items.append(potion)
 
@@ -69,10 +81,16 @@ def new_game() -> Engine:
 	return engine
 
 def load_game(filename: str) -> Engine:
-	""" Load an Engine instance from a file. """
-	with open(filename, "rb") as f:
-		engine = pickle.loads(lzma.decompress(f.read()))
+	""" Load an Engine instance from a file. Saves from before the save game format are compressed pickles """
+	if savegame.is_save_file(filename):
+		engine = savegame.load(filename)
+	else:
+		with open(filename, "rb") as f:
+			engine = pickle.loads(lzma.decompress(f.read()))
 	assert isinstance(engine, Engine)
+	
+	""" Only the floors of the loaded game are kept """
+	game_map.remove_floor_files(keep=engine.game_world.floor_prefix)
 	return engine
 	
 	
@@ -81,7 +99,7 @@ class MainMenu(input_handlers.BaseEventHandler):
 	
 	def on_render(self, console: tcod.Console) -> None:
 		""" Render the main menu on a background image. """
-		console.draw_semigraphics(background_image, 0, 0)
+		console.draw_semigraphics(get_background_image(), 0, 0)
 		
 		console.print(
 			console.width // 2,
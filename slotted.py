@@ -0,0 +1,54 @@
+""" Base class for entities and components, which keep their attributes in __slots__ instead of a __dict__ per
+instance. Floors hold thousands of them, the slots save memory and make the attribute access faster """
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict
+
+
+@lru_cache(maxsize=None)
+def slots(cls: type) -> Dict[str, Any]:
+	""" The slot descriptors of the class and all its base classes by name. The descriptors are used instead of
+	getattr and setattr, so properties of subclasses don't get in the way (see Item.name) """
+	descriptors = {}
+	for klass in reversed(cls.__mro__):
+		names = klass.__dict__.get("__slots__", ())
+		for name in (names,) if isinstance(names, str) else names:
+			descriptors.setdefault(name, klass.__dict__[name])
+	return descriptors
+
+
+class Slotted:
+	""" Saved and copied like objects with a __dict__: the state is a dict of the slots set. Saves made before the
+	slots were introduced stay loadable, attributes not used anymore are dropped when loading """
+	__slots__ = ()
+
+	def __getstate__(self) -> dict:
+		state = {}
+		for name, slot in slots(type(self)).items():
+			try:
+				state[name] = slot.__get__(self)
+			except AttributeError:
+				pass
+		return state
+
+	def __setstate__(self, state: dict) -> None:
+		""" Objects pickled with (dict, slots) state are loaded as well """
+		if isinstance(state, tuple):
+			instance_dict, slot_state = state
+			state = {**(instance_dict or {}), **(slot_state or {})}
+
+		descriptors = slots(type(self))
+		for name, value in state.items():
+			if name in descriptors:
+				descriptors[name].__set__(self, value)
+
+	def __copy__(self) -> Slotted:
+		clone = type(self).__new__(type(self))
+		for slot in slots(type(self)).values():
+			try:
+				slot.__set__(clone, slot.__get__(self))
+			except AttributeError:
+				pass
+		return clone
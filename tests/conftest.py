@@ -0,0 +1,17 @@
+""" The game modules live in the top level directory of the repository, tests import them from there """
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import settings
+
+
+@pytest.fixture(autouse=True)
+def no_background_floors(monkeypatch, tmp_path):
+	""" Floors are generated in the test process, floor files are written into a temporary directory """
+	monkeypatch.setattr(settings, "pregenerate_floors", False)
+	monkeypatch.chdir(tmp_path)
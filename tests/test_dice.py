@@ -0,0 +1,66 @@
+""" Parsing and rolling of dice expressions """
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+from dice import NO_DICE, Dice
+
+
+@pytest.mark.parametrize("expression, dice", [
+	("1d3", Dice(1, 3)),
+	("2d8+3", Dice(2, 8, 3)),
+	("1d4-2", Dice(1, 4, -2)),
+	("1d6+-1", Dice(1, 6, -1)),		# Older saves wrote negative modifiers like this
+	("10d10+0", Dice(10, 10, 0)),
+])
+def test_parse(expression, dice):
+	assert Dice.parse(expression) == dice
+
+def test_parse_passes_dice_and_none():
+	dice = Dice(2, 6, 1)
+	assert Dice.parse(dice) is dice
+	assert Dice.parse(None) is NO_DICE
+
+@pytest.mark.parametrize("expression", ["", "d6", "1d", "1x6", "1d6+", "one d six"])
+def test_parse_invalid(expression):
+	with pytest.raises(ValueError):
+		Dice.parse(expression)
+
+@pytest.mark.parametrize("dice", [Dice(1, 3), Dice(2, 8, 3), Dice(1, 4, -2), Dice(3, 6, -1)])
+def test_str_parses_back(dice):
+	assert Dice.parse(str(dice)) == dice
+
+def test_with_modifier():
+	assert Dice(1, 6).with_modifier(2) == Dice(1, 6, 2)
+	assert Dice(2, 4, 1).with_modifier(-3) == Dice(2, 4, -2)
+
+@pytest.mark.parametrize("dice", [Dice(1, 3), Dice(2, 8, 3), Dice(1, 4, -2), Dice(3, 6, -10)])
+def test_roll_range(dice):
+	random.seed(1)
+	rolls = {dice.roll() for _ in range(2000)}
+	low = max(1, dice.count + dice.modifier)
+	high = max(1, dice.count * dice.faces + dice.modifier)
+	assert min(rolls) == low
+	assert max(rolls) == high
+
+def test_no_dice_rolls_nothing():
+	assert NO_DICE.roll() == 0
+	assert not NO_DICE.roll_many(10).any()
+
+def test_roll_many_matches_roll():
+	""" Both roll the same distribution, the means of many rolls are close """
+	dice = Dice(2, 8, 3)
+	random.seed(1)
+	rolls = np.array([dice.roll() for _ in range(20000)])
+	many = dice.roll_many(20000, np.random.default_rng(1))
+	assert many.min() >= 5 and many.max() <= 19
+	assert abs(rolls.mean() - many.mean()) < 0.1
+
+def test_roll_many_keeps_the_games_random_state():
+	state = random.getstate()
+	Dice(1, 6).roll_many(100)
+	assert random.getstate() == state
@@ -0,0 +1,113 @@
+""" The location index of the entities on a GameMap and the floors of the GameWorld """
+
+from __future__ import annotations
+
+import io
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import entity_factories
+import game_map
+import setup_game
+
+from identification import FloorIdentification
+
+
+@pytest.fixture
+def engine():
+	return setup_game.new_game()
+
+def index_matches_entities(dungeon) -> bool:
+	""" The index holds every entity under its actual location, and nothing else """
+	indexed = [
+		(entity, location) for location, entities in dungeon.entity_locations.items() for entity in entities
+	]
+	return sorted(map(id, dungeon.entities)) == sorted(id(entity) for entity, _ in indexed) and all(
+		(entity.x, entity.y) == location for entity, location in indexed
+	)
+
+def free_locations(dungeon) -> list:
+	""" Floor tiles nothing was spawned on, the player may share a tile with spawned entities """
+	floors = np.argwhere(dungeon.tiles["walkable"]).tolist()
+	return [(x, y) for x, y in floors if not dungeon.get_entities_at_location(x, y)]
+
+
+def test_spawned_entities_are_indexed(engine):
+	dungeon = engine.game_map
+	(x, y), *_ = free_locations(dungeon)
+	potion = entity_factories.health_potion.spawn(dungeon, x, y)
+	orc = entity_factories.orc.spawn(dungeon, x, y)
+
+	assert set(dungeon.get_entities_at_location(x, y)) == {potion, orc}
+	assert dungeon.get_items_at_location(x, y) == [potion]
+	assert dungeon.get_actor_at_location(x, y) is orc
+	assert dungeon.get_blocking_entity_at_location(x, y) is orc
+	assert index_matches_entities(dungeon)
+
+def test_moved_and_removed_entities(engine):
+	dungeon = engine.game_map
+	(x, y), (other_x, other_y), *_ = free_locations(dungeon)
+	potion = entity_factories.health_potion.spawn(dungeon, x, y)
+
+	dungeon.move_entity(potion, other_x, other_y)
+	assert dungeon.get_entities_at_location(x, y) == []
+	assert dungeon.get_items_at_location(other_x, other_y) == [potion]
+
+	dungeon.remove_entity(potion)
+	assert dungeon.get_entities_at_location(other_x, other_y) == []
+	assert index_matches_entities(dungeon)
+
+def test_index_is_rebuilt_after_loading(engine):
+	dungeon = pickle.loads(pickle.dumps(engine)).game_map
+	assert dungeon._entity_locations is None
+	assert index_matches_entities(dungeon)
+
+
+@pytest.fixture
+def floor_generator():
+	""" The worker process of the game, stopped after the test """
+	yield game_map.get_floor_generator()
+	game_map.floor_generator.shutdown()
+	game_map.floor_generator = None
+
+def test_floor_generated_by_the_worker(engine, floor_generator):
+	""" The registry sent to the worker holds items, they are unpickled in a fresh process. Generated in the test
+	process from the same registry and seed, the floor is the same """
+	world = engine.game_world
+	identification = FloorIdentification(engine.identification)
+	assert identification.samples
+	expected_data, _ = game_map.build_floor(
+		world.world_settings, 2, world.seed + 2, FloorIdentification(engine.identification),
+	)
+
+	future = floor_generator.submit(game_map.build_floor, world.world_settings, 2, world.seed + 2, identification)
+	data, floor_identification = future.result(timeout=120)
+	assert floor_identification.matches(engine.identification)
+
+	floor = game_map.FloorUnpickler(io.BytesIO(data), engine).load()
+	expected = game_map.FloorUnpickler(io.BytesIO(expected_data), engine).load()
+	assert np.array_equal(floor.tiles, expected.tiles)
+	assert sorted((entity.name, entity.x, entity.y) for entity in floor.entities) == sorted(
+		(entity.name, entity.x, entity.y) for entity in expected.entities
+	)
+
+def test_worker_of_a_game_without_main_script(tmp_path):
+	""" Workers of python -c (or an interactive session) don't import the games modules by running the main script,
+	the items of the registry must be unpickled anyway """
+	code = (
+		"import setup_game\n"
+		"engine = setup_game.new_game()\n"
+		"engine.game_world._next_floor[1].result(timeout=120)\n"
+		"print('generated')\n"
+	)
+	root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+	result = subprocess.run(
+		[sys.executable, "-W", "ignore", "-c", code], cwd=tmp_path, env={**os.environ, "PYTHONPATH": root},
+		capture_output=True, text=True, timeout=300,
+	)
+	assert result.stdout.strip() == "generated", result.stderr
@@ -0,0 +1,145 @@
+""" The registry of identified item kinds """
+
+from __future__ import annotations
+
+import io
+import pickle
+
+import pytest
+
+import entity_factories
+import game_map
+import setup_game
+
+from identification import FloorIdentification, Identification, Identity
+
+
+@pytest.fixture
+def engine():
+	return setup_game.new_game()
+
+def spawn(engine, prototype):
+	return prototype.spawn(engine.game_map, engine.player.x, engine.player.y)
+
+def unregistered_scroll(engine):
+	""" A scroll prototype of a kind not spawned on the first floor """
+	scrolls = (
+		entity_factories.amputation_scroll, entity_factories.blinded_scroll, entity_factories.confusion_scroll,
+		entity_factories.dumb_scroll, entity_factories.fireball_scroll, entity_factories.lightning_scroll,
+		entity_factories.lockpick_scroll,
+	)
+	return next(scroll for scroll in scrolls if scroll.real_name not in engine.identification.identities)
+
+
+def test_items_of_a_kind_share_the_identity(engine):
+	first = spawn(engine, entity_factories.blinded_scroll)
+	second = spawn(engine, entity_factories.blinded_scroll)
+	other = spawn(engine, entity_factories.confusion_scroll)
+
+	assert first.identity is second.identity
+	assert first.identity is engine.identification.identities[first.real_name]
+	assert other.identity is not first.identity
+	assert first.name == second.name == first.identity.encrypted_name != first.real_name
+
+	engine.identification.identify(first)
+	assert first.name == second.name == first.real_name
+	assert other.name != other.real_name
+
+def test_items_without_identity_keep_their_name(engine):
+	potion = spawn(engine, entity_factories.health_potion)
+	engine.identification.identify(potion)
+	assert potion.name == potion.real_name
+
+def test_random_item(engine):
+	identification = Identification()
+	assert identification.random_item() is None
+
+	scroll = spawn(engine, entity_factories.blinded_scroll)
+	identification.spawned(scroll)
+	identification.spawned(scroll)
+	assert identification.counts == {scroll.real_name: 2}
+
+	item = identification.random_item()
+	assert item is not scroll
+	assert item.real_name == scroll.real_name
+
+def test_floor_identification_is_a_copy(engine):
+	scroll = spawn(engine, entity_factories.blinded_scroll)
+	floor = FloorIdentification(engine.identification)
+	assert floor.identities[scroll.real_name] is not scroll.identity
+	assert floor.identities[scroll.real_name].encrypted_name == scroll.identity.encrypted_name
+	assert floor.counts == engine.identification.counts
+
+	floor.counts[scroll.real_name] += 5
+	assert floor.counts != engine.identification.counts
+
+def test_floor_identification_matches_only_used_kinds(engine):
+	used = spawn(engine, entity_factories.blinded_scroll)
+	floor = FloorIdentification(engine.identification)
+	floor.identity(used)
+	assert floor.matches(engine.identification)
+
+	""" Kinds the floor didn't use and spawn counts don't matter, as long as the floor didn't choose by counts """
+	spawn(engine, entity_factories.confusion_scroll)
+	assert floor.matches(engine.identification)
+
+	floor.random_item()
+	assert not floor.matches(engine.identification)
+
+def test_floor_identification_detects_kinds_registered_meanwhile(engine):
+	prototype = unregistered_scroll(engine)
+	floor = FloorIdentification(engine.identification)
+	floor.identity(prototype)
+	assert floor.matches(engine.identification)
+
+	spawn(engine, prototype)
+	assert not floor.matches(engine.identification)
+
+def test_update_takes_over_new_kinds_and_spawn_counts(engine):
+	known = spawn(engine, entity_factories.blinded_scroll)
+	floor = FloorIdentification(engine.identification)
+	key = known.real_name
+	counts_before = engine.identification.counts[key]
+
+	new_kind = unregistered_scroll(engine)
+	new_identity = floor.identity(new_kind)
+	floor.identity(known)
+	floor.spawned(known)
+
+	""" Items spawned in the game meanwhile are kept """
+	spawn(engine, entity_factories.blinded_scroll)
+	engine.identification.update(floor)
+
+	identities = engine.identification.identities
+	assert identities[key] is known.identity
+	assert identities[new_kind.real_name] is new_identity
+	assert engine.identification.counts[key] == counts_before + 2
+
+
+def test_floor_links_identities_of_the_game(engine):
+	scroll = spawn(engine, entity_factories.blinded_scroll)
+	data = io.BytesIO()
+	game_map.FloorPickler(data, engine).dump([scroll.identity])
+
+	loaded, = game_map.FloorUnpickler(io.BytesIO(data.getvalue()), engine).load()
+	assert loaded is scroll.identity
+
+def test_floor_registers_unknown_kinds(engine):
+	""" Floors of a registry which lost a kind (e.g. files left over from another game) don't crash """
+	data = io.BytesIO()
+	game_map.FloorPickler(data, engine).dump([Identity("Unknown Scroll", "xyzzy")])
+
+	loaded, = game_map.FloorUnpickler(io.BytesIO(data.getvalue()), engine).load()
+	assert loaded is engine.identification.identities["Unknown Scroll"]
+	assert loaded.encrypted_name == "xyzzy"
+
+def test_floor_of_old_format_with_unknown_kind(engine):
+	class OldFloorPickler(pickle.Pickler):
+		""" Floors written before the encrypted name was stored with the key """
+		def persistent_id(self, obj):
+			return ("identity", obj.key) if type(obj) is Identity else None
+
+	data = io.BytesIO()
+	OldFloorPickler(data).dump(Identity("Unknown Scroll", "xyzzy"))
+	with pytest.raises(pickle.UnpicklingError, match="Unknown Scroll"):
+		game_map.FloorUnpickler(io.BytesIO(data.getvalue()), engine).load()
@@ -0,0 +1,128 @@
+""" Map generation helpers of procgen """
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+import entity_factories
+import procgen
+import setup_game
+import tile_types
+
+from game_map import GameMap
+
+
+""" Neighbours and their bits as the tile loops checked them before the bitmasks were built with numpy """
+OLD_BITMASK_8 = [
+	(-1, -1, 0x1), (0, -1, 0x2), (1, -1, 0x4), (1, 0, 0x8), (1, 1, 0x10), (0, 1, 0x20), (-1, 1, 0x40), (-1, 0, 0x80),
+]
+OLD_BITMASK_24 = OLD_BITMASK_8 + [
+	(-2, -2, 0x100), (-1, -2, 0x200), (0, -2, 0x400), (1, -2, 0x800), (2, -2, 0x1000), (2, -1, 0x2000),
+	(2, 0, 0x4000), (2, 1, 0x8000), (2, 2, 0x10000), (1, 2, 0x20000), (0, 2, 0x40000), (-1, 2, 0x80000),
+	(-2, 2, 0x100000), (-2, 1, 0x200000), (-2, 0, 0x400000), (-2, -1, 0x800000),
+]
+
+def old_bitmask(is_kind: np.ndarray, neighbours: list, radius: int) -> np.ndarray:
+	""" One tile after the other, like bitmasking and bitmasking24bit did. Tiles closer to the border than the
+	radius were never checked """
+	width, height = is_kind.shape
+	result = np.zeros(is_kind.shape, dtype=np.int64)
+	for x in range(radius, width - radius):
+		for y in range(radius, height - radius):
+			for dx, dy, bit in neighbours:
+				if is_kind[x + dx, y + dy]:
+					result[x, y] += bit
+	return result
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("neighbours, offsets, radius", [
+	(OLD_BITMASK_8, procgen.BITMASK_8, 1),
+	(OLD_BITMASK_24, procgen.BITMASK_24, 2),
+])
+def test_neighbour_bitmask_matches_the_tile_loops(seed, neighbours, offsets, radius):
+	is_kind = np.random.default_rng(seed).random((23, 17)) < 0.5
+	expected = old_bitmask(is_kind, neighbours, radius)
+	assert np.array_equal(procgen.neighbour_bitmask(is_kind, offsets), expected)
+
+def test_neighbour_bitmask_of_a_full_map():
+	is_kind = np.ones((7, 6), dtype=bool)
+	mask = procgen.neighbour_bitmask(is_kind, procgen.BITMASK_8)
+	assert (mask[1:-1, 1:-1] == 0xFF).all()
+	assert not mask[0].any() and not mask[-1].any() and not mask[:, 0].any() and not mask[:, -1].any()
+
+	mask = procgen.neighbour_bitmask(is_kind, procgen.BITMASK_24)
+	assert (mask[2:-2, 2:-2] == 0xFFFFFF).all()
+
+def test_bitmasking_of_a_map():
+	""" A single floor tile in the middle of walls, its neighbours see it on the opposite side """
+	dungeon = GameMap(None, 5, 5)
+	dungeon.tiles[2, 2] = tile_types.floor
+	mask = procgen.bitmasking(dungeon, tile_types.TileKind.FLOOR)
+
+	assert mask[1, 1] == 0x10		# SE
+	assert mask[2, 1] == 0x20		# S
+	assert mask[3, 3] == 0x1		# NW
+	assert mask[2, 2] == 0
+
+
+def walked_map(seed: int, width: int = 60, height: int = 40) -> np.ndarray:
+	""" Floor tiles of a map dug by drunkwalk with the given seed """
+	random.seed(seed)
+	dungeon = GameMap(None, width, height)
+	procgen.drunkwalk(dungeon, width, height, 10, 30, 15, 25, 2, 4)
+	return dungeon.tiles["kind"] == tile_types.TileKind.FLOOR
+
+def test_drunkwalk_is_reproducible():
+	assert np.array_equal(walked_map(1), walked_map(1))
+	assert not np.array_equal(walked_map(1), walked_map(2))
+
+@pytest.mark.parametrize("seed", range(10))
+def test_drunkwalk_stays_inside_the_walls(seed):
+	dug = walked_map(seed)
+	assert dug[30, 20]
+	assert not dug[0].any() and not dug[-1].any() and not dug[:, 0].any() and not dug[:, -1].any()
+
+@pytest.mark.parametrize("seed", range(10))
+def test_drunkwalk_digs_one_cave(seed):
+	""" Each drunk starts on a tile dug before, so every floor tile can be reached from the map center """
+	dug = walked_map(seed)
+	reached = np.zeros_like(dug)
+	reached[30, 20] = True
+	while True:
+		grown = reached.copy()
+		for dx, dy in procgen.HEADINGS:
+			grown[1:-1, 1:-1] |= np.roll(reached, (dx, dy), axis=(0, 1))[1:-1, 1:-1]
+		grown &= dug
+		if np.array_equal(grown, reached):
+			break
+		reached = grown
+	assert np.array_equal(reached, dug)
+
+def test_generate_drunkjard_is_reproducible():
+	def generate():
+		engine = setup_game.new_game()
+		random.seed(7)
+		dungeon = procgen.generate_drunkjard(80, 45, 2, 4, 15, 25, 10, 30, engine, 1)
+		return dungeon.tiles.tobytes(), sorted((entity.name, entity.x, entity.y) for entity in dungeon.entities)
+
+	assert generate() == generate()
+
+def test_remove_doors_at_intersection_rechecks_changed_tiles():
+	""" The tunnel crossing at (3, 6) loses its doors first. Only then (5, 5) has doors on three sides and none on
+	the diagonals, so its doors go as well, as in the tile loop """
+	engine = setup_game.new_game()
+	dungeon = GameMap(engine, 10, 10)
+	dungeon.tiles[1:-1, 1:-1] = tile_types.floor
+	door = entity_factories.door.clone()
+	for x, y in ((3, 5), (4, 6), (3, 7), (5, 4), (6, 5), (5, 6)):
+		door.parent = dungeon
+		door.usable.initialize(dungeon, x, y)
+		door.spawn(dungeon, x, y)
+
+	procgen.remove_doors_at_intersection(dungeon, 10, 10)
+	assert not (dungeon.tiles["kind"] == tile_types.TileKind.DOOR).any()
+	assert not dungeon.entities
@@ -0,0 +1,215 @@
+""" Round trips through the save game format """
+
+from __future__ import annotations
+
+import enum
+import json
+import os
+import struct
+
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+import savegame
+import settings
+import setup_game
+import tile_types
+
+from dice import Dice
+from slotted import Slotted
+
+
+class Color(enum.Enum):
+	RED = 1
+	BLUE = 2
+
+
+class Node:
+	def __init__(self, name: str):
+		self.name = name
+		self.links = []
+
+
+class SlottedNode(Slotted):
+	__slots__ = ("name", "value")
+
+
+class VersionedNode:
+	""" Counts its changes like GameMap """
+	def __init__(self):
+		self.array = np.zeros(1000)
+		self.version = 0
+
+	@property
+	def save_version(self) -> int:
+		return self.version
+
+
+class OldStyleNode:
+	""" Stands for classes without __getstate__, as all plain classes before python 3.11 """
+	__getstate__ = None
+
+	def __init__(self):
+		self.value = 1
+
+
+def round_trip(obj, tmp_path):
+	filename = str(tmp_path / "test.sav")
+	savegame.save(obj, filename)
+	return savegame.load(filename)
+
+
+def test_values(tmp_path):
+	values = {
+		"atoms": [None, True, 1, 2.5, "text"],
+		"tuple": (1, (2, 3)),
+		"set": {1, 2, 3},
+		"frozenset": frozenset({"a", "b"}),
+		"ordered": OrderedDict([(2, "b"), (1, "a")]),
+		"keys": {(1, 2): "tuple key", 3: "int key", "$tag": "tag like key"},
+		"bytes": b"\x00\xff",
+		"scalar": np.int16(-3),
+		"enum": Color.BLUE,
+		"class": Node,
+		"dice": Dice(2, 8, 3),
+	}
+	loaded = round_trip(values, tmp_path)
+	assert loaded == values
+	assert type(loaded["ordered"]) is OrderedDict
+	assert list(loaded["ordered"]) == [2, 1]
+	assert type(loaded["scalar"]) is np.int16
+	assert type(loaded["dice"]) is Dice
+
+def test_arrays(tmp_path):
+	arrays = [
+		np.arange(12, dtype=np.int32).reshape(3, 4),
+		np.asfortranarray(np.arange(12, dtype=np.uint8).reshape(3, 4)),
+		np.full((4, 3), fill_value=tile_types.wall, order="F"),
+		np.zeros(0, dtype=np.float32),
+	]
+	loaded = round_trip(arrays, tmp_path)
+	for array, loaded_array in zip(arrays, loaded):
+		assert loaded_array.dtype == array.dtype
+		assert np.array_equal(loaded_array, array)
+		assert loaded_array.flags.f_contiguous == array.flags.f_contiguous
+		assert loaded_array.flags.writeable
+
+def test_shared_objects_and_cycles(tmp_path):
+	a, b = Node("a"), Node("b")
+	shared = [1, 2]
+	a.links = [b, shared]
+	b.links = [a, shared]
+	loaded_a, loaded_b = round_trip([a, b], tmp_path)
+
+	assert loaded_a.links[0] is loaded_b
+	assert loaded_b.links[0] is loaded_a
+	assert loaded_a.links[1] is loaded_b.links[1] == [1, 2]
+
+def test_slotted_and_plain_objects(tmp_path):
+	slotted = SlottedNode()
+	slotted.name = "slotted"
+	loaded_slotted, loaded_plain = round_trip([slotted, OldStyleNode()], tmp_path)
+
+	assert loaded_slotted.name == "slotted"
+	assert not hasattr(loaded_slotted, "value")
+	assert loaded_plain.value == 1
+
+def test_snapshot_keeps_the_state_it_was_taken_with(tmp_path):
+	""" The game goes on while a snapshot is written in the background """
+	node = Node("before")
+	node.links = [1, {"key": "before"}]
+	array = np.zeros(3)
+	snapshot = savegame.snapshot([node, array])
+
+	node.name = "after"
+	node.links.append(2)
+	node.links[1]["key"] = "after"
+	array[:] = 1
+
+	filename = str(tmp_path / "test.sav")
+	savegame.write_snapshot(snapshot, filename)
+	loaded_node, loaded_array = savegame.load(filename)
+	assert loaded_node.name == "before"
+	assert loaded_node.links == [1, {"key": "before"}]
+	assert not loaded_array.any()
+
+def test_unchanged_blocks_are_reused(tmp_path):
+	node = VersionedNode()
+	filename = str(tmp_path / "test.sav")
+	savegame.save(node, filename)
+	assert savegame.snapshot(node).writer.copies[id(node.array)].data == savegame.encode_block(node.array).data
+
+	""" Changes which don't count are not saved, changes which do are """
+	node.array[:] = 1
+	assert not round_trip(node, tmp_path).array.any()
+	node.version += 1
+	assert round_trip(node, tmp_path).array.all()
+
+	""" A replaced array is saved even with the same version """
+	node.array = np.full(1000, 2.0)
+	assert (round_trip(node, tmp_path).array == 2).all()
+
+def test_save_file_can_be_replaced_after_loading(tmp_path):
+	filename = str(tmp_path / "test.sav")
+	savegame.save([np.ones(1000)], filename)
+	loaded = savegame.load(filename)
+
+	savegame.save([np.zeros(1000)], filename)
+	os.remove(filename)
+	assert loaded[0].all()
+
+def test_rejects_other_files(tmp_path):
+	filename = tmp_path / "other.sav"
+	filename.write_bytes(b"no save game")
+	assert not savegame.is_save_file(str(filename))
+	with pytest.raises(savegame.SaveFormatError):
+		savegame.load(str(filename))
+
+def test_rejects_newer_versions(tmp_path):
+	header = json.dumps({"version": savegame.VERSION + 1, "blocks": [], "records": {"offset": 0, "length": 0}})
+	filename = tmp_path / "newer.sav"
+	filename.write_bytes(savegame.MAGIC + struct.pack("<I", len(header)) + header.encode("utf-8"))
+	with pytest.raises(savegame.SaveFormatError):
+		savegame.load(str(filename))
+
+def test_game(tmp_path):
+	engine = setup_game.new_game()
+	filename = str(tmp_path / "game.sav")
+	engine.save_as(filename)
+	loaded = setup_game.load_game(filename)
+
+	player = loaded.player
+	assert (player.x, player.y) == (engine.player.x, engine.player.y)
+	assert player.fighter.hp == engine.player.fighter.hp
+	assert player.gamemap is loaded.game_map
+	assert player in loaded.game_map.entities
+	assert np.array_equal(loaded.game_map.tiles, engine.game_map.tiles)
+	assert np.array_equal(loaded.game_map.jitter, engine.game_map.jitter)
+	assert sorted(entity.name for entity in loaded.game_map.entities) == sorted(
+		entity.name for entity in engine.game_map.entities
+	)
+	assert loaded.game_world.floor_prefix == engine.game_world.floor_prefix
+
+	""" Items of a kind still share the identity of the registry """
+	identities = loaded.identification.identities
+	for entity in loaded.game_map.entities:
+		identity = getattr(entity, "identity", None)
+		if identity is not None:
+			assert identities[identity.key] is identity
+
+def test_game_refers_to_floor_files(tmp_path, monkeypatch):
+	""" Floors evicted from the floor cache are on disk before the game is saved, the save doesn't contain them """
+	monkeypatch.setattr(settings, "floor_cache_size", 0)
+	engine = setup_game.new_game()
+	floor = engine.game_map
+	engine.game_world.store_floor(5, floor)
+
+	filename = str(tmp_path / "game.sav")
+	engine.save_as(filename)
+	assert not engine.game_world.floors_pending
+	assert os.path.exists(engine.game_world.floor_file(5))
+
+	loaded = setup_game.load_game(filename)
+	assert np.array_equal(loaded.game_world.fetch_floor(5).tiles, floor.tiles)
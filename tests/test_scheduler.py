@@ -0,0 +1,109 @@
+""" Turn order of the TurnScheduler """
+
+from __future__ import annotations
+
+from itertools import islice
+
+from scheduler import TURN_TIME, TurnScheduler, action_time
+
+
+class FakeActor:
+	""" Everything the scheduler asks of an actor """
+	def __init__(self, name: str, speed_points: int = 100):
+		self.name = name
+		self.speed_points = speed_points
+		self.is_alive = True
+
+	def __repr__(self) -> str:
+		return self.name
+
+
+def acting(scheduler: TurnScheduler, turns: int) -> list:
+	""" Names of the actors acting within the given number of turns, in order """
+	return [actor.name for actor in scheduler.advance(turns * TURN_TIME)]
+
+
+def test_action_time():
+	assert action_time(FakeActor("normal")) == TURN_TIME
+	assert action_time(FakeActor("fast", 200)) == TURN_TIME // 2
+	assert action_time(FakeActor("slow", 50)) == TURN_TIME * 2
+	""" Actors without speed still get a time, they are not scheduled at the same time forever """
+	assert action_time(FakeActor("frozen", 0)) == TURN_TIME * 100
+
+def test_faster_actors_act_more_often():
+	scheduler = TurnScheduler()
+	for actor in (FakeActor("normal"), FakeActor("fast", 200), FakeActor("slow", 50)):
+		scheduler.add(actor)
+
+	names = acting(scheduler, 4)
+	assert names.count("fast") == 8
+	assert names.count("normal") == 4
+	assert names.count("slow") == 2
+
+def test_order_is_stable_for_the_same_time():
+	scheduler = TurnScheduler()
+	for name in "abc":
+		scheduler.add(FakeActor(name))
+
+	assert acting(scheduler, 2) == ["a", "b", "c", "a", "b", "c"]
+
+def test_adding_twice_schedules_once():
+	scheduler = TurnScheduler()
+	actor = FakeActor("a")
+	scheduler.add(actor)
+	scheduler.add(actor)
+
+	assert len(scheduler) == 1
+	assert acting(scheduler, 1) == ["a"]
+
+def test_removed_and_dead_actors_dont_act():
+	scheduler = TurnScheduler()
+	removed, dead, alive = FakeActor("removed"), FakeActor("dead"), FakeActor("alive")
+	for actor in (removed, dead, alive):
+		scheduler.add(actor)
+	scheduler.remove(removed)
+	dead.is_alive = False
+
+	assert acting(scheduler, 3) == ["alive"] * 3
+	assert removed not in scheduler
+	assert dead not in scheduler
+
+def test_dormant_actors_act_again_after_waking():
+	scheduler = TurnScheduler()
+	sleeper = FakeActor("sleeper")
+	scheduler.add(sleeper)
+	scheduler.sleep(sleeper)
+
+	assert acting(scheduler, 3) == []
+	assert sleeper in scheduler
+	assert scheduler.wake(sleeper)
+	assert not scheduler.wake(sleeper)
+
+	""" A woken actor acts one action after it was woken up, not at once """
+	assert acting(scheduler, 0) == []
+	assert acting(scheduler, 1) == ["sleeper"]
+
+def test_removing_during_advance():
+	""" Actors killed by an actor acting before them in the same advance don't act anymore """
+	scheduler = TurnScheduler()
+	killer, victim = FakeActor("killer"), FakeActor("victim")
+	scheduler.add(killer)
+	scheduler.add(victim)
+
+	names = []
+	for actor in scheduler.advance(3 * TURN_TIME):
+		names.append(actor.name)
+		if actor is killer:
+			scheduler.remove(victim)
+	assert names == ["killer"] * 3
+
+def test_heap_is_compacted():
+	scheduler = TurnScheduler()
+	actors = [FakeActor(str(number)) for number in range(200)]
+	for actor in actors:
+		scheduler.add(actor)
+	for actor in actors[:-1]:
+		scheduler.remove(actor)
+
+	assert len(scheduler._heap) <= 2 * len(scheduler) + 32
+	assert list(islice(scheduler.advance(TURN_TIME), 5)) == [actors[-1]]
@@ -1,8 +1,22 @@
+from enum import IntEnum
 from typing import Tuple
 
 import numpy as np	# type: ignore
 
 
+""" Kind of tile, stored as small integer inside the tile array """
+class TileKind(IntEnum):
+	NONE = 0
+	FLOOR = 1
+	WALL = 2
+	DOOR = 3
+	IRONBAR = 4
+	STAIRS = 5
+	SHOP = 6
+
+""" Display names of the tile kinds, indexed by TileKind """
+kind_names = ("", "Floor", "Wall", "Door", "Ironbar", "Stairs", "Shop")
+
 # Tile graphics structured type compatible with Console.tiles_rgb
 graphic_dt = np.dtype(
 	[
@@ -19,7 +33,7 @@ tile_dt = np.dtype(
 		("transparent", np.bool),	# True if dosent block FOV
 		("dark", graphic_dt),		# Graphics when tile is not in FOV
 		("light", graphic_dt),		# Graphic when tile is in FOV
-		("kind", "S20"),			# kind of tile (wall, floor, door, ...)
+		("kind", np.uint8),			# kind of tile (wall, floor, door, ...), see TileKind
 	]
 )
 
@@ -29,10 +43,22 @@ def new_tile(
 	transparent: int,
 	dark: Tuple[int, Tuple[int, int, int], Tuple[int, int, int]],
 	light: Tuple[int, Tuple[int, int, int], Tuple[int, int, int]],
-	kind: str,
+	kind: TileKind,
 ) -> np.ndarray:
 	"""Helper Function for defining individual tile types """
 	return np.array((walkable, transparent, dark, light, kind), dtype=tile_dt)
+
+def upgrade_tiles(tiles: np.ndarray) -> np.ndarray:
+	""" Convert tiles of older saves, which stored the kind as byte string, to the actual tile_dt """
+	if tiles.dtype == tile_dt:
+		return tiles
+	
+	upgraded = np.zeros(tiles.shape, dtype=tile_dt, order="F")
+	for name in ("walkable", "transparent", "dark", "light"):
+		upgraded[name] = tiles[name]
+	for kind, kind_name in enumerate(kind_names):
+		upgraded["kind"][tiles["kind"] == bytes(kind_name, "utf-8")] = kind
+	return upgraded
 	
 # SHROUD represents unexplored, unseen tiles
 SHROUD = np.array((ord(" "), (255,255,255), (0,0,0)), dtype = graphic_dt)
@@ -43,11 +69,11 @@ floor = new_tile(
 	transparent=True,
 	dark=(ord(" "), (255, 255, 255), (50, 50, 150)),
 	light=(ord(" "), (255, 255, 255), (200,180,50)),
-	kind=("Floor"),
+	kind=TileKind.FLOOR,
 )
 
 wall = new_tile(
-	kind=("Wall"),
+	kind=TileKind.WALL,
 	walkable=False,
 	transparent=False,
 	dark=(ord(" "), (255, 255, 255), (0, 0, 100)),
@@ -55,7 +81,7 @@ wall = new_tile(
 )
 
 door = new_tile(
-	kind=("Door"),
+	kind=TileKind.DOOR,
 	walkable=True,
 	transparent=False,
 	dark=(ord("X"), (0, 0, 100), (50, 50, 150)),
@@ -63,7 +89,7 @@ door = new_tile(
 )
 
 door_open = new_tile(
-	kind=("Door"),
+	kind=TileKind.DOOR,
 	walkable=True,
 	transparent=True,
 	dark=(ord("."), (0, 0, 100), (50, 50, 150)),
@@ -71,7 +97,7 @@ door_open = new_tile(
 )
 
 ironbar = new_tile(
-	kind=("Ironbar"),
+	kind=TileKind.IRONBAR,
 	walkable=False,
 	transparent=True,
 	dark=(ord("#"), (10, 90, 100), (50, 50, 150)),
@@ -79,7 +105,7 @@ ironbar = new_tile(
 )
 
 down_stairs = new_tile(
-	kind=("Stairs"),
+	kind=TileKind.STAIRS,
 	walkable = True,
 	transparent = True,
 	dark=(ord(">"), (0,0,100), (50, 50, 150)),
@@ -87,7 +113,7 @@ down_stairs = new_tile(
 )
 
 up_stairs = new_tile(
-	kind=("Stairs"),
+	kind=TileKind.STAIRS,
 	walkable = True,
 	transparent = True,
 	dark=(ord("<"), (0,0,100), (50, 50, 150)),
@@ -96,7 +122,7 @@ up_stairs = new_tile(
 
 """ Shop not used at the moment, and unsure if it will ever be used """
 shop = new_tile(
-	kind=("Shop"),
+	kind=TileKind.SHOP,
 	walkable = False,
 	transparent = True,
 	dark=(ord("S"), (0,0,100), (50, 50, 150)),
@@ -105,7 +131,7 @@ shop = new_tile(
 
 """ Used as a base for furniture which blocks the FOV; when not in FOV rendered as a wall """
 fake_wall = new_tile(
-	kind=(""),
+	kind=TileKind.NONE,
 	walkable=True,
 	transparent=False,
 	dark=(ord(" "), (255, 255, 255), (0, 0, 100)),
@@ -114,7 +140,7 @@ fake_wall = new_tile(
 
 """ Used as a base for furniture which blocks the FOV, when not in FOV rendered as a floor """
 fake_cloud = new_tile(
-	kind=(""),
+	kind=TileKind.NONE,
 	walkable=True,
 	transparent=False,
 	dark=(ord(" "), (255, 255, 255), (50, 50, 150)),
@@ -123,7 +149,7 @@ fake_cloud = new_tile(
 
 """ Used as a base for ironbars,... which do not block the FOV; when not in FOV rendered as a window (of course) """
 window_base = new_tile(
-	kind=("Ironbar"),
+	kind=TileKind.IRONBAR,
 	walkable=True,
 	transparent=True,
 	dark=(ord("#"), (10, 90, 100), (50, 50, 150)),
@@ -131,7 +157,7 @@ window_base = new_tile(
 )
 
 open_door_base = new_tile(
-	kind = ("Door"),
+	kind=TileKind.DOOR,
 	walkable=True,
 	transparent=True,
 	dark=(ord("."), (10, 90, 100), (50, 50, 150)),
@@ -139,7 +165,7 @@ open_door_base = new_tile(
 )
 
 closed_door_base = new_tile(
-	kind=("Door"),
+	kind=TileKind.DOOR,
 	walkable=False,
 	transparent=False,
 	dark=(ord("+"), (50, 50, 150), (0, 0, 100)),
@@ -147,7 +173,7 @@ closed_door_base = new_tile(
 )
 
 hidden_door_base = new_tile(
-	kind=("Door"),
+	kind=TileKind.DOOR,
 	walkable=False,
 	transparent=False,
 	dark=(ord(" "), (50, 50, 150), (0, 0, 100)),